@@ -1,13 +1,30 @@
-from dataclasses import dataclass  # noqa: D100
-from datetime import datetime
+from array import array  # noqa: D100
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
 from enum import Enum
+from functools import lru_cache
+from operator import itemgetter
+import sys
+from time import monotonic, perf_counter
+from weakref import WeakValueDictionary
 
+from aiohttp import ClientError, ClientSession, ClientTimeout, hdrs
 import requests
 import requests.packages
 
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.json import json_loads
 
-from .const import DOMAIN_METRICS_URL
+from .const import DOMAIN_METRICS_URL, PARSE_CACHE_SIZE, REQUEST_TIMEOUT
+
+PING_PATH = "/api/custom/calendar/ping"
+CALENDAR_PATH = "/api/custom/calendar"
+ACCEPT_ENCODING = "gzip, deflate"
+HTTP_NOT_MODIFIED = 304
+HTTP_AUTH_ERRORS = (401, 403)
+HTTP_TOO_MANY_REQUESTS = 429
 
 
 class CalendarEntryType(Enum):
@@ -24,9 +41,28 @@ class CalendarEntryType(Enum):
     Seal = 8
 
 
-@dataclass
+CATEGORIES_BY_VALUE: dict[int, CalendarEntryType] = {
+    category.value: category for category in CalendarEntryType
+}
+
+
+# Categories of entries that are the same for every user of an element.
+SHARED_CATEGORIES = frozenset(
+    {
+        CalendarEntryType.Public_Holiday,
+        CalendarEntryType.Weekend,
+        CalendarEntryType.Release,
+        CalendarEntryType.Seal,
+    }
+)
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class CalendarEntry:
-    """A Calendar Entry."""
+    """A Calendar Entry.
+
+    Entries are immutable and slotted, a user can have thousands of them.
+    """
 
     id: str
     name: str
@@ -38,70 +74,643 @@ class CalendarEntry:
     originale_end_date: datetime
 
 
+# Entry dates are naive local times, the entry store keeps them as seconds
+# since this naive epoch so they compare as integers.
+EPOCH = datetime(1970, 1, 1)
+EPOCH_ORDINAL = EPOCH.toordinal()
+SECONDS_PER_DAY = 86400
+_SECOND = timedelta(seconds=1)
+
+
+def to_epoch(moment: datetime) -> int:
+    """Return the whole seconds since the epoch of a naive moment, rounded down."""
+    return (moment - EPOCH) // _SECOND
+
+
+def to_epoch_ceil(moment: datetime) -> int:
+    """Return the whole seconds since the epoch of a naive moment, rounded up."""
+    return -((EPOCH - moment) // _SECOND)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def from_epoch(seconds: int) -> datetime:
+    """Return the naive moment of seconds since the epoch.
+
+    Most entries start and end on the same few dates, so the moments are
+    cached. Datetimes are immutable, entries can safely share them.
+    """
+    return EPOCH + timedelta(seconds=seconds)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_epoch(value: str) -> int:
+    """Parse a timestamp of the api, e.g. 2024-12-24T00:00:00, into epoch seconds."""
+    return to_epoch(datetime.fromisoformat(value))
+
+
+# A row of the entry store: the fields of a CalendarEntry in the same order,
+# with the value of the category and the dates in seconds since the epoch.
+EntryRow = tuple[str, str, int, int, int, str, int, int]
+
+
+class EntryInterner:
+    """Hands out one instance of equal entries of the shared categories.
+
+    Public holidays, weekends, releases and seals are in the calendar of every
+    user. The stores keep them as integers, but every entry created from a
+    store for the entities and the services would be a copy of its own.
+    Entries are looked up by their row and only kept while they are in use.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+
+        self._shared = frozenset(category.value for category in SHARED_CATEGORIES)
+        self._entries: WeakValueDictionary[EntryRow, CalendarEntry] = (
+            WeakValueDictionary()
+        )
+
+    def __len__(self) -> int:
+        """Return the number of distinct shared entries in use."""
+        return len(self._entries)
+
+    def entry(self, row: EntryRow) -> CalendarEntry:
+        """Return the entry of a row, the same instance for equal shared rows."""
+
+        if row[2] not in self._shared:
+            return create_entry(row)
+        if (entry := self._entries.get(row)) is None:
+            entry = self._entries[row] = create_entry(row)
+        return entry
+
+
+def create_entry(row: EntryRow) -> CalendarEntry:
+    """Create the entry of a row."""
+
+    return CalendarEntry(
+        row[0],
+        row[1],
+        CATEGORIES_BY_VALUE[row[2]],
+        from_epoch(row[3]),
+        from_epoch(row[4]),
+        row[5],
+        from_epoch(row[6]),
+        from_epoch(row[7]),
+    )
+
+
+# Shared by the stores of all users and config entries, like the caches of
+# the parsed dates.
+SHARED_ENTRIES = EntryInterner()
+
+
+class EntryStore(Sequence[CalendarEntry]):
+    """The entries of a user as columns, sorted on their start date.
+
+    An entry takes a few machine integers: the dates are seconds since the
+    epoch, the category is a byte and the name and description are positions
+    in a table of the distinct strings of the user. Time comparisons run on
+    the integer columns, CalendarEntry objects are only created when an entry
+    is asked for and are not kept by the store.
+    """
+
+    __slots__ = (
+        "_descriptions",
+        "_names",
+        "_strings",
+        "categories",
+        "ends",
+        "ids",
+        "original_ends",
+        "original_starts",
+        "starts",
+    )
+
+    def __init__(self, rows: Iterable[EntryRow] = ()) -> None:
+        """Initialize the store from rows in any order."""
+
+        rows = sorted(rows, key=itemgetter(3))
+        strings: dict[str, int] = {}
+        self.ids = tuple(row[0] for row in rows)
+        self._names = array(
+            "I", [strings.setdefault(row[1], len(strings)) for row in rows]
+        )
+        self.categories = array("B", [row[2] for row in rows])
+        self.starts = array("q", [row[3] for row in rows])
+        self.ends = array("q", [row[4] for row in rows])
+        self._descriptions = array(
+            "I", [strings.setdefault(row[5], len(strings)) for row in rows]
+        )
+        self.original_starts = array("q", [row[6] for row in rows])
+        self.original_ends = array("q", [row[7] for row in rows])
+        self._strings = tuple(strings)
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[CalendarEntry]) -> "EntryStore":
+        """Return a store with the given entries."""
+
+        return cls(
+            (
+                (
+                    entry.id,
+                    entry.name,
+                    entry.category.value,
+                    to_epoch(entry.event_date),
+                    to_epoch(entry.end_date),
+                    entry.description,
+                    to_epoch(entry.original_event_date),
+                    to_epoch(entry.originale_end_date),
+                )
+                for entry in entries
+            )
+        )
+
+    def __len__(self) -> int:
+        """Return the number of entries."""
+        return len(self.ids)
+
+    def __getitem__(self, position):
+        """Return the entry on a position, or a list of entries for a slice."""
+
+        if isinstance(position, slice):
+            return [self._entry(i) for i in range(*position.indices(len(self)))]
+        if position < 0:
+            position += len(self)
+        if not 0 <= position < len(self):
+            raise IndexError("entry position out of range")
+        return self._entry(position)
+
+    def __iter__(self) -> Iterator[CalendarEntry]:
+        """Iterate the entries sorted on their start date."""
+        return map(self._entry, range(len(self)))
+
+    def __eq__(self, other: object) -> bool:
+        """Return if both stores hold the same entries in the same order."""
+
+        if not isinstance(other, EntryStore):
+            return NotImplemented
+        return (
+            self.ids == other.ids
+            and self.starts == other.starts
+            and self.ends == other.ends
+            and self.categories == other.categories
+            and self.original_starts == other.original_starts
+            and self.original_ends == other.original_ends
+            and self._strings == other._strings
+            and self._names == other._names
+            and self._descriptions == other._descriptions
+        )
+
+    __hash__ = None  # type: ignore[assignment]
+
+    @property
+    def nbytes(self) -> int:
+        """Return the size of the columns, without the strings themselves."""
+
+        return sys.getsizeof(self.ids) + sum(
+            column.itemsize * len(column)
+            for column in (
+                self._names,
+                self.categories,
+                self.starts,
+                self.ends,
+                self._descriptions,
+                self.original_starts,
+                self.original_ends,
+            )
+        )
+
+    def row(self, position: int) -> EntryRow:
+        """Return the row of an entry without creating the entry."""
+
+        strings = self._strings
+        return (
+            self.ids[position],
+            strings[self._names[position]],
+            self.categories[position],
+            self.starts[position],
+            self.ends[position],
+            strings[self._descriptions[position]],
+            self.original_starts[position],
+            self.original_ends[position],
+        )
+
+    def rows(self) -> Iterator[EntryRow]:
+        """Iterate the rows of the entries sorted on their start date."""
+        return map(self.row, range(len(self)))
+
+    def _entry(self, position: int) -> CalendarEntry:
+        """Return the entry on a position, equal shared entries are one instance."""
+        return SHARED_ENTRIES.entry(self.row(position))
+
+    def within(self, start: int, end: int) -> "EntryStore":
+        """Return the entries that end at or after start and start before end.
+
+        Returns the same store if no entry was dropped.
+        """
+
+        kept = [
+            position
+            for position, (entry_start, entry_end) in enumerate(
+                zip(self.starts, self.ends, strict=True)
+            )
+            if entry_end >= start and entry_start < end
+        ]
+        if len(kept) == len(self):
+            return self
+        return EntryStore(map(self.row, kept))
+
+
+@dataclass(frozen=True, slots=True)
+class EntryWindow:
+    """The range of entries that is kept, entries outside of it are dropped.
+
+    The start and end are local midnights, the end is exclusive. The window
+    slides every day so the number of entries kept stays the same over time.
+    """
+
+    start: datetime
+    end: datetime
+
+    @classmethod
+    def around(
+        cls, day: date, lookback_days: int, lookahead_days: int
+    ) -> "EntryWindow":
+        """Return the window from lookback days before to lookahead days after a day."""
+
+        midnight = datetime.combine(day, time.min)
+        return cls(
+            midnight - timedelta(days=lookback_days),
+            midnight + timedelta(days=lookahead_days + 1),
+        )
+
+    def contains(self, entry: CalendarEntry) -> bool:
+        """Return if an entry overlaps with the window."""
+        return entry.end_date >= self.start and entry.event_date < self.end
+
+    def prune(self, entries: EntryStore) -> EntryStore:
+        """Return the entries in the window, the same store if none were dropped."""
+        return entries.within(to_epoch(self.start), to_epoch(self.end))
+
+
+@dataclass
+class CachedResponse:
+    """The validators and parsed entries of the last calendar response."""
+
+    etag: str | None
+    last_modified: str | None
+    body_hash: int
+    entries: EntryStore
+    window: EntryWindow | None = None
+
+
+@dataclass(slots=True)
+class FetchStats:
+    """Counters and timings of the calendar requests of a user, for diagnostics.
+
+    Durations are in seconds, a cache hit is a response that did not change.
+    """
+
+    requests: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    retries: int = 0
+    status: int | None = None
+    latency: float | None = None
+    payload_bytes: int | None = None
+    decode_duration: float | None = None
+    parse_duration: float | None = None
+    entry_count: int | None = None
+
+
 class CalendarHelper:
-    """Wrapper around the calendar api."""
+    """Wrapper around the calendar api.
 
-    def __init__(self, api_key: str = "") -> None:
+    The sync methods are kept for scripts, Home Assistant uses the async
+    methods which run on the shared aiohttp session of the instance.
+    """
+
+    def __init__(
+        self,
+        api_key: str = "",
+        session: ClientSession | None = None,
+    ) -> None:
         """Initialize."""
 
         self.api_key = api_key
+        self._session = session
+        self._sync_session: requests.Session | None = None
+        self._responses: dict[tuple[str, str], CachedResponse] = {}
+        self._authenticated_at: float | None = None
+        self._stats: dict[tuple[str, str], FetchStats] = {}
+
+    @property
+    def headers(self) -> dict[str, str]:
+        """Return the headers for a request to the calendar api."""
+        return {"Authorization": "Bearer " + self.api_key}
+
+    def entries_headers(
+        self, fullname: str, element_id: str, window: EntryWindow | None = None
+    ) -> dict[str, str]:
+        """Return the headers to get the entries, conditional if they are cached.
+
+        Entries cached for another window can not be reused, the api always
+        sends all entries so they are requested again to apply the new window.
+        """
+
+        headers = {**self.headers, hdrs.ACCEPT_ENCODING: ACCEPT_ENCODING}
+        cached = self._responses.get((fullname, element_id))
+        if cached is not None and cached.window == window:
+            if cached.etag:
+                headers[hdrs.IF_NONE_MATCH] = cached.etag
+            if cached.last_modified:
+                headers[hdrs.IF_MODIFIED_SINCE] = cached.last_modified
+        return headers
+
+    def fetch_stats(self, fullname: str, element_id: str) -> FetchStats:
+        """Return the request statistics of a user."""
+
+        if (stats := self._stats.get((fullname, element_id))) is None:
+            stats = self._stats[(fullname, element_id)] = FetchStats()
+        return stats
+
+    def invalidate_response(self, fullname: str, element_id: str) -> None:
+        """Request the entries of a user without validators the next time.
+
+        Entries pushed by the calendar replace the fetched ones until the next
+        request, which has to be answered in full. A request in flight can
+        still be answered as not modified, with the entries of the api.
+        """
+        if (cached := self._responses.get((fullname, element_id))) is not None:
+            cached.etag = cached.last_modified = None
+
+    def reuse_entries(
+        self, fullname: str, element_id: str, entries: EntryStore
+    ) -> None:
+        """Hand back entries for the next unchanged response of a user.
+
+        The entries are a store the caller already holds with the same entries
+        as the cached response, so it can tell by identity nothing changed.
+        """
+        if (cached := self._responses.get((fullname, element_id))) is not None:
+            cached.entries = entries
+
+    def record_retry(self, fullname: str, element_id: str) -> None:
+        """Count a retried request of a user."""
+        self.fetch_stats(fullname, element_id).retries += 1
+
+    @staticmethod
+    def entries_params(fullname: str, element_id: str) -> dict[str, str]:
+        """Return the query parameters to get the entries for a given user."""
+        return {"elementId": element_id, "fullname": fullname}
+
+    def _get_sync_session(self) -> requests.Session:
+        """Return the requests session, keeps the connection alive between calls."""
+        if self._sync_session is None:
+            self._sync_session = requests.Session()
+        return self._sync_session
+
+    def _get_session(self, hass: HomeAssistant) -> ClientSession:
+        """Return the aiohttp session, defaults to the shared session of hass."""
+        if self._session is None:
+            self._session = async_get_clientsession(hass)
+        return self._session
 
     def authenticate(self) -> None:
         """Validate if the given api key is valid."""
 
-        url = DOMAIN_METRICS_URL + "/api/custom/calendar/ping"
-        headers = {"Authorization": "Bearer " + self.api_key}
-        response = requests.get(url=url, verify=True, headers=headers)
+        response = self._get_sync_session().get(
+            url=DOMAIN_METRICS_URL + PING_PATH,
+            verify=True,
+            headers=self.headers,
+            timeout=REQUEST_TIMEOUT,
+        )
         data = response.text
         if data != "pong":
-            raise CalendarException("Could not authenticate")
+            raise CalendarAuthException("Could not authenticate")
+        self._authenticated_at = monotonic()
 
     async def authenticate_async(self, hass: HomeAssistant) -> None:
         """Validate if the given api key is valid async."""
 
-        return await hass.async_add_executor_job(self.authenticate)
+        try:
+            async with self._get_session(hass).get(
+                DOMAIN_METRICS_URL + PING_PATH,
+                headers=self.headers,
+                timeout=ClientTimeout(total=REQUEST_TIMEOUT),
+            ) as response:
+                data = await response.text()
+        except (ClientError, TimeoutError) as err:
+            raise CalendarConnectionException(
+                f"Could not reach the calendar api: {err!r}"
+            ) from err
+        if is_transient_status(response.status):
+            raise CalendarConnectionException(
+                f"Calendar api returned status {response.status}"
+            )
+        if data != "pong":
+            raise CalendarAuthException("Could not authenticate")
+        self._authenticated_at = monotonic()
 
-    def get_entries(self, fullname: str, element_id: str) -> list[CalendarEntry]:
-        """Get the entries for a given user."""
+    def needs_authentication(self, max_age: float) -> bool:
+        """Return if the key was never validated, was rejected or is max_age old."""
 
-        url = (
-            DOMAIN_METRICS_URL
-            + f"/api/custom/calendar?elementId={element_id}&fullname={fullname}"
+        return (
+            self._authenticated_at is None
+            or monotonic() - self._authenticated_at >= max_age
         )
-        headers = {"Authorization": "Bearer " + self.api_key}
-        response = requests.get(url=url, verify=True, headers=headers)
-
-        entries: list[CalendarEntry] = []
-        jsonResponse = response.json()
-        if response.status_code >= 400:
-            raise CalendarException(jsonResponse["errors"][0]["detail"])
-
-        for temp in jsonResponse:
-            entry = CalendarEntry(
-                id=temp["ID"],
-                name=temp["Name"],
-                category=CalendarEntryType(temp["Category"]),
-                event_date=datetime.strptime(temp["EventDate"], "%Y-%m-%dT%H:%M:%S"),
-                end_date=datetime.strptime(temp["EndDate"], "%Y-%m-%dT%H:%M:%S"),
-                description=temp["Description"],
-                original_event_date=datetime.strptime(
-                    temp["OriginalEventDate"], "%Y-%m-%dT%H:%M:%S"
-                ),
-                originale_end_date=datetime.strptime(
-                    temp["OriginalEndDate"], "%Y-%m-%dT%H:%M:%S"
-                ),
-            )
-            entries.append(entry)
 
-        return entries
+    def get_entries(
+        self, fullname: str, element_id: str, window: EntryWindow | None = None
+    ) -> EntryStore:
+        """Get the entries for a given user, only those in the window if given.
+
+        If the calendar did not change since the previous call, the list returned
+        by that call is returned again without parsing the response.
+        """
+
+        start = perf_counter()
+        response = self._get_sync_session().get(
+            url=DOMAIN_METRICS_URL + CALENDAR_PATH,
+            params=self.entries_params(fullname, element_id),
+            verify=True,
+            headers=self.entries_headers(fullname, element_id, window),
+            timeout=REQUEST_TIMEOUT,
+        )
+        self.fetch_stats(fullname, element_id).latency = perf_counter() - start
+
+        return self._handle_entries_response(
+            fullname,
+            element_id,
+            response.status_code,
+            response.headers,
+            response.content,
+            window,
+        )
 
     async def get_entries_async(
-        self, hass: HomeAssistant, fullname: str, element_id: str
-    ) -> list[CalendarEntry]:
-        """Get the entries for a given user async."""
+        self,
+        hass: HomeAssistant,
+        fullname: str,
+        element_id: str,
+        window: EntryWindow | None = None,
+    ) -> EntryStore:
+        """Get the entries for a given user async, only those in the window if given.
+
+        If the calendar did not change since the previous call, the list returned
+        by that call is returned again without parsing the response.
+        """
+
+        start = perf_counter()
+        try:
+            async with self._get_session(hass).get(
+                DOMAIN_METRICS_URL + CALENDAR_PATH,
+                params=self.entries_params(fullname, element_id),
+                headers=self.entries_headers(fullname, element_id, window),
+                timeout=ClientTimeout(total=REQUEST_TIMEOUT),
+            ) as response:
+                body = await response.read()
+        except (ClientError, TimeoutError) as err:
+            raise CalendarConnectionException(
+                f"Could not reach the calendar api: {err!r}"
+            ) from err
+        self.fetch_stats(fullname, element_id).latency = perf_counter() - start
+
+        return self._handle_entries_response(
+            fullname, element_id, response.status, response.headers, body, window
+        )
+
+    def _handle_entries_response(
+        self,
+        fullname: str,
+        element_id: str,
+        status: int,
+        headers: Mapping[str, str],
+        body: bytes,
+        window: EntryWindow | None = None,
+    ) -> EntryStore:
+        """Turn a calendar response into entries, reusing them when unchanged."""
+
+        stats = self.fetch_stats(fullname, element_id)
+        stats.requests += 1
+        stats.status = status
+        stats.payload_bytes = len(body)
+
+        if status in HTTP_AUTH_ERRORS:
+            # Validate the key again before the next request.
+            self._authenticated_at = None
+            raise CalendarAuthException(f"Could not authenticate ({status})")
+
+        key = (fullname, element_id)
+        cached = self._responses.get(key)
+        if status == HTTP_NOT_MODIFIED and cached is not None:
+            stats.cache_hits += 1
+            return cached.entries
+
+        if status >= 400:
+            # Error pages of a proxy in front of the api are not json.
+            raise response_error(status, body)
+
+        # Servers that do not support validators still send the same body.
+        body_hash = hash(body)
+        if (
+            cached is not None
+            and cached.body_hash == body_hash
+            and cached.window == window
+        ):
+            stats.cache_hits += 1
+            return cached.entries
+
+        start = perf_counter()
+        try:
+            jsonResponse = json_loads(body)
+        except ValueError as err:
+            raise CalendarConnectionException(
+                "Calendar api returned an invalid response"
+            ) from err
+        stats.decode_duration = perf_counter() - start
+        stats.cache_misses += 1
+        start = perf_counter()
+        entries = self.parse_entries(jsonResponse, window)
+        stats.parse_duration = perf_counter() - start
+        stats.entry_count = len(entries)
+        self._responses[key] = CachedResponse(
+            etag=headers.get(hdrs.ETAG),
+            last_modified=headers.get(hdrs.LAST_MODIFIED),
+            body_hash=body_hash,
+            entries=entries,
+            window=window,
+        )
+        return entries
+
+    @staticmethod
+    def parse_entries(
+        jsonResponse: list[dict],
+        window: EntryWindow | None = None,
+    ) -> EntryStore:
+        """Parse the json response of the calendar api into an entry store.
+
+        Entries outside of the window are skipped before they are parsed, the
+        timestamps of the api have a fixed format so they compare as strings.
+        """
+
+        parse = parse_epoch
+        categories = CATEGORIES_BY_VALUE
+        intern = sys.intern
+        if window is not None:
+            start = window.start.isoformat()
+            end = window.end.isoformat()
+            jsonResponse = [
+                temp
+                for temp in jsonResponse
+                if temp["EndDate"] >= start and temp["EventDate"] < end
+            ]
+        return EntryStore(
+            [
+                (
+                    intern(temp["ID"]),
+                    intern(temp["Name"]),
+                    categories[temp["Category"]].value,
+                    parse(temp["EventDate"]),
+                    parse(temp["EndDate"]),
+                    intern(temp["Description"]),
+                    parse(temp["OriginalEventDate"]),
+                    parse(temp["OriginalEndDate"]),
+                )
+                for temp in jsonResponse
+            ]
+        )
+
+
+def is_transient_status(status: int) -> bool:
+    """Return if a request that failed with this status is worth retrying."""
+    return status == HTTP_TOO_MANY_REQUESTS or status >= 500
+
 
-        return await hass.async_add_executor_job(self.get_entries, fullname, element_id)
+def response_error(status: int, body: bytes) -> "CalendarException":
+    """Return the error for a failed calendar response, json or not."""
+
+    try:
+        detail = json_loads(body)["errors"][0]["detail"]
+    except (ValueError, KeyError, IndexError, TypeError):
+        detail = f"Calendar api returned status {status}"
+
+    if is_transient_status(status):
+        return CalendarConnectionException(detail)
+    return CalendarException(detail)
 
 
 class CalendarException(Exception):
     """Error to indicate there is exception with the Calendar API."""
+
+
+class CalendarAuthException(CalendarException):
+    """Error to indicate the api key was rejected."""
+
+
+class CalendarConnectionException(CalendarException):
+    """Error to indicate the api could not be reached or failed temporarily."""
+
+
+class CalendarCircuitOpenException(CalendarException):
+    """Error to indicate requests are held back after repeated failures."""
@@ -4,18 +4,22 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from time import perf_counter
 
-from homeassistant.config_entries import ConfigEntry
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.device_registry import DeviceEntry
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from .const import DOMAIN
+from .const import DOMAIN, STARTUP_BUDGET
 from .coordinator import CalendarCoordinator
+from .push import async_register_webhook
+from .services import async_setup_services, async_unload_services
+from .store import EntryCache
 
 # For your initial PR, limit it to 1 platform.
-PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.SENSOR]
+PLATFORMS: list[Platform] = [Platform.BINARY_SENSOR, Platform.CALENDAR, Platform.SENSOR]
 
 
 @dataclass
@@ -29,15 +33,26 @@ class RuntimeData:
 async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Set up Skyline Communications Vacation Calendar from a config entry."""
 
+    start = perf_counter()
     hass.data.setdefault(DOMAIN, {})
 
     # Initialise the coordinator that manages data updates from your api.
     # This is defined in coordinator.py
     coordinator = CalendarCoordinator(hass, config_entry)
 
-    # Perform an initial data load from api.
-    # async_config_entry_first_refresh() is special in that it does not log errors if it fails
-    await coordinator.async_config_entry_first_refresh()
+    # Start from the entries of the previous run when they are cached and
+    # revalidate them in the background, so setup does not wait on the api.
+    if await coordinator.async_load_cache():
+        config_entry.async_create_background_task(
+            hass,
+            coordinator.async_refresh(),
+            f"{DOMAIN} revalidate {config_entry.entry_id}",
+        )
+    else:
+        # Perform an initial data load from api. Home Assistant waits for the
+        # setup to start, so a slow api only gets a short budget and the
+        # entities are added while the refresh continues in the background.
+        await coordinator.async_first_refresh(config_entry, STARTUP_BUDGET)
 
     # Initialise a listener for config flow options changes.
     # See config_flow for defining an options setting that shows up as configure on the integration.
@@ -52,9 +67,16 @@ async def async_setup_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> b
         coordinator, cancel_update_listener
     )
 
+    if coordinator.push:
+        async_register_webhook(hass, config_entry, coordinator)
+
     # Setup platforms (based on the list of entity types in PLATFORMS defined above)
     # This calls the async_setup method in each of your entity type files.
     await hass.config_entries.async_forward_entry_setups(config_entry, PLATFORMS)
+
+    async_setup_services(hass)
+
+    coordinator.async_set_setup_duration(perf_counter() - start)
     # for platform in PLATFORMS:
     #     await hass.async_create_task(
     #         hass.config_entries.async_forward_entry_setup(config_entry, platform)
@@ -70,6 +92,11 @@ async def _async_update_listener(hass: HomeAssistant, config_entry):
     await hass.config_entries.async_reload(config_entry.entry_id)
 
 
+async def async_remove_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> None:
+    """Remove the cached entries when the config entry is deleted."""
+    await EntryCache(hass, config_entry.entry_id).async_remove()
+
+
 async def async_remove_config_entry_device(
     hass: HomeAssistant, config_entry: ConfigEntry, device_entry: DeviceEntry
 ) -> bool:
@@ -82,10 +109,6 @@ async def async_remove_config_entry_device(
 
 async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    # Unload services
-    for service in hass.services.async_services_for_domain(DOMAIN):
-        hass.services.async_remove(DOMAIN, service)
-
     # Unload platforms
     unload_ok = await hass.config_entries.async_unload_platforms(
         config_entry, PLATFORMS
@@ -95,5 +118,13 @@ async def async_unload_entry(hass: HomeAssistant, config_entry: ConfigEntry) ->
     if unload_ok:
         hass.data[DOMAIN].pop(config_entry.entry_id)
 
+    # Unload services once the last config entry is unloaded
+    if unload_ok and not any(
+        entry.state is ConfigEntryState.LOADED
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.entry_id != config_entry.entry_id
+    ):
+        async_unload_services(hass)
+
     # Return that unloading was successful.
     return unload_ok
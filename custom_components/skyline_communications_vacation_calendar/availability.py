@@ -0,0 +1,120 @@
+"""Per day availability of every user, as bitsets for fast team queries."""
+
+from __future__ import annotations
+
+from collections.abc import Hashable, Iterable
+from datetime import date
+
+from .CalendarApi import (
+    CATEGORIES_BY_VALUE,
+    EPOCH_ORDINAL,
+    SECONDS_PER_DAY,
+    CalendarEntryType,
+    EntryStore,
+)
+
+
+class TeamAvailability:
+    """Users that have an entry of a category on a day, for all users at once.
+
+    Every user gets a bit, every category maps the ordinal of a day to the
+    mask of the users with an entry of that category on that day. Counting the
+    users of a team on a day is one lookup, an and and a popcount, no entries
+    are touched. When the entries of a user change only the days that differ
+    are updated.
+    """
+
+    def __init__(self) -> None:
+        """Initialize."""
+
+        self._bits: dict[Hashable, int] = {}
+        self._users_by_bit: dict[int, Hashable] = {}
+        self._references: dict[Hashable, int] = {}
+        self._free_bits: list[int] = []
+        self._days: dict[CalendarEntryType, dict[int, int]] = {
+            category: {} for category in CalendarEntryType
+        }
+        self._user_days: dict[Hashable, dict[CalendarEntryType, set[int]]] = {}
+
+    def acquire(self, user: Hashable) -> None:
+        """Start tracking a user, a user that is tracked already is counted again."""
+
+        if user in self._references:
+            self._references[user] += 1
+            return
+
+        bit = self._free_bits.pop() if self._free_bits else len(self._bits)
+        self._references[user] = 1
+        self._bits[user] = bit
+        self._users_by_bit[bit] = user
+        self._user_days[user] = {}
+
+    def release(self, user: Hashable) -> None:
+        """Stop tracking a user once it was released as often as it was acquired."""
+
+        self._references[user] -= 1
+        if self._references[user]:
+            return
+
+        self.set_entries(user, EntryStore())
+        del self._references[user], self._user_days[user]
+        bit = self._bits.pop(user)
+        del self._users_by_bit[bit]
+        self._free_bits.append(bit)
+
+    def set_entries(self, user: Hashable, entries: EntryStore) -> None:
+        """Replace the entries of a user, only the changed days are updated."""
+
+        new_days: dict[CalendarEntryType, set[int]] = {}
+        for value, start, end in zip(
+            entries.categories, entries.starts, entries.ends, strict=True
+        ):
+            new_days.setdefault(CATEGORIES_BY_VALUE[value], set()).update(
+                range(
+                    start // SECONDS_PER_DAY + EPOCH_ORDINAL,
+                    end // SECONDS_PER_DAY + EPOCH_ORDINAL + 1,
+                )
+            )
+
+        bit = 1 << self._bits[user]
+        old_days = self._user_days[user]
+        for category in old_days.keys() | new_days.keys():
+            days = self._days[category]
+            old = old_days.get(category, set())
+            new = new_days.get(category, set())
+            for ordinal in old - new:
+                if mask := days[ordinal] & ~bit:
+                    days[ordinal] = mask
+                else:
+                    del days[ordinal]
+            for ordinal in new - old:
+                days[ordinal] = days.get(ordinal, 0) | bit
+
+        self._user_days[user] = new_days
+
+    def mask(self, users: Iterable[Hashable]) -> int:
+        """Return the mask of the given users that are tracked."""
+
+        mask = 0
+        for user in users:
+            if (bit := self._bits.get(user)) is not None:
+                mask |= 1 << bit
+        return mask
+
+    def users_on(self, day: date, category: CalendarEntryType, mask: int = -1) -> int:
+        """Return the mask of the users with an entry of the category on a day."""
+        return self._days[category].get(day.toordinal(), 0) & mask
+
+    def count(self, day: date, category: CalendarEntryType, mask: int = -1) -> int:
+        """Return the number of users with an entry of the category on a day."""
+        return self.users_on(day, category, mask).bit_count()
+
+    def users(self, mask: int) -> list[Hashable]:
+        """Return the users in a mask."""
+
+        users = []
+        while mask:
+            lowest = mask & -mask
+            users.append(self._users_by_bit[lowest.bit_length() - 1])
+            mask ^= lowest
+        return users
@@ -8,11 +8,11 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .CalendarApi import CalendarEntry, CalendarEntryType
 from .const import DOMAIN
 from .coordinator import CalendarCoordinator
+from .entity import VacationCalendarEntity
+from .timeline import DAY_OFF_CATEGORIES, Timeline
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -37,27 +37,24 @@ async def async_setup_entry(
     #    if device.device_type == DeviceType.DOOR_SENSOR
     # ]
 
-    binary_sensors = [WorkDayBinarySensor(coordinator, coordinator.entries)]
+    binary_sensors = [
+        WorkDayBinarySensor(coordinator, fullname) for fullname in coordinator.fullnames
+    ]
 
     # Create the binary sensors.
     async_add_entities(binary_sensors)
 
 
-class WorkDayBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class WorkDayBinarySensor(VacationCalendarEntity, BinarySensorEntity):
     """Implementation of a sensor."""
 
-    holiday_types = [
-        CalendarEntryType.Absent,
-        CalendarEntryType.Public_Holiday,
-        CalendarEntryType.Weekend,
-    ]
+    holiday_types = DAY_OFF_CATEGORIES
 
-    def __init__(
-        self, coordinator: CalendarCoordinator, entries: list[CalendarEntry]
-    ) -> None:
+    def __init__(self, coordinator: CalendarCoordinator, fullname: str) -> None:
         """Initialise sensor."""
         super().__init__(coordinator)
-        self.calculate_workday(entries)
+        self.fullname = fullname
+        self.calculate_workday(coordinator.calendars[fullname].timeline)
 
     @callback
     def _handle_coordinator_update(self) -> None:
@@ -65,27 +62,16 @@ class WorkDayBinarySensor(CoordinatorEntity, BinarySensorEntity):
         # This method is called by your DataUpdateCoordinator when a successful update runs.
 
         coordinator: CalendarCoordinator = self.coordinator
-        _LOGGER.debug("User: %s", self.coordinator.fullname)
-        self.calculate_workday(coordinator.entries)
-        self.async_write_ha_state()
+        _LOGGER.debug("User: %s", self.fullname)
+        self.calculate_workday(coordinator.calendars[self.fullname].timeline)
+        self.async_write_ha_state_if_changed()
 
-    def calculate_workday(self, entries: list[CalendarEntry]):
+    def calculate_workday(self, timeline: Timeline):
         """Calculate if today is a work day or not."""
 
-        # This needs to enumerate to true or false
-        now = datetime.now()
-
-        matching_entries = [
-            entry
-            for entry in entries
-            if entry.event_date <= now <= entry.end_date
-            and entry.category in self.holiday_types
-        ]
-
-        if matching_entries:
-            self.is_workday = False
-        else:
-            self.is_workday = True
+        # The holiday types outrank working from home, so any active holiday
+        # entry is the effective category of the moment.
+        self.is_workday = timeline.category_at(datetime.now()) not in self.holiday_types
 
     @property
     def device_class(self) -> str | None:
@@ -101,14 +87,14 @@ class WorkDayBinarySensor(CoordinatorEntity, BinarySensorEntity):
         # If your device is created elsewhere, you can just specify the indentifiers parameter.
         # If your device connects via another device, add via_device parameter with the indentifiers of that device.
         return DeviceInfo(
-            name=f"Workday Binary Sensor {self.coordinator.fullname}",
+            name=f"Workday Binary Sensor {self.fullname}",
             manufacturer="DhrMaes",
             model="Workday Binary Sensor 1.0.1",
             sw_version="1.0.1",
             identifiers={
                 (
                     DOMAIN,
-                    f"slc-vaction-calendar-{self.coordinator.fullname}",
+                    f"slc-vaction-calendar-{self.fullname}",
                 )
             },
         )
@@ -116,7 +102,7 @@ class WorkDayBinarySensor(CoordinatorEntity, BinarySensorEntity):
     @property
     def name(self) -> str:
         """Return the name of the sensor."""
-        return f"Workday binary sensor for {self.coordinator.fullname}"
+        return f"Workday binary sensor for {self.fullname}"
 
     @property
     def is_on(self) -> bool | None:
@@ -128,7 +114,7 @@ class WorkDayBinarySensor(CoordinatorEntity, BinarySensorEntity):
         """Return unique id."""
         # All entities must have a unique id.  Think carefully what you want this to be as
         # changing it later will cause HA to create new entities.
-        return f"{DOMAIN}-workday-{self.coordinator.fullname}"
+        return f"{DOMAIN}-workday-{self.fullname}"
 
     @property
     def extra_state_attributes(self):
@@ -136,4 +122,7 @@ class WorkDayBinarySensor(CoordinatorEntity, BinarySensorEntity):
         # Add any additional attributes you want on your sensor.
         attrs = {}
         attrs["friendly_state"] = "workday" if self.is_workday else "day off"
+
+        # Set while the last good entries are served because a refresh failed.
+        attrs["stale_since"] = self.coordinator.calendars[self.fullname].stale_since
         return attrs
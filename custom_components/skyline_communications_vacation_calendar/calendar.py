@@ -0,0 +1,146 @@
+"""Interfaces with the calendar of every user."""
+
+from datetime import datetime, time, timedelta
+import logging
+
+from homeassistant.components.calendar import CalendarEntity, CalendarEvent
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .CalendarApi import CalendarEntry, EntryStore
+from .const import DOMAIN
+from .coordinator import CalendarCoordinator
+from .entity import VacationCalendarEntity
+
+_LOGGER = logging.getLogger(__name__)
+
+# Entry dates have second resolution, an entry ending on this time covers the
+# rest of the day.
+END_OF_DAY = time(23, 59, 59)
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+):
+    """Set up the Calendars."""
+
+    coordinator: CalendarCoordinator = hass.data[DOMAIN][
+        config_entry.entry_id
+    ].coordinator
+
+    async_add_entities(
+        VacationCalendar(coordinator, fullname) for fullname in coordinator.fullnames
+    )
+
+
+def entry_to_event(entry: CalendarEntry) -> CalendarEvent:
+    """Convert an entry into a calendar event.
+
+    Entries that start at midnight and end at the end of a day are all day
+    events, the others are timed events in the local time zone.
+    """
+
+    if entry.event_date.time() == time.min and entry.end_date.time() == END_OF_DAY:
+        start = entry.event_date.date()
+        # The end of an all day event is exclusive.
+        end = entry.end_date.date() + timedelta(days=1)
+    else:
+        start = entry.event_date.astimezone()
+        end = (entry.end_date + timedelta(seconds=1)).astimezone()
+
+    return CalendarEvent(
+        start=start,
+        end=end,
+        summary=entry.name,
+        description=entry.description or None,
+        uid=entry.id,
+    )
+
+
+def to_local(moment: datetime) -> datetime:
+    """Convert a moment to the naive local time the entries use."""
+    return moment.astimezone().replace(tzinfo=None)
+
+
+class VacationCalendar(VacationCalendarEntity, CalendarEntity):
+    """Calendar with all entries of a user.
+
+    Range queries are answered by the entry index of the coordinator, the
+    events are converted once per fetch and reused while the calendar is
+    scrolled.
+    """
+
+    def __init__(self, coordinator: CalendarCoordinator, fullname: str) -> None:
+        """Initialise calendar."""
+        super().__init__(coordinator)
+        self.fullname = fullname
+        self._events: dict[CalendarEntry, CalendarEvent] = {}
+        self._events_source: EntryStore | None = None
+
+    def _event(self, entry: CalendarEntry) -> CalendarEvent:
+        """Return the event of an entry, converting it once per fetch."""
+
+        # A fetch that changed the entries replaces the store of the user.
+        entries = self.coordinator.calendars[self.fullname].entries
+        if entries is not self._events_source:
+            self._events.clear()
+            self._events_source = entries
+
+        # Occurrences of a recurring entry share their id, the entry is unique.
+        if (event := self._events.get(entry)) is None:
+            event = self._events[entry] = entry_to_event(entry)
+        return event
+
+    @property
+    def event(self) -> CalendarEvent | None:
+        """Return the current or next upcoming event."""
+
+        index = self.coordinator.calendars[self.fullname].index
+        now = datetime.now()
+        if current := index.at(now):
+            return self._event(current[0])
+        if upcoming := index.first_after(now):
+            return self._event(upcoming)
+        return None
+
+    async def async_get_events(
+        self, hass: HomeAssistant, start_date: datetime, end_date: datetime
+    ) -> list[CalendarEvent]:
+        """Return calendar events within a datetime range."""
+
+        index = self.coordinator.calendars[self.fullname].index
+        # The end of the range is exclusive, entries start on whole seconds.
+        entries = index.overlapping(
+            to_local(start_date), to_local(end_date) - timedelta(microseconds=1)
+        )
+        return [self._event(entry) for entry in entries]
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return device information."""
+        return DeviceInfo(
+            name=f"Vacation Calendar {self.fullname}",
+            manufacturer="DhrMaes",
+            model="Vacation Calendar 1.0.1",
+            sw_version="1.0.1",
+            identifiers={
+                (
+                    DOMAIN,
+                    f"slc-vaction-calendar-{self.fullname}",
+                )
+            },
+        )
+
+    @property
+    def name(self) -> str:
+        """Return the name of the calendar."""
+        return f"Vacation calendar for {self.fullname}"
+
+    @property
+    def unique_id(self) -> str:
+        """Return unique id."""
+        return f"{DOMAIN}-calendar-{self.fullname}"
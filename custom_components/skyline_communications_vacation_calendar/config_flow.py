@@ -2,18 +2,52 @@
 
 from __future__ import annotations
 
+import asyncio
+from datetime import date
 import logging
 from typing import Any
 
 import voluptuous as vol
 
-from homeassistant.config_entries import ConfigFlow, ConfigFlowResult
-from homeassistant.const import CONF_API_KEY
-from homeassistant.core import HomeAssistant
+from homeassistant.components import webhook
+from homeassistant.config_entries import (
+    ConfigEntry,
+    ConfigFlow,
+    ConfigFlowResult,
+    OptionsFlow,
+)
+from homeassistant.const import CONF_API_KEY, CONF_SCAN_INTERVAL, CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.exceptions import HomeAssistantError
-
-from .CalendarApi import CalendarException, CalendarHelper
-from .const import CONF_ELEMENT_ID, CONF_FULLNAME, DOMAIN
+from homeassistant.helpers.network import NoURLAvailableError
+from homeassistant.helpers.selector import TextSelector, TextSelectorConfig
+
+from .CalendarApi import (
+    CalendarAuthException,
+    CalendarException,
+    CalendarHelper,
+    EntryWindow,
+)
+from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_AUTH_INTERVAL,
+    CONF_ELEMENT_ID,
+    CONF_FULLNAME,
+    CONF_FULLNAMES,
+    CONF_LOOKAHEAD_DAYS,
+    CONF_LOOKBACK_DAYS,
+    CONF_PUSH,
+    CONF_TIMELINE_DAYS,
+    DEFAULT_AUTH_INTERVAL,
+    DEFAULT_LOOKAHEAD_DAYS,
+    DEFAULT_LOOKBACK_DAYS,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TIMELINE_DAYS,
+    DOMAIN,
+    MAX_PARALLEL_FETCHES,
+    MIN_SCAN_INTERVAL,
+)
+from .shared import async_get_shared, entries_stash_key
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,6 +64,15 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
     }
 )
 
+FULLNAMES_SELECTOR = TextSelector(TextSelectorConfig(multiple=True))
+
+STEP_HUB_DATA_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_ELEMENT_ID): str,
+        vol.Required(CONF_FULLNAMES): FULLNAMES_SELECTOR,
+    }
+)
+
 
 async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str, Any]:
     """Validate the user input allows us to connect.
@@ -43,7 +86,7 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     #     your_validate_func, data[CONF_USERNAME], data[CONF_PASSWORD]
     # )
 
-    api = CalendarHelper(data[CONF_API_KEY])
+    api = async_get_shared(hass).async_get_api(data[CONF_API_KEY])
     await api.authenticate_async(hass)
 
     # if not await api.authenticate():
@@ -58,6 +101,49 @@ async def validate_input(hass: HomeAssistant, data: dict[str, Any]) -> dict[str,
     return {"title": "SLC Vacation Calendar"}
 
 
+async def validate_fullnames(
+    hass: HomeAssistant, api: CalendarHelper, element_id: str, fullnames: list[str]
+) -> None:
+    """Validate that the entries of every user of a hub can be fetched.
+
+    The fetched entries are handed over to the first refresh of the coordinator.
+    """
+
+    shared = async_get_shared(hass)
+    # A new entry has no options yet, its coordinator uses the default window.
+    window = EntryWindow.around(
+        date.today(), DEFAULT_LOOKBACK_DAYS, DEFAULT_LOOKAHEAD_DAYS
+    )
+    semaphore = asyncio.Semaphore(MAX_PARALLEL_FETCHES)
+
+    async def _validate(fullname: str) -> None:
+        async with semaphore:
+            entries = await api.get_entries_async(hass, fullname, element_id, window)
+        shared.async_stash(
+            entries_stash_key(api.api_key, element_id, fullname, window), entries
+        )
+
+    await asyncio.gather(*(_validate(fullname) for fullname in fullnames))
+
+
+@callback
+def configured_fullnames(
+    hass: HomeAssistant, skip_entry_id: str | None = None
+) -> set[str]:
+    """Return the full names that are already in a config entry.
+
+    The entities of a user are identified by the full name, so a user can only
+    be in one config entry.
+    """
+
+    return {
+        fullname
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.entry_id != skip_entry_id
+        for fullname in entry.data.get(CONF_FULLNAMES) or [entry.data[CONF_FULLNAME]]
+    }
+
+
 class ConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Skyline Communications Vacation Calendar."""
 
@@ -67,6 +153,12 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
     _input_data: dict[str, Any]
     _title: str
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Create the options flow."""
+        return CalendarOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -74,10 +166,12 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
         if user_input is not None:
             try:
-                api = CalendarHelper(user_input[CONF_API_KEY])
+                api = async_get_shared(self.hass).async_get_api(
+                    user_input[CONF_API_KEY]
+                )
                 await api.authenticate_async(self.hass)
                 # info = await validate_input(self.hass, user_input)
-            except InvalidAuth:
+            except (InvalidAuth, CalendarAuthException):
                 errors["base"] = "invalid_auth"
             except Exception:
                 _LOGGER.exception("Unexpected exception")
@@ -101,7 +195,7 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
                 self._input_data = user_input
 
                 # Call the next step
-                return await self.async_step_settings()
+                return await self.async_step_mode()
 
         return self.async_show_form(
             step_id="user",
@@ -110,6 +204,13 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
             last_step=False,
         )
 
+    async def async_step_mode(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Let the user choose between a single user or a hub of users."""
+
+        return self.async_show_menu(step_id="mode", menu_options=["settings", "hub"])
+
     async def async_step_settings(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -125,13 +226,22 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
         if user_input is not None:
             # The form has been filled in and submitted, so process the data provided.
             try:
-                api = CalendarHelper(self._input_data[CONF_API_KEY])
-                await api.get_entries_async(
-                    self.hass, user_input[CONF_FULLNAME], user_input[CONF_ELEMENT_ID]
+                if user_input[CONF_FULLNAME] in configured_fullnames(self.hass):
+                    raise UserAlreadyConfigured
+                api = async_get_shared(self.hass).async_get_api(
+                    self._input_data[CONF_API_KEY]
+                )
+                await validate_fullnames(
+                    self.hass,
+                    api,
+                    user_input[CONF_ELEMENT_ID],
+                    [user_input[CONF_FULLNAME]],
                 )
                 # info = await validate_input(self.hass, user_input)
+            except UserAlreadyConfigured:
+                errors["base"] = "user_already_configured"
             except CalendarException as ce:
-                _LOGGER.exception()
+                _LOGGER.exception("Could not validate the user")
                 errors["base"] = f"{ce}"
             except Exception:
                 _LOGGER.exception("Unexpected exception")
@@ -159,6 +269,60 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
             last_step=True,
         )
 
+    async def async_step_hub(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Handle the hub step.
+
+        A hub holds one element id and a list of full names that are all fetched
+        by a single coordinator.
+        """
+
+        errors: dict[str, str] = {}
+
+        if user_input is not None:
+            # Drop empty lines and duplicates, keeping the order of the user.
+            fullnames = [
+                fullname
+                for fullname in dict.fromkeys(user_input[CONF_FULLNAMES])
+                if fullname.strip()
+            ]
+            try:
+                if not fullnames:
+                    raise CalendarException("At least one full name is required")
+                if configured_fullnames(self.hass).intersection(fullnames):
+                    raise UserAlreadyConfigured
+                api = async_get_shared(self.hass).async_get_api(
+                    self._input_data[CONF_API_KEY]
+                )
+                await validate_fullnames(
+                    self.hass, api, user_input[CONF_ELEMENT_ID], fullnames
+                )
+            except UserAlreadyConfigured:
+                errors["base"] = "user_already_configured"
+            except CalendarException as ce:
+                _LOGGER.exception("Could not validate the hub")
+                errors["base"] = f"{ce}"
+            except Exception:
+                _LOGGER.exception("Unexpected exception")
+                errors["base"] = "unknown"
+
+            if "base" not in errors:
+                self._title = f"SLC Vacation Calendar - {user_input[CONF_ELEMENT_ID]}"
+                await self.async_set_unique_id(self._title)
+                self._abort_if_unique_id_configured()
+
+                self._input_data.update(user_input)
+                self._input_data[CONF_FULLNAMES] = fullnames
+                return self.async_create_entry(title=self._title, data=self._input_data)
+
+        return self.async_show_form(
+            step_id="hub",
+            data_schema=STEP_HUB_DATA_SCHEMA,
+            errors=errors,
+            last_step=True,
+        )
+
     async def async_step_reconfigure(
         self, user_input: dict[str, Any] | None = None
     ) -> ConfigFlowResult:
@@ -173,11 +337,18 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
         )
 
         if user_input is not None:
+            fullnames = user_input.get(CONF_FULLNAMES) or [user_input[CONF_FULLNAME]]
             try:
+                if configured_fullnames(self.hass, config_entry.entry_id).intersection(
+                    fullnames
+                ):
+                    raise UserAlreadyConfigured
                 await validate_input(self.hass, user_input)
+            except UserAlreadyConfigured:
+                errors["base"] = "user_already_configured"
             except CannotConnect:
                 errors["base"] = "cannot_connect"
-            except InvalidAuth:
+            except (InvalidAuth, CalendarAuthException):
                 errors["base"] = "invalid_auth"
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
@@ -190,6 +361,19 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
                     reason="reconfigure_successful",
                 )
 
+        if CONF_FULLNAMES in config_entry.data:
+            users_field = {
+                vol.Required(
+                    CONF_FULLNAMES, default=config_entry.data[CONF_FULLNAMES]
+                ): FULLNAMES_SELECTOR
+            }
+        else:
+            users_field = {
+                vol.Required(
+                    CONF_FULLNAME, default=config_entry.data[CONF_FULLNAME]
+                ): str
+            }
+
         return self.async_show_form(
             step_id="reconfigure",
             data_schema=vol.Schema(
@@ -197,9 +381,7 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
                     vol.Required(
                         CONF_API_KEY, default=config_entry.data[CONF_API_KEY]
                     ): str,
-                    vol.Required(
-                        CONF_FULLNAME, default=config_entry.data[CONF_FULLNAME]
-                    ): str,
+                    **users_field,
                     vol.Required(
                         CONF_ELEMENT_ID, default=config_entry.data[CONF_ELEMENT_ID]
                     ): str,
@@ -209,9 +391,96 @@ class ConfigFlow(ConfigFlow, domain=DOMAIN):
         )
 
 
+class CalendarOptionsFlow(OptionsFlow):
+    """Handle the options of a config entry."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> ConfigFlowResult:
+        """Manage the options, the entry is reloaded when they change."""
+
+        # The webhook keeps its id, so the calendar does not need to be
+        # reconfigured when push updates are turned off and on again.
+        webhook_id = (
+            self.config_entry.options.get(CONF_WEBHOOK_ID)
+            or webhook.async_generate_id()
+        )
+
+        if user_input is not None:
+            return self.async_create_entry(
+                data={**user_input, CONF_WEBHOOK_ID: webhook_id}
+            )
+
+        try:
+            webhook_url = webhook.async_generate_url(self.hass, webhook_id)
+        except NoURLAvailableError:
+            webhook_url = webhook.async_generate_path(webhook_id)
+
+        return self.async_show_form(
+            step_id="init",
+            description_placeholders={"webhook_url": webhook_url},
+            data_schema=vol.Schema(
+                {
+                    # Seconds between refreshes, the adaptive policy polls
+                    # more or less often around this interval.
+                    vol.Required(
+                        CONF_SCAN_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=MIN_SCAN_INTERVAL)),
+                    vol.Required(
+                        CONF_ADAPTIVE_POLLING,
+                        default=self.config_entry.options.get(
+                            CONF_ADAPTIVE_POLLING, True
+                        ),
+                    ): bool,
+                    # Seconds before a key that was accepted is checked again,
+                    # 0 pings on every refresh like before.
+                    vol.Required(
+                        CONF_AUTH_INTERVAL,
+                        default=self.config_entry.options.get(
+                            CONF_AUTH_INTERVAL, DEFAULT_AUTH_INTERVAL
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    # Days ahead that are resolved into the timeline on every
+                    # fetch, later days are looked up in the entries.
+                    vol.Required(
+                        CONF_TIMELINE_DAYS,
+                        default=self.config_entry.options.get(
+                            CONF_TIMELINE_DAYS, DEFAULT_TIMELINE_DAYS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3660)),
+                    # Entries outside of these days are dropped on every
+                    # refresh, so the number of entries kept stays the same.
+                    vol.Required(
+                        CONF_LOOKBACK_DAYS,
+                        default=self.config_entry.options.get(
+                            CONF_LOOKBACK_DAYS, DEFAULT_LOOKBACK_DAYS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0, max=3660)),
+                    vol.Required(
+                        CONF_LOOKAHEAD_DAYS,
+                        default=self.config_entry.options.get(
+                            CONF_LOOKAHEAD_DAYS, DEFAULT_LOOKAHEAD_DAYS
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=1, max=3660)),
+                    vol.Required(
+                        CONF_PUSH,
+                        default=self.config_entry.options.get(CONF_PUSH, False),
+                    ): bool,
+                }
+            ),
+        )
+
+
 class CannotConnect(HomeAssistantError):
     """Error to indicate we cannot connect."""
 
 
 class InvalidAuth(HomeAssistantError):
     """Error to indicate there is invalid auth."""
+
+
+class UserAlreadyConfigured(HomeAssistantError):
+    """Error to indicate a full name is already in another config entry."""
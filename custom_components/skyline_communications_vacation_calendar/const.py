@@ -5,3 +5,44 @@ DOMAIN_METRICS_URL = "https://domainmetrics-skyline.on.dataminer.services"
 CONF_FULLNAME = "full_name"
 CONF_ELEMENT_ID = "element_id"
 DEFAULT_SCAN_INTERVAL = 3600
+REQUEST_TIMEOUT = 30
+CACHE_SAVE_DELAY = 10
+PARSE_CACHE_SIZE = 4096
+CONF_FULLNAMES = "full_names"
+MAX_PARALLEL_FETCHES = 4
+DATA_SHARED = "shared"
+RATE_LIMIT_PER_SECOND = 2
+RATE_LIMIT_BURST = 5
+REFRESH_JITTER = 60
+CONF_AUTH_INTERVAL = "auth_interval"
+DEFAULT_AUTH_INTERVAL = 86400
+PREFETCH_TTL = 300
+CONF_TIMELINE_DAYS = "timeline_days"
+DEFAULT_TIMELINE_DAYS = 366
+RETRY_ATTEMPTS = 3
+RETRY_BACKOFF = 2
+RETRY_BACKOFF_MAX = 30
+BREAKER_THRESHOLD = 5
+BREAKER_RESET_TIMEOUT = 300
+BREAKER_RESET_TIMEOUT_MAX = 3600
+CONF_LOOKBACK_DAYS = "lookback_days"
+DEFAULT_LOOKBACK_DAYS = 365
+CONF_LOOKAHEAD_DAYS = "lookahead_days"
+DEFAULT_LOOKAHEAD_DAYS = 730
+DAY_INFO_CACHE_SIZE = 1024
+MAX_DAY_INFO_DAYS = 366
+CONF_PUSH = "push"
+PUSH_SCAN_INTERVAL = 21600
+PUSH_DEBOUNCE = 2
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+MIN_SCAN_INTERVAL = 300
+MAX_SCAN_INTERVAL = 21600
+OFFICE_HOURS = (8, 18)
+NIGHT_HOURS = (22, 6)
+CHANGE_BURST = 7200
+TRANSITION_LEAD = 10800
+EVENT_ENTRY = f"{DOMAIN}_entry"
+EVENT_HORIZON = 2
+STARTUP_BUDGET = 2
+STARTUP_RETRY = 10
+STARTUP_RETRY_MAX = 300
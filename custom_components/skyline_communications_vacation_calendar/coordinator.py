@@ -1,30 +1,154 @@
 """Integration 101 Template integration using DataUpdateCoordinator."""
 
-from datetime import timedelta
+import asyncio
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from functools import lru_cache
 import logging
+import random
+from time import perf_counter
+
+from aiohttp import ClientError
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_API_KEY
-from homeassistant.core import HomeAssistant
+from homeassistant.const import CONF_API_KEY, CONF_SCAN_INTERVAL
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.helpers.debounce import Debouncer
+from homeassistant.helpers.device_registry import DeviceEntryType, DeviceInfo
+from homeassistant.helpers.event import async_call_later, async_track_point_in_time
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .CalendarApi import CalendarEntry, CalendarException, CalendarHelper
+from .CalendarApi import CalendarException, EntryStore, EntryWindow, FetchStats
 from .const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_AUTH_INTERVAL,
     CONF_ELEMENT_ID,
     CONF_FULLNAME,
+    CONF_FULLNAMES,
+    CONF_LOOKAHEAD_DAYS,
+    CONF_LOOKBACK_DAYS,
+    CONF_PUSH,
+    CONF_TIMELINE_DAYS,
+    DAY_INFO_CACHE_SIZE,
+    DEFAULT_AUTH_INTERVAL,
+    DEFAULT_LOOKAHEAD_DAYS,
+    DEFAULT_LOOKBACK_DAYS,
     DEFAULT_SCAN_INTERVAL,
+    DEFAULT_TIMELINE_DAYS,
     DOMAIN,
     DOMAIN_METRICS_URL,
+    MAX_PARALLEL_FETCHES,
+    PUSH_DEBOUNCE,
+    PUSH_SCAN_INTERVAL,
+    REFRESH_JITTER,
+    STARTUP_RETRY,
+    STARTUP_RETRY_MAX,
 )
+from .entry_index import EntryIndex
+from .events import EntryEventScheduler
+from .polling import PollingPolicy, PollReason
+from .shared import async_get_shared, entries_stash_key, ping_request_key
+from .store import EntryCache
+from .timeline import DayInfo, Timeline, UpcomingDays, day_info, upcoming_days
 
 _LOGGER = logging.getLogger(__name__)
 
 
+@dataclass
+class UserCalendar:
+    """The entries of one user and the structures derived from them."""
+
+    fullname: str
+    entries: EntryStore = field(default_factory=EntryStore)
+    index: EntryIndex = field(default_factory=EntryIndex)
+    timeline: Timeline = field(default_factory=lambda: Timeline(EntryIndex(), 0))
+    upcoming: UpcomingDays = field(default_factory=lambda: UpcomingDays(date.today()))
+    # When the entries could not be refreshed since, None while they are fresh.
+    stale_since: datetime | None = None
+    # The content hash of every entry by id, to diff the next fetch against.
+    fingerprint: dict[str, int] = field(default_factory=dict)
+    # If the entries were ever set, from a fetch or from the cache.
+    loaded: bool = False
+
+
+@dataclass(slots=True)
+class EntryDiff:
+    """The ids of the entries that were added, removed or changed by a fetch."""
+
+    added: set[str]
+    removed: set[str]
+    changed: set[str]
+
+    def __bool__(self) -> bool:
+        """Return if any entry differs."""
+        return bool(self.added or self.removed or self.changed)
+
+
+@dataclass(slots=True)
+class UsersUpdate:
+    """The outcome of taking over the fetched entries of some users."""
+
+    # If the entries of any user changed.
+    changed: bool = False
+    # If the entries of at least one user were fetched.
+    fetched: bool = False
+
+
+def fingerprint_entries(entries: EntryStore) -> dict[str, int]:
+    """Return the content hash of every entry by id, without creating the entries."""
+
+    fingerprint: dict[str, int] = {}
+    for row in entries.rows():
+        entry_id = row[0]
+        # Entries sharing an id are combined, a change in any of them shows.
+        if (previous := fingerprint.get(entry_id)) is not None:
+            fingerprint[entry_id] = hash((previous, row))
+        else:
+            fingerprint[entry_id] = hash(row)
+    return fingerprint
+
+
+def diff_entries(old: dict[str, int], new: dict[str, int]) -> EntryDiff:
+    """Return the difference between two fingerprints."""
+
+    return EntryDiff(
+        added=new.keys() - old.keys(),
+        removed=old.keys() - new.keys(),
+        changed={
+            entry_id
+            for entry_id in old.keys() & new.keys()
+            if old[entry_id] != new[entry_id]
+        },
+    )
+
+
+@dataclass(slots=True)
+class RefreshStats:
+    """Counters and timings of the refreshes of a coordinator, for diagnostics.
+
+    Durations are in seconds, the listener duration is the time the entities
+    took to update their state and the setup duration the time the setup of
+    the config entry held up the start of Home Assistant.
+    """
+
+    refreshes: int = 0
+    failures: int = 0
+    last_duration: float | None = None
+    last_listener_duration: float | None = None
+    last_success: datetime | None = None
+    setup_duration: float | None = None
+
+
 class CalendarCoordinator(DataUpdateCoordinator):
-    """My example coordinator."""
+    """Coordinator for the calendars of one or more users of an element.
+
+    A config entry either holds a single full name or, in hub mode, a list of
+    full names that are all fetched in one refresh cycle.
+    """
 
-    entries: list[CalendarEntry]
-    counter: int = 0
+    data: dict[str, EntryStore]
 
     def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
         """Initialize coordinator."""
@@ -32,14 +156,43 @@ class CalendarCoordinator(DataUpdateCoordinator):
         # Set variables from values entered in config flow setup
         self.host = DOMAIN_METRICS_URL
         self.api_key = config_entry.data[CONF_API_KEY]
-        self.fullname = config_entry.data[CONF_FULLNAME]
         self.element_id = config_entry.data[CONF_ELEMENT_ID]
+        self.fullnames: list[str] = config_entry.data.get(CONF_FULLNAMES) or [
+            config_entry.data[CONF_FULLNAME]
+        ]
+        self.calendars = {
+            fullname: UserCalendar(fullname) for fullname in self.fullnames
+        }
 
         # set variables from options.  You need a default here incase options have not been set
-        # self.poll_interval = config_entry.options.get(
-        #    CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL
-        # )
-        self.poll_interval = DEFAULT_SCAN_INTERVAL
+        # With push updates the calendar reports its changes, polling is only a
+        # safety net for pushes that got lost.
+        self.push = config_entry.options.get(CONF_PUSH, False)
+        self.poll_interval = (
+            PUSH_SCAN_INTERVAL
+            if self.push
+            else config_entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
+        )
+        self.polling = PollingPolicy(
+            self.poll_interval,
+            adaptive=config_entry.options.get(CONF_ADAPTIVE_POLLING, True),
+            push=self.push,
+        )
+        self.poll_reason = self.polling.reason(datetime.now(), None, None)
+        # When a refresh last found changed entries, for the polling policy.
+        self.last_change: datetime | None = None
+        self.auth_interval = config_entry.options.get(
+            CONF_AUTH_INTERVAL, DEFAULT_AUTH_INTERVAL
+        )
+        self.timeline_days = config_entry.options.get(
+            CONF_TIMELINE_DAYS, DEFAULT_TIMELINE_DAYS
+        )
+        self.lookback_days = config_entry.options.get(
+            CONF_LOOKBACK_DAYS, DEFAULT_LOOKBACK_DAYS
+        )
+        self.lookahead_days = config_entry.options.get(
+            CONF_LOOKAHEAD_DAYS, DEFAULT_LOOKAHEAD_DAYS
+        )
 
         # Initialise DataUpdateCoordinator
         super().__init__(
@@ -49,37 +202,572 @@ class CalendarCoordinator(DataUpdateCoordinator):
             # Method to call on every update interval.
             update_method=self.async_update_data,
             # Polling interval. Will only be polled if there are subscribers.
-            # Using config option here but you can just use a value.
-            update_interval=timedelta(seconds=60),
+            # Entities are refreshed separately on every entry start/end, so this
+            # only needs to pick up changes made in the calendar. The jitter keeps
+            # the config entries from refreshing in the same second.
+            update_interval=self._jittered(self.polling.seconds(self.poll_reason)),
+            # Entities are only notified when the entries changed.
+            always_update=False,
         )
 
-        # Initialise your api here
-        self.api = CalendarHelper(self.api_key)
+        self.entry_id = config_entry.entry_id
+        self.title = config_entry.title
+        self.stats = RefreshStats()
+        self._stats_listeners: list[CALLBACK_TYPE] = []
+        self._unsub_transition: CALLBACK_TYPE | None = None
+        self._fetch_semaphore = asyncio.Semaphore(MAX_PARALLEL_FETCHES)
+        # Failed refreshes in a row while there were no entries to show yet.
+        self._startup_retries = 0
+        # Retries of the users of a hub that were never fetched, while the
+        # others were.
+        self._unloaded_retries = 0
+        self._unsub_unloaded_retry: CALLBACK_TYPE | None = None
+        # Events at the start and end of the entries of every user.
+        self._event_schedulers = {
+            fullname: EntryEventScheduler(hass, fullname) for fullname in self.fullnames
+        }
+        # Users that were pushed as changed, refreshed together after a burst.
+        self._pushed_users: set[str] = set()
+        self._push_debouncer = Debouncer(
+            hass,
+            _LOGGER,
+            cooldown=PUSH_DEBOUNCE,
+            immediate=False,
+            function=self._async_refresh_pushed_users,
+        )
+        # Answers of the day info service, cleared when any entries change.
+        self._day_info = lru_cache(maxsize=DAY_INFO_CACHE_SIZE)(self._compute_day_info)
+
+        # Initialise your api here, it is shared by all entries with this api key
+        self.shared = async_get_shared(hass)
+        self.api = self.shared.async_get_api(self.api_key)
+        self.cache = EntryCache(hass, config_entry.entry_id)
+
+        # Users are tracked domain wide, the team spans all config entries.
+        self.availability = self.shared.availability
+        for fullname in self.fullnames:
+            self.availability.acquire(self.user_key(fullname))
+        self._tracking_availability = True
+
+    async def async_load_cache(self) -> bool:
+        """Load the entries of the previous run, returns False if there are none."""
+
+        cached = await self.cache.async_load()
+        if cached is None or not all(fullname in cached for fullname in self.fullnames):
+            return False
+
+        _LOGGER.debug("Loaded cached entries for %s", ", ".join(self.fullnames))
+        window = self.entry_window()
+        for fullname in self.fullnames:
+            entries = window.prune(cached[fullname])
+            self._async_set_entries(fullname, entries)
+        self._async_schedule_transition()
+        self.data = self._entries_by_user()
+        return True
+
+    async def async_first_refresh(
+        self, config_entry: ConfigEntry, budget: float
+    ) -> None:
+        """Refresh for the first time, continue in the background after the budget.
+
+        Raises ConfigEntryNotReady when the refresh failed within the budget. A
+        refresh that takes longer keeps running while the entities are added,
+        they show as unavailable until it completes.
+        """
+
+        refresh = config_entry.async_create_background_task(
+            self.hass,
+            self.async_refresh(),
+            f"{DOMAIN} first refresh {config_entry.entry_id}",
+        )
+        done, _ = await asyncio.wait({refresh}, timeout=budget)
+        if not done:
+            _LOGGER.debug(
+                "First refresh of %s takes longer than %s seconds, continuing "
+                "in the background",
+                ", ".join(self.fullnames),
+                budget,
+            )
+            return
+        if not self.last_update_success:
+            raise ConfigEntryNotReady from self.last_exception
 
     async def async_update_data(self):
-        """Fetch data from API endpoint.
+        """Fetch data from API endpoint, recording how long it took."""
+
+        start = perf_counter()
+        # The coordinator only notifies the entities when the data differs
+        # from the data it had before this refresh.
+        previous = self.data
+        try:
+            update = await self._async_update_users(self.fullnames)
+        except UpdateFailed:
+            self.stats.failures += 1
+            if self.data is None:
+                self._async_retry_startup()
+            raise
+        else:
+            if self._startup_retries:
+                self._startup_retries = 0
+                self._async_set_interval(self.poll_reason)
+            # Serving the last good entries of every user is not a success.
+            if update.fetched:
+                self.stats.last_success = dt_util.utcnow()
+            else:
+                self.stats.failures += 1
+            self._async_adapt_interval()
+            self._async_schedule_unloaded_retry()
+            data = self._entries_by_user()
+            # Entries pushed during the refresh were shown already, when the
+            # refresh changed them back the coordinator sees no difference.
+            if update.changed and data == previous:
+                self.async_update_listeners()
+            # What is returned here is stored in self.data by the DataUpdateCoordinator
+            return data
+        finally:
+            self.stats.refreshes += 1
+            self.stats.last_duration = perf_counter() - start
+            self._async_update_stats_listeners()
+
+    async def _async_update_users(self, fullnames: list[str]) -> UsersUpdate:
+        """Fetch the entries of the given users, returns what changed.
 
         This is the place to pre-process the data to lookup tables
         so entities can quickly look up their data.
         """
 
-        self.counter = self.counter + 1
-        if self.counter == 1:
-            try:
-                await self.api.authenticate_async(self.hass)
-                self.entries = await self.api.get_entries_async(
-                    self.hass, self.fullname, self.element_id
+        window = self.entry_window()
+        try:
+            # Only ping when the key was never validated, got rejected or the
+            # auth interval passed, a rejected fetch resets the auth state.
+            if self.api.needs_authentication(self.auth_interval):
+                await self.shared.async_shared_request(
+                    ping_request_key(self.api_key),
+                    lambda: self.api.authenticate_async(self.hass),
+                )
+        except (CalendarException, ClientError, TimeoutError) as err:
+            # Without a valid key none of the users can be fetched.
+            return self._async_apply_results(dict.fromkeys(fullnames, err), window)
+
+        results = await asyncio.gather(
+            *(self._async_fetch_entries(fullname, window) for fullname in fullnames),
+            return_exceptions=True,
+        )
+        return self._async_apply_results(
+            dict(zip(fullnames, results, strict=True)), window
+        )
+
+    @callback
+    def _async_apply_results(
+        self,
+        results: dict[str, EntryStore | BaseException],
+        window: EntryWindow,
+    ) -> UsersUpdate:
+        """Take over the fetched entries of users, returns what changed.
+
+        Users that failed keep their last good entries and are marked stale.
+        """
+
+        failures: dict[str, BaseException] = {}
+        changed = stale_changed = False
+        for fullname, result in results.items():
+            calendar = self.calendars[fullname]
+            if isinstance(result, BaseException):
+                # Keep the previous entries of this user, the others are still fresh.
+                failures[fullname] = result
+                continue
+
+            if calendar.stale_since is not None:
+                _LOGGER.info("Fetched the entries of %s again", fullname)
+                calendar.stale_since = None
+                stale_changed = True
+            # The api hands back the previous store when the response did not
+            # change, a new response can still hold the same entries.
+            if result is calendar.entries:
+                continue
+            fingerprint = fingerprint_entries(result)
+            diff = diff_entries(calendar.fingerprint, fingerprint)
+            # A user without entries has nothing to diff on its first fetch,
+            # its structures still have to be built and the cache saved.
+            if diff or not calendar.loaded:
+                _LOGGER.debug(
+                    "Entries of %s changed: %d added, %d removed, %d changed",
+                    fullname,
+                    len(diff.added),
+                    len(diff.removed),
+                    len(diff.changed),
                 )
+                self._async_set_entries(fullname, result, fingerprint)
+                changed = True
+            else:
+                # Keep the structures, the next unchanged response hands back
+                # the store they were built from.
+                self.api.reuse_entries(fullname, self.element_id, calendar.entries)
+
+        if failures and self._async_mark_stale(failures):
+            stale_changed = True
+        # The window moved since the last good fetch of the users that failed.
+        if self._async_prune(window):
+            changed = True
+
+        if changed:
+            # The first fetch after a start is not an edit of the calendar.
+            if self.data is not None:
+                self.last_change = datetime.now()
+            self._async_schedule_transition()
+            self.cache.async_save(self._entries_by_user())
+        elif stale_changed:
+            # The coordinator only notifies the entities when the entries changed.
+            self.async_update_listeners()
+        return UsersUpdate(changed, fetched=len(failures) < len(results))
+
+    @callback
+    def async_push_changed(self, fullnames: list[str]) -> None:
+        """Refresh users the calendar reported as changed, bursts are combined."""
+
+        self._pushed_users.update(fullnames)
+        self.hass.async_create_task(self._push_debouncer.async_call())
+
+    async def _async_refresh_pushed_users(self) -> None:
+        """Fetch the entries of the users that were pushed as changed."""
+
+        fullnames = [
+            fullname for fullname in self.fullnames if fullname in self._pushed_users
+        ]
+        self._pushed_users.clear()
+        try:
+            update = await self._async_update_users(fullnames)
+        except UpdateFailed as err:
+            _LOGGER.warning("Could not refresh the pushed users: %s", err)
+            return
+        if update.changed:
+            # Also pushes back the next poll, it is only a safety net.
+            self.async_set_updated_data(self._entries_by_user())
+
+    @callback
+    def async_push_entries(self, fullname: str, rows: list[dict]) -> None:
+        """Take over the entries of a user as pushed by the calendar.
+
+        The rows have the format of the calendar api. The api stays the source
+        of truth, the next poll replaces them if it returns other entries.
+        """
 
-            except CalendarException as err:
-                _LOGGER.error(err)
+        window = self.entry_window()
+        entries = self.api.parse_entries(rows, window)
+        # The next poll compares the full response of the api with the pushed
+        # entries, it is not answered as not modified.
+        self.api.invalidate_response(fullname, self.element_id)
+        if self._async_apply_results({fullname: entries}, window).changed:
+            self.async_set_updated_data(self._entries_by_user())
+
+    @staticmethod
+    def _jittered(seconds: float) -> timedelta:
+        """Return an interval with jitter, so entries do not refresh in the same second."""
+        return timedelta(seconds=seconds + random.uniform(0, REFRESH_JITTER))
+
+    @callback
+    def _async_retry_startup(self) -> None:
+        """Retry soon while the entities have nothing to show, backing off each time.
+
+        Setup no longer fails when the first refresh outlasts the startup
+        budget, so Home Assistant does not retry it and the coordinator has to.
+        """
+
+        seconds = self._startup_retry_delay(self._startup_retries)
+        self._startup_retries += 1
+        _LOGGER.debug("No entries yet, retrying in %d seconds", seconds)
+        self.update_interval = timedelta(seconds=seconds)
+
+    def _startup_retry_delay(self, retries: int) -> float:
+        """Return the delay before a retry, doubling up to the poll interval."""
+        return min(
+            STARTUP_RETRY * 2**retries,
+            STARTUP_RETRY_MAX,
+            self.polling.seconds(self.poll_reason),
+        )
+
+    @callback
+    def _async_schedule_unloaded_retry(self) -> None:
+        """Fetch the users that were never fetched again soon, backing off each time.
+
+        A refresh succeeds when any user of a hub was fetched, the others would
+        wait for the next poll while their entities have nothing to show.
+        """
+
+        if self._unsub_unloaded_retry is not None:
+            return
+        if all(calendar.loaded for calendar in self.calendars.values()):
+            self._unloaded_retries = 0
+            return
+
+        seconds = self._startup_retry_delay(self._unloaded_retries)
+        self._unloaded_retries += 1
+        _LOGGER.debug("Not all users were fetched yet, retrying in %d seconds", seconds)
+        self._unsub_unloaded_retry = async_call_later(
+            self.hass, seconds, self._async_retry_unloaded
+        )
+
+    async def _async_retry_unloaded(self, _now: datetime) -> None:
+        """Fetch the entries of the users that were never fetched."""
+
+        self._unsub_unloaded_retry = None
+        fullnames = [
+            fullname
+            for fullname, calendar in self.calendars.items()
+            if not calendar.loaded
+        ]
+        try:
+            update = await self._async_update_users(fullnames)
+        except UpdateFailed as err:
+            _LOGGER.debug("Could not fetch the users that were not fetched: %s", err)
+        else:
+            if update.changed:
+                self.async_set_updated_data(self._entries_by_user())
+        self._async_schedule_unloaded_retry()
+
+    @callback
+    def _async_adapt_interval(self) -> None:
+        """Pick the interval until the next refresh, it is scheduled after this one."""
+
+        now = datetime.now()
+        next_transition = min(
+            (
+                transition
+                for calendar in self.calendars.values()
+                if (transition := calendar.index.next_transition(now)) is not None
+            ),
+            default=None,
+        )
+        reason = self.polling.reason(now, self.last_change, next_transition)
+        if reason is not self.poll_reason:
+            self._async_set_interval(reason)
+
+    @callback
+    def _async_set_interval(self, reason: PollReason) -> None:
+        """Refresh at the interval of a reason from the next refresh on."""
+
+        self.poll_reason = reason
+        self.update_interval = self._jittered(self.polling.seconds(reason))
+        _LOGGER.debug(
+            "Refreshing every %d seconds (%s)",
+            self.update_interval.total_seconds(),
+            reason,
+        )
+
+    @callback
+    def _async_mark_stale(self, failures: dict[str, BaseException]) -> bool:
+        """Keep serving the last good entries of users that could not be fetched.
+
+        Raises UpdateFailed when none of the users has entries to fall back on,
+        returns if a user became stale.
+        """
+
+        if self.data is None and len(failures) == len(self.fullnames):
+            err = next(iter(failures.values()))
+            if isinstance(err, CalendarException):
                 raise UpdateFailed(err) from err
-            except Exception as err:
-                # This will show entities as unavailable by raising UpdateFailed exception
-                raise UpdateFailed(f"Error communicating with API: {err}") from err
+            raise UpdateFailed(f"Error communicating with API: {err}") from err
+
+        now = dt_util.utcnow()
+        became_stale = False
+        for fullname, err in failures.items():
+            calendar = self.calendars[fullname]
+            if calendar.stale_since is None:
+                if calendar.loaded:
+                    _LOGGER.warning(
+                        "Could not fetch the entries of %s, keeping the last good "
+                        "entries: %s",
+                        fullname,
+                        err,
+                    )
+                else:
+                    # Nothing to keep, the entities of the user stay unavailable.
+                    _LOGGER.warning(
+                        "Could not fetch the entries of %s: %s", fullname, err
+                    )
+                calendar.stale_since = now
+                became_stale = True
+            else:
+                _LOGGER.debug("Could not fetch the entries of %s: %s", fullname, err)
+        return became_stale
+
+    @callback
+    def _async_prune(self, window: EntryWindow) -> bool:
+        """Drop the entries that fell out of the window, returns if any were dropped."""
+
+        pruned = False
+        for fullname, calendar in self.calendars.items():
+            entries = window.prune(calendar.entries)
+            if entries is not calendar.entries:
+                self._async_set_entries(fullname, entries)
+                pruned = True
+        return pruned
+
+    async def _async_fetch_entries(
+        self, fullname: str, window: EntryWindow
+    ) -> EntryStore:
+        """Fetch the entries of one user, bounded by the number of parallel fetches."""
+
+        key = entries_stash_key(self.api_key, self.element_id, fullname, window)
+        # The config flow already fetched the entries when the entry was created.
+        if (entries := self.shared.async_pop_stashed(key)) is not None:
+            return entries
+
+        async with self._fetch_semaphore:
+            return await self.shared.async_request(
+                lambda: self.api.get_entries_async(
+                    self.hass, fullname, self.element_id, window
+                ),
+                on_retry=lambda: self.api.record_retry(fullname, self.element_id),
+            )
+
+    @property
+    def device_info(self) -> DeviceInfo:
+        """Return the device of the config entry, for entities that are not per user."""
+        return DeviceInfo(
+            name=self.title,
+            manufacturer="DhrMaes",
+            entry_type=DeviceEntryType.SERVICE,
+            identifiers={(DOMAIN, self.entry_id)},
+        )
+
+    def entry_window(self) -> EntryWindow:
+        """Return the window of entries that is kept today."""
+        return EntryWindow.around(date.today(), self.lookback_days, self.lookahead_days)
+
+    def day_info(self, fullname: str, day: date) -> DayInfo:
+        """Return the category and the entries of a user on a day, memoized."""
+        return self._day_info(fullname, day)
+
+    def _compute_day_info(self, fullname: str, day: date) -> DayInfo:
+        """Look up the category and the entries of a user on a day."""
+        return day_info(self.calendars[fullname].index, day)
+
+    def user_key(self, fullname: str) -> tuple[str, str]:
+        """Return the key of a user in the team availability."""
+        return (self.element_id, fullname)
+
+    @callback
+    def async_add_stats_listener(self, update_callback: CALLBACK_TYPE) -> CALLBACK_TYPE:
+        """Call back after every refresh, also when the entries did not change."""
+
+        self._stats_listeners.append(update_callback)
+        return lambda: self._stats_listeners.remove(update_callback)
+
+    @callback
+    def _async_update_stats_listeners(self) -> None:
+        """Call back the listeners of the refresh statistics."""
+
+        for update_callback in list(self._stats_listeners):
+            update_callback()
+
+    @callback
+    def async_set_setup_duration(self, seconds: float) -> None:
+        """Record how long the setup of the config entry took."""
+
+        _LOGGER.debug("Setup of %s took %.3f seconds", self.title, seconds)
+        self.stats.setup_duration = seconds
+        self._async_update_stats_listeners()
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners, recording how long they took."""
+
+        start = perf_counter()
+        super().async_update_listeners()
+        self.stats.last_listener_duration = perf_counter() - start
+
+    def fetch_stats(self) -> dict[str, FetchStats]:
+        """Return the request statistics of every user."""
+
+        return {
+            fullname: self.api.fetch_stats(fullname, self.element_id)
+            for fullname in self.fullnames
+        }
+
+    def _entries_by_user(self) -> dict[str, EntryStore]:
+        """Return the current entries of every user."""
+
+        return {
+            fullname: calendar.entries for fullname, calendar in self.calendars.items()
+        }
+
+    @callback
+    def _async_set_entries(
+        self,
+        fullname: str,
+        entries: EntryStore,
+        fingerprint: dict[str, int] | None = None,
+    ) -> None:
+        """Replace the entries of a user and rebuild the structures derived from them."""
+
+        calendar = self.calendars[fullname]
+        calendar.entries = entries
+        calendar.loaded = True
+        calendar.fingerprint = (
+            fingerprint if fingerprint is not None else fingerprint_entries(entries)
+        )
+        # Build the lookup structures once, entities query them on every transition.
+        calendar.index = EntryIndex(entries)
+        calendar.timeline = Timeline(calendar.index, self.timeline_days)
+        calendar.upcoming = upcoming_days(
+            calendar.index, date.today(), self.timeline_days
+        )
+        self._event_schedulers[fullname].async_update(calendar.index)
+        self._day_info.cache_clear()
+        self.availability.set_entries(self.user_key(fullname), entries)
+
+    @callback
+    def _async_schedule_transition(self) -> None:
+        """Wake up on the next entry start or end of any user, or at midnight."""
+
+        if self._unsub_transition is not None:
+            self._unsub_transition()
+            self._unsub_transition = None
+
+        now = datetime.now()
+        next_transition = datetime.combine(now.date() + timedelta(days=1), time.min)
+        for calendar in self.calendars.values():
+            entry_transition = calendar.index.next_transition(now)
+            if entry_transition is not None and entry_transition < next_transition:
+                next_transition = entry_transition
+
+        # Entry dates are naive local times, the same clock the entities use.
+        self._unsub_transition = async_track_point_in_time(
+            self.hass, self._async_handle_transition, next_transition.astimezone()
+        )
+
+    @callback
+    def _async_handle_transition(self, _now: datetime) -> None:
+        """Let the entities recalculate their state at a transition."""
+
+        self._unsub_transition = None
+        # The next days only move when a day passes, not on every transition.
+        today = date.today()
+        for fullname, calendar in self.calendars.items():
+            if calendar.upcoming.day != today:
+                calendar.upcoming = upcoming_days(
+                    calendar.index, today, self.timeline_days
+                )
+                # Schedule the events of the day that came within reach.
+                self._event_schedulers[fullname].async_update(calendar.index)
+        self.async_update_listeners()
+        self._async_schedule_transition()
 
-        if self.counter >= 60:
-            self.counter = 0
+    async def async_shutdown(self) -> None:
+        """Cancel the transition timer and stop tracking the users."""
 
-        # What is returned here is stored in self.data by the DataUpdateCoordinator
-        return self.entries
+        await super().async_shutdown()
+        self._push_debouncer.async_shutdown()
+        if self._unsub_unloaded_retry is not None:
+            self._unsub_unloaded_retry()
+            self._unsub_unloaded_retry = None
+        for scheduler in self._event_schedulers.values():
+            scheduler.async_cancel()
+        if self._unsub_transition is not None:
+            self._unsub_transition()
+            self._unsub_transition = None
+        if self._tracking_availability:
+            self._tracking_availability = False
+            for fullname in self.fullnames:
+                self.availability.release(self.user_key(fullname))
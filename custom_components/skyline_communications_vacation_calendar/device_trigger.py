@@ -0,0 +1,89 @@
+"""Device triggers for the start and end of calendar entries."""
+
+from __future__ import annotations
+
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.device_automation import DEVICE_TRIGGER_BASE_SCHEMA
+from homeassistant.components.homeassistant.triggers import event as event_trigger
+from homeassistant.const import (
+    CONF_DEVICE_ID,
+    CONF_DOMAIN,
+    CONF_EVENT,
+    CONF_PLATFORM,
+    CONF_TYPE,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.trigger import TriggerActionType, TriggerInfo
+from homeassistant.helpers.typing import ConfigType
+
+from .CalendarApi import CalendarEntryType
+from .const import DOMAIN, EVENT_ENTRY
+from .events import EVENT_ENDED, EVENT_STARTED
+
+CONF_SUBTYPE = "subtype"
+
+TRIGGER_TYPES = (EVENT_STARTED, EVENT_ENDED)
+TRIGGER_SUBTYPES = tuple(category.name.lower() for category in CalendarEntryType)
+
+TRIGGER_SCHEMA = DEVICE_TRIGGER_BASE_SCHEMA.extend(
+    {
+        vol.Required(CONF_TYPE): vol.In(TRIGGER_TYPES),
+        vol.Required(CONF_SUBTYPE): vol.In(TRIGGER_SUBTYPES),
+    }
+)
+
+
+async def async_get_triggers(
+    hass: HomeAssistant, device_id: str
+) -> list[dict[str, Any]]:
+    """Return the triggers of the device of a user."""
+
+    device = dr.async_get(hass).async_get(device_id)
+    if device is None or not any(
+        domain == DOMAIN and identifier.startswith("slc-vaction-calendar-")
+        for domain, identifier in device.identifiers
+    ):
+        return []
+
+    return [
+        {
+            CONF_PLATFORM: "device",
+            CONF_DEVICE_ID: device_id,
+            CONF_DOMAIN: DOMAIN,
+            CONF_TYPE: trigger_type,
+            CONF_SUBTYPE: subtype,
+        }
+        for trigger_type in TRIGGER_TYPES
+        for subtype in TRIGGER_SUBTYPES
+    ]
+
+
+async def async_attach_trigger(
+    hass: HomeAssistant,
+    config: ConfigType,
+    action: TriggerActionType,
+    trigger_info: TriggerInfo,
+) -> CALLBACK_TYPE:
+    """Attach a trigger to the entry events of the device."""
+
+    return await event_trigger.async_attach_trigger(
+        hass,
+        event_trigger.TRIGGER_SCHEMA(
+            {
+                event_trigger.CONF_PLATFORM: CONF_EVENT,
+                event_trigger.CONF_EVENT_TYPE: EVENT_ENTRY,
+                event_trigger.CONF_EVENT_DATA: {
+                    CONF_DEVICE_ID: config[CONF_DEVICE_ID],
+                    CONF_TYPE: config[CONF_TYPE],
+                    "category": config[CONF_SUBTYPE],
+                },
+            }
+        ),
+        action,
+        trigger_info,
+        platform_type="device",
+    )
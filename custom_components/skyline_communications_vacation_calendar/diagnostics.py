@@ -0,0 +1,71 @@
+"""Diagnostics support for the Skyline Communications Vacation Calendar integration."""
+
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_API_KEY, CONF_UNIQUE_ID, CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .CalendarApi import SHARED_ENTRIES
+from .const import CONF_FULLNAME, CONF_FULLNAMES, DOMAIN
+from .coordinator import CalendarCoordinator
+
+# The webhook id is the only secret of the push endpoint. The title and the
+# unique id of a config entry for one user hold the full name.
+TO_REDACT = {
+    CONF_API_KEY,
+    CONF_FULLNAME,
+    CONF_FULLNAMES,
+    CONF_UNIQUE_ID,
+    CONF_WEBHOOK_ID,
+    "title",
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, config_entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return the refresh statistics of a config entry."""
+
+    coordinator: CalendarCoordinator = hass.data[DOMAIN][
+        config_entry.entry_id
+    ].coordinator
+
+    stats = asdict(coordinator.stats)
+    if coordinator.stats.last_success is not None:
+        stats["seconds_since_last_success"] = (
+            dt_util.utcnow() - coordinator.stats.last_success
+        ).total_seconds()
+
+    return {
+        "entry": async_redact_data(config_entry.as_dict(), TO_REDACT),
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "last_exception": repr(coordinator.last_exception),
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "poll_reason": coordinator.poll_reason,
+            "poll_interval": coordinator.polling.seconds(coordinator.poll_reason),
+            "circuit_breaker": coordinator.shared.breaker.state,
+            "shared_entries": len(SHARED_ENTRIES),
+            **stats,
+        },
+        # Users are numbered in the order of the config entry, so the full names
+        # do not end up in the diagnostics.
+        "users": {
+            f"user_{number}": {
+                "entries": len(coordinator.calendars[fullname].entries),
+                "entry_store_bytes": coordinator.calendars[fullname].entries.nbytes,
+                "timeline_days": len(coordinator.calendars[fullname].timeline),
+                "stale_since": coordinator.calendars[fullname].stale_since,
+                **asdict(fetch_stats),
+            }
+            for number, (fullname, fetch_stats) in enumerate(
+                coordinator.fetch_stats().items(), 1
+            )
+        },
+    }
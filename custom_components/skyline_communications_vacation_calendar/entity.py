@@ -0,0 +1,64 @@
+"""Base entity of the Skyline Communications Vacation Calendar integration."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+
+class VacationCalendarEntity(CoordinatorEntity):
+    """Entity of a coordinator that only writes its state when it changed.
+
+    The coordinator notifies all its entities when the entries of any user
+    changed, at every entry start or end and at midnight. Most of these
+    notifications leave the state of an entity as it was, writing it anyway
+    adds a row to the recorder and fires a state_changed event for nothing.
+
+    Entities are added before the first refresh completed when it is slow,
+    they are unavailable until there are entries to show. The entities of a
+    user stay unavailable until the entries of that user were fetched once,
+    other users of a hub can load before.
+    """
+
+    # The user the entity shows, None for entities of the whole config entry.
+    fullname: str | None = None
+    _written_state: tuple[Any, ...] | None = None
+
+    @property
+    def available(self) -> bool:
+        """Return if the entries were refreshed or loaded from the cache."""
+
+        if not super().available or self.coordinator.data is None:
+            return False
+        return self.fullname is None or self.coordinator.calendars[self.fullname].loaded
+
+    def _state_fingerprint(self) -> tuple[Any, ...]:
+        """Return everything that ends up in the state machine."""
+        return (
+            self.available,
+            self.state,
+            self.state_attributes,
+            self.extra_state_attributes,
+        )
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the state that is written when the entity is added."""
+        await super().async_added_to_hass()
+        self._written_state = self._state_fingerprint()
+
+    @callback
+    def async_write_ha_state_if_changed(self) -> None:
+        """Write the state only if it differs from the last written state."""
+
+        fingerprint = self._state_fingerprint()
+        if fingerprint == self._written_state:
+            return
+        self._written_state = fingerprint
+        self.async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        self.async_write_ha_state_if_changed()
@@ -0,0 +1,119 @@
+"""Interval index over the calendar entries of a user."""
+
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timedelta
+
+from .CalendarApi import CalendarEntry, EntryStore, from_epoch, to_epoch, to_epoch_ceil
+
+
+class EntryIndex:
+    """Static interval tree over the entry store of a user.
+
+    The store is sorted on start date and is used as an implicit balanced
+    tree. Every node keeps the latest end date of its subtree, so subtrees that
+    ended before the query are skipped as a whole. Queries cost O(log n + k)
+    for k matching entries and compare the integer columns of the store, only
+    the matching entries are created. The index is built once per fetch.
+    """
+
+    # Entries are active up to and including their end date, which has second
+    # resolution, so the state changes one second after it.
+    END_TRANSITION_DELAY = timedelta(seconds=1)
+
+    def __init__(self, entries: EntryStore | Iterable[CalendarEntry] = ()) -> None:
+        """Initialize the index, entries that are not in a store are stored first."""
+
+        if not isinstance(entries, EntryStore):
+            entries = EntryStore.from_entries(entries)
+        self.store = entries
+        self._max_ends = array("q", entries.ends)
+        self._build(0, len(entries))
+        delay = self.END_TRANSITION_DELAY // timedelta(seconds=1)
+        self._transitions = array(
+            "q", sorted({*entries.starts, *(end + delay for end in entries.ends)})
+        )
+
+    def _build(self, lo: int, hi: int) -> int | None:
+        """Store the latest end date of every subtree in its root node."""
+
+        if lo >= hi:
+            return None
+
+        mid = (lo + hi) // 2
+        max_end = self.store.ends[mid]
+        for child_max_end in (self._build(lo, mid), self._build(mid + 1, hi)):
+            if child_max_end is not None and child_max_end > max_end:
+                max_end = child_max_end
+
+        self._max_ends[mid] = max_end
+        return max_end
+
+    def __len__(self) -> int:
+        """Return the number of indexed entries."""
+        return len(self.store)
+
+    def __iter__(self) -> Iterator[CalendarEntry]:
+        """Iterate the indexed entries sorted on their start date."""
+        return iter(self.store)
+
+    def next_transition(self, after: datetime) -> datetime | None:
+        """Return the first moment after the given one where an entry starts or ends."""
+
+        position = bisect_right(self._transitions, to_epoch(after))
+        if position < len(self._transitions):
+            return from_epoch(self._transitions[position])
+        return None
+
+    def first_after(self, moment: datetime) -> CalendarEntry | None:
+        """Return the first entry that starts after the given moment."""
+
+        position = bisect_right(self.store.starts, to_epoch(moment))
+        if position < len(self.store):
+            return self.store[position]
+        return None
+
+    def at(self, moment: datetime) -> list[CalendarEntry]:
+        """Return the entries that are active on the given moment."""
+        return self.overlapping(moment, moment)
+
+    def overlapping(self, start: datetime, end: datetime) -> list[CalendarEntry]:
+        """Return the entries that overlap with [start, end], sorted on start date."""
+
+        positions: list[int] = []
+        # Entry dates are whole seconds, only the whole seconds of the range count.
+        self._collect(
+            0, len(self.store), to_epoch_ceil(start), to_epoch(end), positions
+        )
+        return [self.store[position] for position in positions]
+
+    def _collect(
+        self,
+        lo: int,
+        hi: int,
+        start: int,
+        end: int,
+        result: list[int],
+    ) -> None:
+        """Walk the subtree [lo, hi) in order and collect the overlapping positions."""
+
+        starts, ends = self.store.starts, self.store.ends
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._max_ends[mid] < start:
+                # Everything in this subtree ended before the requested range.
+                return
+
+            self._collect(lo, mid, start, end, result)
+
+            if starts[mid] > end:
+                # This node and its right subtree start after the requested range.
+                return
+
+            if ends[mid] >= start:
+                result.append(mid)
+
+            lo = mid + 1
@@ -0,0 +1,100 @@
+"""Events fired on the exact moment an entry starts or ends."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.event import async_track_point_in_time
+
+from .CalendarApi import CalendarEntry
+from .const import DOMAIN, EVENT_ENTRY, EVENT_HORIZON
+from .entry_index import EntryIndex
+
+EVENT_STARTED = "started"
+EVENT_ENDED = "ended"
+
+
+class EntryEventScheduler:
+    """Fires an event when an entry of a user starts and when it ends.
+
+    Only the starts and ends in the next days get a timer, the entries are
+    looked up in the entry index. When the entries change the timers of the
+    entries that are still there are kept, only the timers of removed entries
+    are cancelled and new entries get new timers.
+    """
+
+    def __init__(self, hass: HomeAssistant, fullname: str) -> None:
+        """Initialize."""
+
+        self.hass = hass
+        self.fullname = fullname
+        self._timers: dict[tuple[CalendarEntry, str], CALLBACK_TYPE] = {}
+
+    def __len__(self) -> int:
+        """Return the number of pending timers."""
+        return len(self._timers)
+
+    @callback
+    def async_update(self, index: EntryIndex) -> None:
+        """Schedule the starts and ends of the next days of the indexed entries."""
+
+        now = datetime.now()
+        horizon = now + timedelta(days=EVENT_HORIZON)
+        wanted: dict[tuple[CalendarEntry, str], datetime] = {}
+        for entry in index.overlapping(now, horizon):
+            for event_type, moment in (
+                (EVENT_STARTED, entry.event_date),
+                (EVENT_ENDED, entry.end_date + EntryIndex.END_TRANSITION_DELAY),
+            ):
+                if now < moment <= horizon:
+                    wanted[(entry, event_type)] = moment
+
+        for key in self._timers.keys() - wanted.keys():
+            self._timers.pop(key)()
+
+        for key in wanted.keys() - self._timers.keys():
+            self._timers[key] = self._async_track(*key, wanted[key])
+
+    @callback
+    def _async_track(
+        self, entry: CalendarEntry, event_type: str, moment: datetime
+    ) -> CALLBACK_TYPE:
+        """Fire an event on a moment, entry dates are naive local times."""
+
+        @callback
+        def _async_fire(_now: datetime) -> None:
+            del self._timers[(entry, event_type)]
+            self.async_fire(entry, event_type)
+
+        return async_track_point_in_time(self.hass, _async_fire, moment.astimezone())
+
+    @callback
+    def async_fire(self, entry: CalendarEntry, event_type: str) -> None:
+        """Fire the event of an entry that started or ended."""
+
+        device = dr.async_get(self.hass).async_get_device(
+            identifiers={(DOMAIN, f"slc-vaction-calendar-{self.fullname}")}
+        )
+        self.hass.bus.async_fire(
+            EVENT_ENTRY,
+            {
+                "device_id": device.id if device else None,
+                "full_name": self.fullname,
+                "type": event_type,
+                "category": entry.category.name.lower(),
+                "entry_id": entry.id,
+                "name": entry.name,
+                "start": entry.event_date.isoformat(),
+                "end": entry.end_date.isoformat(),
+            },
+        )
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel all timers."""
+
+        for unsub in self._timers.values():
+            unsub()
+        self._timers.clear()
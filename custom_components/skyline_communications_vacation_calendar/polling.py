@@ -0,0 +1,96 @@
+"""Adaptive refresh interval of the coordinator."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import StrEnum
+
+from .const import (
+    CHANGE_BURST,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    NIGHT_HOURS,
+    OFFICE_HOURS,
+    TRANSITION_LEAD,
+)
+
+
+class PollReason(StrEnum):
+    """Why the refresh interval is what it is."""
+
+    FIXED = "fixed"
+    PUSH = "push"
+    CHANGE = "change"
+    TRANSITION = "transition"
+    OFFICE_HOURS = "office_hours"
+    OFF_HOURS = "off_hours"
+    NIGHT = "night"
+    WEEKEND = "weekend"
+
+
+# Factor applied to the configured interval for every reason.
+_FACTORS = {
+    PollReason.CHANGE: 0.25,
+    PollReason.TRANSITION: 0.5,
+    PollReason.OFFICE_HOURS: 1,
+    PollReason.OFF_HOURS: 2,
+    PollReason.NIGHT: 4,
+    PollReason.WEEKEND: 4,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class PollingPolicy:
+    """Refresh more often when changes are likely and less when they are not.
+
+    Calendars are mostly edited during office hours and right after an edit
+    more edits tend to follow. The hours before an entry starts or ends are
+    when a late change matters most. At night and in the weekend the
+    interval backs off. The result stays between the minimum and maximum
+    interval, or the configured interval if that is longer.
+    """
+
+    interval: int
+    adaptive: bool = True
+    push: bool = False
+
+    def reason(
+        self,
+        now: datetime,
+        last_change: datetime | None,
+        next_transition: datetime | None,
+    ) -> PollReason:
+        """Return which rule decides the interval, all times are naive local."""
+
+        if self.push:
+            return PollReason.PUSH
+        if not self.adaptive:
+            return PollReason.FIXED
+        if last_change is not None and now - last_change < timedelta(
+            seconds=CHANGE_BURST
+        ):
+            return PollReason.CHANGE
+        if next_transition is not None and next_transition - now < timedelta(
+            seconds=TRANSITION_LEAD
+        ):
+            return PollReason.TRANSITION
+        if now.weekday() >= 5:
+            return PollReason.WEEKEND
+        night_start, night_end = NIGHT_HOURS
+        if now.hour >= night_start or now.hour < night_end:
+            return PollReason.NIGHT
+        office_start, office_end = OFFICE_HOURS
+        if office_start <= now.hour < office_end:
+            return PollReason.OFFICE_HOURS
+        return PollReason.OFF_HOURS
+
+    def seconds(self, reason: PollReason) -> float:
+        """Return the refresh interval in seconds for a reason."""
+
+        if reason not in _FACTORS:
+            return self.interval
+        return min(
+            max(self.interval * _FACTORS[reason], MIN_SCAN_INTERVAL),
+            max(MAX_SCAN_INTERVAL, self.interval),
+        )
@@ -0,0 +1,95 @@
+"""Push updates of the calendar through a webhook.
+
+The calendar, or a relay in front of it, posts a json object to the webhook of
+a config entry when entries changed:
+
+    {"fullname": "Jane Doe", "entries": [...]}
+
+Without entries the users are only marked as changed and fetched right away,
+with entries in the format of the calendar api they are taken over without a
+request. The fullname can also be a list named fullnames, all users of the
+config entry are refreshed when both are left out.
+"""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+import logging
+
+from aiohttp import hdrs, web
+
+from homeassistant.components import webhook
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.json import json_loads
+
+from .const import DOMAIN
+from .coordinator import CalendarCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _bad_request(message: str) -> web.Response:
+    """Return a response that tells the sender what was wrong with its push."""
+    return web.Response(status=HTTPStatus.BAD_REQUEST, text=message)
+
+
+@callback
+def async_register_webhook(
+    hass: HomeAssistant, config_entry: ConfigEntry, coordinator: CalendarCoordinator
+) -> None:
+    """Register the webhook of a config entry, it is removed on unload."""
+
+    async def async_handle_webhook(
+        hass: HomeAssistant, webhook_id: str, request: web.Request
+    ) -> web.Response | None:
+        """Handle a push of the calendar."""
+
+        body = await request.text()
+        try:
+            payload = json_loads(body) if body else {}
+        except ValueError:
+            return _bad_request("Invalid json")
+        if not isinstance(payload, dict):
+            return _bad_request("Expected a json object")
+
+        if "fullname" in payload:
+            fullnames = [payload["fullname"]]
+        else:
+            fullnames = payload.get("fullnames") or coordinator.fullnames
+        if not isinstance(fullnames, list) or not all(
+            isinstance(fullname, str) for fullname in fullnames
+        ):
+            return _bad_request(
+                "Expected fullname to be a string or fullnames a list of strings"
+            )
+        if unknown := [
+            fullname for fullname in fullnames if fullname not in coordinator.calendars
+        ]:
+            return _bad_request(f"Unknown users: {unknown}")
+
+        if (rows := payload.get("entries")) is None:
+            _LOGGER.debug("Pushed as changed: %s", ", ".join(fullnames))
+            coordinator.async_push_changed(fullnames)
+            return None
+
+        if len(fullnames) != 1 or not isinstance(rows, list):
+            return _bad_request("Entries are pushed for one user at a time")
+        try:
+            coordinator.async_push_entries(fullnames[0], rows)
+        except (KeyError, ValueError, TypeError) as err:
+            return _bad_request(f"Invalid entries: {err!r}")
+        _LOGGER.debug("Pushed %d entries of %s", len(rows), fullnames[0])
+        return None
+
+    webhook_id = config_entry.options[CONF_WEBHOOK_ID]
+    webhook.async_register(
+        hass,
+        DOMAIN,
+        config_entry.title,
+        webhook_id,
+        async_handle_webhook,
+        allowed_methods=[hdrs.METH_POST],
+    )
+    config_entry.async_on_unload(lambda: webhook.async_unregister(hass, webhook_id))
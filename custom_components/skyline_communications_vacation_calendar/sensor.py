@@ -1,22 +1,29 @@
 """Interfaces with the Integration 101 Template api sensors."""
 
-from datetime import datetime
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, datetime
 import logging
+from typing import Any
 
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
+    SensorEntityDescription,
     SensorStateClass,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.device_registry import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers.typing import StateType
 
-from .CalendarApi import CalendarEntry, CalendarEntryType
-from .const import DOMAIN
+from .CalendarApi import CalendarEntryType, FetchStats
+from .const import CONF_FULLNAMES, DOMAIN
 from .coordinator import CalendarCoordinator
+from .entity import VacationCalendarEntity
+from .timeline import Timeline, UpcomingDays
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,13 +49,351 @@ async def async_setup_entry(
     #    if device.device_type == DeviceType.DOOR_SENSOR
     # ]
 
-    sensors = [DaySensor(coordinator, coordinator.entries)]
+    sensors: list[SensorEntity] = [
+        DaySensor(coordinator, fullname) for fullname in coordinator.fullnames
+    ]
+    sensors.extend(
+        UpcomingDaySensor(coordinator, fullname, description)
+        for fullname in coordinator.fullnames
+        for description in UPCOMING_SENSORS
+    )
+    sensors.extend(
+        CalendarDiagnosticSensor(coordinator, description)
+        for description in DIAGNOSTIC_SENSORS
+    )
+    # A hub is a team, count its users per category.
+    if CONF_FULLNAMES in config_entry.data:
+        sensors.extend(
+            TeamAvailabilitySensor(coordinator, category)
+            for category in TEAM_CATEGORIES
+        )
 
     # Create the binary sensors.
     async_add_entities(sensors)
 
 
-class DaySensor(CoordinatorEntity, SensorEntity):
+TEAM_CATEGORIES = (
+    CalendarEntryType.Absent,
+    CalendarEntryType.WfH,
+    CalendarEntryType.RT_Rotation,
+    CalendarEntryType.Support_Rotation,
+)
+
+
+def _milliseconds(seconds: float | None) -> float | None:
+    """Convert a duration in seconds to milliseconds."""
+    return None if seconds is None else seconds * 1000
+
+
+def _total(
+    coordinator: CalendarCoordinator, value: Callable[[FetchStats], int | float | None]
+) -> int | float | None:
+    """Sum a request statistic over the users, None if no user has a value yet."""
+
+    values = [
+        result
+        for stats in coordinator.fetch_stats().values()
+        if (result := value(stats)) is not None
+    ]
+    return sum(values) if values else None
+
+
+@dataclass(frozen=True, kw_only=True)
+class CalendarDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes a diagnostic sensor of a config entry."""
+
+    value_fn: Callable[[CalendarCoordinator], StateType | datetime]
+    attributes_fn: Callable[[CalendarCoordinator], dict[str, Any]] | None = None
+
+
+DIAGNOSTIC_SENSORS: tuple[CalendarDiagnosticSensorEntityDescription, ...] = (
+    CalendarDiagnosticSensorEntityDescription(
+        key="refresh_duration",
+        name="Refresh duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        value_fn=lambda coordinator: _milliseconds(coordinator.stats.last_duration),
+    ),
+    CalendarDiagnosticSensorEntityDescription(
+        key="entity_update_duration",
+        name="Entity update duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda coordinator: _milliseconds(
+            coordinator.stats.last_listener_duration
+        ),
+    ),
+    CalendarDiagnosticSensorEntityDescription(
+        key="setup_duration",
+        name="Setup duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        value_fn=lambda coordinator: _milliseconds(coordinator.stats.setup_duration),
+    ),
+    CalendarDiagnosticSensorEntityDescription(
+        key="fetch_latency",
+        name="Fetch latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=0,
+        # The users are fetched in parallel, the slowest one holds up the refresh.
+        value_fn=lambda coordinator: _milliseconds(
+            max(
+                (
+                    stats.latency
+                    for stats in coordinator.fetch_stats().values()
+                    if stats.latency is not None
+                ),
+                default=None,
+            )
+        ),
+    ),
+    CalendarDiagnosticSensorEntityDescription(
+        key="parse_duration",
+        name="Parse duration",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        suggested_display_precision=1,
+        value_fn=lambda coordinator: _milliseconds(
+            _total(
+                coordinator,
+                lambda stats: (
+                    None
+                    if stats.parse_duration is None
+                    else (stats.decode_duration or 0) + stats.parse_duration
+                ),
+            )
+        ),
+    ),
+    CalendarDiagnosticSensorEntityDescription(
+        key="payload_size",
+        name="Payload size",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: _total(
+            coordinator, lambda stats: stats.payload_bytes
+        ),
+    ),
+    CalendarDiagnosticSensorEntityDescription(
+        key="entry_count",
+        name="Entries",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator: sum(
+            len(calendar.entries) for calendar in coordinator.calendars.values()
+        ),
+    ),
+    CalendarDiagnosticSensorEntityDescription(
+        key="cache_hits",
+        name="Cache hits",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: _total(
+            coordinator, lambda stats: stats.cache_hits
+        ),
+    ),
+    CalendarDiagnosticSensorEntityDescription(
+        key="cache_misses",
+        name="Cache misses",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: _total(
+            coordinator, lambda stats: stats.cache_misses
+        ),
+    ),
+    CalendarDiagnosticSensorEntityDescription(
+        key="retries",
+        name="Retries",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator: _total(coordinator, lambda stats: stats.retries),
+    ),
+    CalendarDiagnosticSensorEntityDescription(
+        key="refresh_interval",
+        name="Refresh interval",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        suggested_display_precision=0,
+        value_fn=lambda coordinator: coordinator.update_interval.total_seconds(),
+        attributes_fn=lambda coordinator: {"reason": coordinator.poll_reason},
+    ),
+    CalendarDiagnosticSensorEntityDescription(
+        key="last_success",
+        name="Last successful refresh",
+        device_class=SensorDeviceClass.TIMESTAMP,
+        value_fn=lambda coordinator: coordinator.stats.last_success,
+    ),
+)
+
+
+class CalendarDiagnosticSensor(SensorEntity):
+    """Refresh statistic of a config entry, disabled by default.
+
+    These are updated after every refresh, also when the entries did not change
+    and the other entities are not notified.
+    """
+
+    entity_description: CalendarDiagnosticSensorEntityDescription
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_has_entity_name = True
+    _attr_should_poll = False
+
+    def __init__(
+        self,
+        coordinator: CalendarCoordinator,
+        description: CalendarDiagnosticSensorEntityDescription,
+    ) -> None:
+        """Initialise sensor."""
+        self.coordinator = coordinator
+        self.entity_description = description
+        self._attr_unique_id = f"{DOMAIN}-{coordinator.entry_id}-{description.key}"
+        self._attr_device_info = coordinator.device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to the refreshes of the coordinator."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_stats_listener(self.async_write_ha_state)
+        )
+
+    @property
+    def native_value(self) -> StateType | datetime:
+        """Return the state of the entity."""
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the extra state attributes."""
+        if self.entity_description.attributes_fn is None:
+            return None
+        return self.entity_description.attributes_fn(self.coordinator)
+
+
+@dataclass(frozen=True, kw_only=True)
+class UpcomingDaySensorEntityDescription(SensorEntityDescription):
+    """Describes a sensor with the next day of a kind of a user."""
+
+    value_fn: Callable[[UpcomingDays], date | int | None]
+
+
+UPCOMING_SENSORS: tuple[UpcomingDaySensorEntityDescription, ...] = (
+    UpcomingDaySensorEntityDescription(
+        key="next_day_off",
+        name="Next day off",
+        device_class=SensorDeviceClass.DATE,
+        value_fn=lambda upcoming: upcoming.next_day_off,
+    ),
+    UpcomingDaySensorEntityDescription(
+        key="days_until_absence",
+        name="Days until absence",
+        native_unit_of_measurement=UnitOfTime.DAYS,
+        value_fn=lambda upcoming: (
+            None
+            if upcoming.next_absence is None
+            else (upcoming.next_absence - upcoming.day).days
+        ),
+    ),
+    UpcomingDaySensorEntityDescription(
+        key="next_wfh",
+        name="Next WfH day",
+        device_class=SensorDeviceClass.DATE,
+        value_fn=lambda upcoming: upcoming.next_wfh,
+    ),
+    UpcomingDaySensorEntityDescription(
+        key="next_workday",
+        name="Next workday",
+        device_class=SensorDeviceClass.DATE,
+        value_fn=lambda upcoming: upcoming.next_workday,
+    ),
+)
+
+
+class UpcomingDaySensor(VacationCalendarEntity, SensorEntity):
+    """The next day of a kind of a user, from tomorrow on.
+
+    The days are looked up by the coordinator when the entries change and
+    when a day passes, the sensor only reads them.
+    """
+
+    entity_description: UpcomingDaySensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: CalendarCoordinator,
+        fullname: str,
+        description: UpcomingDaySensorEntityDescription,
+    ) -> None:
+        """Initialise sensor."""
+        super().__init__(coordinator)
+        self.fullname = fullname
+        self.entity_description = description
+        self._attr_name = f"{description.name} for {fullname}"
+        self._attr_unique_id = f"{DOMAIN}-{description.key}-{fullname}"
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, f"slc-vaction-calendar-{fullname}")}
+        )
+
+    @property
+    def native_value(self) -> date | int | None:
+        """Return the state of the entity."""
+        coordinator: CalendarCoordinator = self.coordinator
+        return self.entity_description.value_fn(
+            coordinator.calendars[self.fullname].upcoming
+        )
+
+
+class TeamAvailabilitySensor(VacationCalendarEntity, SensorEntity):
+    """Number of users of a hub with an entry of a category today.
+
+    The count comes from the team availability bitsets, the entries of the
+    users are not scanned.
+    """
+
+    _attr_has_entity_name = True
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self, coordinator: CalendarCoordinator, category: CalendarEntryType
+    ) -> None:
+        """Initialise sensor."""
+        super().__init__(coordinator)
+        self.category = category
+        self._attr_name = f"{category.name.replace('_', ' ')} today"
+        self._attr_unique_id = (
+            f"{DOMAIN}-{coordinator.entry_id}-team-{category.name.lower()}"
+        )
+        self._attr_device_info = coordinator.device_info
+        self.calculate_team()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Update sensor on new entries and at midnight."""
+        self.calculate_team()
+        self.async_write_ha_state_if_changed()
+
+    def calculate_team(self) -> None:
+        """Count the users with an entry of the category today."""
+
+        coordinator: CalendarCoordinator = self.coordinator
+        availability = coordinator.availability
+        users = availability.users_on(
+            date.today(),
+            self.category,
+            availability.mask(map(coordinator.user_key, coordinator.fullnames)),
+        )
+        self._attr_native_value = users.bit_count()
+        self._attr_extra_state_attributes = {
+            "users": [fullname for _, fullname in availability.users(users)]
+        }
+
+
+class DaySensor(VacationCalendarEntity, SensorEntity):
     """Implementation of a sensor."""
 
     options = [
@@ -59,49 +404,34 @@ class DaySensor(CoordinatorEntity, SensorEntity):
         CalendarEntryType.Weekend.name,
     ]
 
-    calendar_options = [
-        CalendarEntryType.Absent,
-        CalendarEntryType.WfH,
-        CalendarEntryType.Public_Holiday,
-        CalendarEntryType.Weekend,
-    ]
-
     _attr_native_unit_of_measurement = None
     _attr_device_class = SensorDeviceClass.ENUM
     _attr_state_class = SensorStateClass.MEASUREMENT
 
-    def __init__(
-        self, coordinator: CalendarCoordinator, entries: list[CalendarEntry]
-    ) -> None:
+    def __init__(self, coordinator: CalendarCoordinator, fullname: str) -> None:
         """Initialise sensor."""
         super().__init__(coordinator)
+        self.fullname = fullname
         self._attr_options = self.options
-        self.calculate_day_type(entries)
+        self.calculate_day_type(coordinator.calendars[fullname].timeline)
 
     @callback
     def _handle_coordinator_update(self) -> None:
         """Update sensor with latest data from coordinator."""
         # This method is called by your DataUpdateCoordinator when a successful update runs.
         coordinator: CalendarCoordinator = self.coordinator
-        _LOGGER.debug("User: %s", coordinator.fullname)
-        self.calculate_day_type(coordinator.entries)
-        self.async_write_ha_state()
+        _LOGGER.debug("User: %s", self.fullname)
+        self.calculate_day_type(coordinator.calendars[self.fullname].timeline)
+        self.async_write_ha_state_if_changed()
 
-    def calculate_day_type(self, entries: list[CalendarEntry]):
+    def calculate_day_type(self, timeline: Timeline):
         """Caculate the type of day based on the latest vacation entries."""
 
-        # This needs to enumerate to true or false
-        now = datetime.now()
+        # Overlapping entries are resolved by the priority of their category.
+        category = timeline.category_at(datetime.now())
 
-        matching_entries = [
-            entry
-            for entry in entries
-            if entry.event_date <= now <= entry.end_date
-            and entry.category in self.calendar_options
-        ]
-
-        if matching_entries:
-            self.day_type = matching_entries[0].category.name
+        if category is not None:
+            self.day_type = category.name
         else:
             self.day_type = "Workday"
 
@@ -118,14 +448,14 @@ class DaySensor(CoordinatorEntity, SensorEntity):
         # If your device is created elsewhere, you can just specify the indentifiers parameter.
         # If your device connects via another device, add via_device parameter with the indentifiers of that device.
         return DeviceInfo(
-            name=f"Workday Sensor {self.coordinator.fullname}",
+            name=f"Workday Sensor {self.fullname}",
             manufacturer="DhrMaes",
             model="Workday Sensor 1.0.1",
             sw_version="1.0.1",
             identifiers={
                 (
                     DOMAIN,
-                    f"slc-vaction-calendar-{self.coordinator.fullname}",
+                    f"slc-vaction-calendar-{self.fullname}",
                 )
             },
         )
@@ -133,7 +463,7 @@ class DaySensor(CoordinatorEntity, SensorEntity):
     @property
     def name(self) -> str:
         """Return the name of the sensor."""
-        return f"Workday sensor for {self.coordinator.fullname}"
+        return f"Workday sensor for {self.fullname}"
 
     @property
     def native_value(self) -> str:
@@ -158,7 +488,7 @@ class DaySensor(CoordinatorEntity, SensorEntity):
         """Return unique id."""
         # All entities must have a unique id.  Think carefully what you want this to be as
         # changing it later will cause HA to create new entities.
-        return f"{DOMAIN}-workday-{self.coordinator.fullname}"
+        return f"{DOMAIN}-workday-{self.fullname}"
 
     @property
     def extra_state_attributes(self):
@@ -175,4 +505,7 @@ class DaySensor(CoordinatorEntity, SensorEntity):
                 else CalendarEntryType[self.day_type].value
             )
 
+        # Set while the last good entries are served because a refresh failed.
+        attrs["stale_since"] = self.coordinator.calendars[self.fullname].stale_since
+
         return attrs
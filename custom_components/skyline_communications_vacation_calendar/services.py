@@ -0,0 +1,217 @@
+"""Services of the Skyline Communications Vacation Calendar integration."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+
+from .CalendarApi import CalendarEntry, CalendarEntryType
+from .const import CONF_FULLNAME, DOMAIN, MAX_DAY_INFO_DAYS
+from .coordinator import CalendarCoordinator
+from .shared import async_get_shared
+
+SERVICE_GET_AVAILABILITY = "get_availability"
+SERVICE_GET_DAY_INFO = "get_day_info"
+
+ATTR_DATE = "date"
+ATTR_CATEGORIES = "categories"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_END_DATE = "end_date"
+
+GET_AVAILABILITY_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DATE): cv.date,
+        vol.Optional(ATTR_CATEGORIES): vol.All(
+            cv.ensure_list, [vol.In([category.name for category in CalendarEntryType])]
+        ),
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+GET_DAY_INFO_SCHEMA = vol.Schema(
+    {
+        vol.Required(CONF_FULLNAME): cv.string,
+        vol.Optional(ATTR_DATE): cv.date,
+        vol.Optional(ATTR_END_DATE): cv.date,
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+    }
+)
+
+
+def _loaded_coordinator(hass: HomeAssistant, entry_id: str) -> CalendarCoordinator:
+    """Return the coordinator of a loaded config entry of the integration."""
+
+    entry = hass.config_entries.async_get_entry(entry_id)
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(f"Unknown config entry {entry_id}")
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(f"Config entry {entry.title} is not loaded")
+    return hass.data[DOMAIN][entry_id].coordinator
+
+
+def _loaded_coordinators(hass: HomeAssistant) -> list[CalendarCoordinator]:
+    """Return the coordinators of all loaded config entries of the integration."""
+
+    return [
+        hass.data[DOMAIN][entry.entry_id].coordinator
+        for entry in hass.config_entries.async_entries(DOMAIN)
+        if entry.state is ConfigEntryState.LOADED
+    ]
+
+
+def _user_coordinator(
+    hass: HomeAssistant, fullname: str, entry_id: str | None
+) -> CalendarCoordinator:
+    """Return the coordinator that fetches the entries of a user."""
+
+    if entry_id:
+        coordinator = _loaded_coordinator(hass, entry_id)
+        if fullname in coordinator.calendars:
+            return coordinator
+    else:
+        for coordinator in _loaded_coordinators(hass):
+            if fullname in coordinator.calendars:
+                return coordinator
+    raise ServiceValidationError(f"Unknown user {fullname}")
+
+
+def _entry_to_dict(entry: CalendarEntry) -> dict[str, Any]:
+    """Return an entry as a service response."""
+
+    return {
+        "id": entry.id,
+        "name": entry.name,
+        "category": entry.category.name,
+        "start": entry.event_date.isoformat(),
+        "end": entry.end_date.isoformat(),
+        "description": entry.description,
+    }
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services once, they are shared by all config entries."""
+
+    if hass.services.has_service(DOMAIN, SERVICE_GET_AVAILABILITY):
+        return
+
+    async def async_get_availability(call: ServiceCall) -> ServiceResponse:
+        """Return the users with an entry of each category on a day."""
+
+        availability = async_get_shared(hass).availability
+        day = call.data.get(ATTR_DATE) or date.today()
+        categories = [
+            CalendarEntryType[name]
+            for name in call.data.get(
+                ATTR_CATEGORIES, [category.name for category in CalendarEntryType]
+            )
+        ]
+
+        # All users of all config entries, or the users of one entry.
+        mask = -1
+        if entry_id := call.data.get(ATTR_CONFIG_ENTRY_ID):
+            coordinator = _loaded_coordinator(hass, entry_id)
+            coordinators = [coordinator]
+            mask = availability.mask(map(coordinator.user_key, coordinator.fullnames))
+        else:
+            coordinators = _loaded_coordinators(hass)
+        # Users that were never fetched have no entries, they are not counted
+        # but listed so a missing user is not taken for an available one.
+        not_loaded = sorted(
+            fullname
+            for coordinator in coordinators
+            for fullname, calendar in coordinator.calendars.items()
+            if not calendar.loaded
+        )
+
+        result: dict[str, dict[str, int | list[str]]] = {}
+        for category in categories:
+            users = availability.users_on(day, category, mask)
+            result[category.name] = {
+                "count": users.bit_count(),
+                "users": sorted(fullname for _, fullname in availability.users(users)),
+            }
+
+        return {
+            "date": day.isoformat(),
+            "categories": result,
+            "not_loaded": not_loaded,
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_AVAILABILITY,
+        async_get_availability,
+        schema=GET_AVAILABILITY_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+    async def async_get_day_info(call: ServiceCall) -> ServiceResponse:
+        """Return the type of day and the entries of a user for a range of days."""
+
+        fullname = call.data[CONF_FULLNAME]
+        coordinator = _user_coordinator(
+            hass, fullname, call.data.get(ATTR_CONFIG_ENTRY_ID)
+        )
+        if not coordinator.calendars[fullname].loaded:
+            raise HomeAssistantError(
+                f"The entries of {fullname} could not be fetched yet"
+            )
+        start = call.data.get(ATTR_DATE) or date.today()
+        end = call.data.get(ATTR_END_DATE) or start
+        if end < start:
+            raise ServiceValidationError("The end date is before the date")
+        if (end - start).days >= MAX_DAY_INFO_DAYS:
+            raise ServiceValidationError(
+                f"At most {MAX_DAY_INFO_DAYS} days can be requested at once"
+            )
+        # Entries outside of the window are dropped, those days are unknown.
+        window = coordinator.entry_window()
+        if start < window.start.date() or end >= window.end.date():
+            raise ServiceValidationError(
+                f"Only the days from {window.start.date()} up to "
+                f"{window.end.date() - timedelta(days=1)} are kept"
+            )
+
+        days = []
+        for offset in range((end - start).days + 1):
+            info = coordinator.day_info(fullname, start + timedelta(days=offset))
+            days.append(
+                {
+                    "date": info.day.isoformat(),
+                    "day_type": info.category.name if info.category else "Workday",
+                    "is_workday": info.is_workday,
+                    "entries": [_entry_to_dict(entry) for entry in info.entries],
+                }
+            )
+
+        return {"full_name": fullname, "days": days}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_DAY_INFO,
+        async_get_day_info,
+        schema=GET_DAY_INFO_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the services of the integration."""
+
+    for service in hass.services.async_services_for_domain(DOMAIN):
+        hass.services.async_remove(DOMAIN, service)
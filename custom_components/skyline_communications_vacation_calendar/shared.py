@@ -0,0 +1,291 @@
+"""State shared by all config entries of the integration."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from datetime import datetime
+import logging
+import random
+from time import monotonic
+from typing import Any, TypeVar
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later
+
+from .availability import TeamAvailability
+from .CalendarApi import (
+    CalendarCircuitOpenException,
+    CalendarConnectionException,
+    CalendarException,
+    CalendarHelper,
+    EntryWindow,
+)
+from .const import (
+    BREAKER_RESET_TIMEOUT,
+    BREAKER_RESET_TIMEOUT_MAX,
+    BREAKER_THRESHOLD,
+    DATA_SHARED,
+    DOMAIN,
+    PREFETCH_TTL,
+    RATE_LIMIT_BURST,
+    RATE_LIMIT_PER_SECOND,
+    RETRY_ATTEMPTS,
+    RETRY_BACKOFF,
+    RETRY_BACKOFF_MAX,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+
+class TokenBucket:
+    """Token bucket rate limiter, callers wait until a token is available."""
+
+    def __init__(self, rate: float, capacity: int) -> None:
+        """Initialize a full bucket that refills rate tokens per second."""
+
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = monotonic()
+        self._lock = asyncio.Lock()
+
+    async def async_acquire(self) -> None:
+        """Take a token, waiting for the bucket to refill if it is empty."""
+
+        # The lock hands out the tokens in the order they were asked for.
+        async with self._lock:
+            while True:
+                now = monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+def backoff_delay(attempt: int) -> float:
+    """Return the seconds to wait before a retry, exponential with full jitter."""
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF * 2**attempt))
+
+
+class CircuitBreaker:
+    """Stops sending requests to an endpoint that keeps failing.
+
+    After threshold consecutive failures the circuit opens and requests fail
+    right away. Once the reset timeout passed a single trial request is let
+    through: the circuit closes when it succeeds and opens again for twice as
+    long when it fails.
+    """
+
+    def __init__(
+        self, threshold: int, reset_timeout: float, max_reset_timeout: float
+    ) -> None:
+        """Initialize a closed circuit."""
+
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.max_reset_timeout = max_reset_timeout
+        self.failures = 0
+        self._timeout = reset_timeout
+        self._opened_at: float | None = None
+        self._trial = False
+
+    @property
+    def state(self) -> str:
+        """Return closed, open or half_open."""
+
+        if self._opened_at is None:
+            return "closed"
+        if self._trial or monotonic() - self._opened_at >= self._timeout:
+            return "half_open"
+        return "open"
+
+    def before_request(self) -> None:
+        """Raise if the circuit is open, or let the trial request through."""
+
+        if self._opened_at is None:
+            return
+        if self._trial or monotonic() - self._opened_at < self._timeout:
+            raise CalendarCircuitOpenException(
+                f"Calendar api failed {self.failures} times in a row, "
+                f"requests are held back for {self._timeout:.0f} seconds"
+            )
+        self._trial = True
+
+    def record_success(self) -> None:
+        """Close the circuit, the endpoint answered."""
+
+        self.failures = 0
+        self._timeout = self.reset_timeout
+        self._opened_at = None
+        self._trial = False
+
+    def record_failure(self) -> None:
+        """Count a failure, opening the circuit when there are too many."""
+
+        self.failures += 1
+        if self._trial:
+            self._trial = False
+            self._timeout = min(self._timeout * 2, self.max_reset_timeout)
+            self._opened_at = monotonic()
+        elif self._opened_at is None and self.failures >= self.threshold:
+            _LOGGER.warning(
+                "Calendar api failed %s times in a row, holding back requests "
+                "for %s seconds",
+                self.failures,
+                self._timeout,
+            )
+            self._opened_at = monotonic()
+
+    def release_trial(self) -> None:
+        """Let another request through when the trial request did not finish."""
+
+        self._trial = False
+
+
+class SharedData:
+    """Api clients, request coalescing and rate limiting for the whole domain.
+
+    After a restart or reload all config entries hit the api at the same
+    moment. All requests pass one limiter, and entries with the same api key
+    share the ping that is in flight. A user is in one config entry only, so
+    the requests for entries are never identical. Failed requests are retried
+    with backoff, and one circuit breaker stops all entries from hammering the
+    api while it is down.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+
+        self.hass = hass
+        self.limiter = TokenBucket(RATE_LIMIT_PER_SECOND, RATE_LIMIT_BURST)
+        self.availability = TeamAvailability()
+        self.breaker = CircuitBreaker(
+            BREAKER_THRESHOLD, BREAKER_RESET_TIMEOUT, BREAKER_RESET_TIMEOUT_MAX
+        )
+        self._apis: dict[str, CalendarHelper] = {}
+        self._inflight: dict[Hashable, asyncio.Task[Any]] = {}
+        self._prefetched: dict[Hashable, tuple[Any, CALLBACK_TYPE]] = {}
+
+    @callback
+    def async_get_api(self, api_key: str) -> CalendarHelper:
+        """Return the api client of an api key, shared by all its config entries."""
+
+        if (api := self._apis.get(api_key)) is None:
+            api = self._apis[api_key] = CalendarHelper(
+                api_key, async_get_clientsession(self.hass)
+            )
+        return api
+
+    @callback
+    def async_stash(self, key: Hashable, result: Any) -> None:
+        """Keep a result fetched by the config flow for the first refresh.
+
+        A flow that is abandoned never sets up its entry, the result is
+        dropped once it is too old to be used.
+        """
+
+        @callback
+        def _async_expire(_now: datetime) -> None:
+            self._prefetched.pop(key, None)
+
+        self._async_drop_stashed(key)
+        self._prefetched[key] = (
+            result,
+            async_call_later(self.hass, PREFETCH_TTL, _async_expire),
+        )
+
+    @callback
+    def async_pop_stashed(self, key: Hashable) -> Any | None:
+        """Return a stashed result once, if it is recent enough."""
+
+        if (stashed := self._async_drop_stashed(key)) is not None:
+            return stashed[0]
+        return None
+
+    @callback
+    def _async_drop_stashed(self, key: Hashable) -> tuple[Any, CALLBACK_TYPE] | None:
+        """Remove a stashed result and cancel its expiry."""
+
+        if (stashed := self._prefetched.pop(key, None)) is not None:
+            stashed[1]()
+        return stashed
+
+    async def async_shared_request(
+        self, key: Hashable, request: Callable[[], Awaitable[_T]]
+    ) -> _T:
+        """Run a request, or join the identical request that is already in flight."""
+
+        if (task := self._inflight.get(key)) is None:
+            task = self.hass.async_create_background_task(
+                self.async_request(request), f"{DOMAIN} api request"
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # A caller that gets cancelled must not cancel the request of the others.
+        return await asyncio.shield(task)
+
+    async def async_request(
+        self,
+        request: Callable[[], Awaitable[_T]],
+        on_retry: Callable[[], None] | None = None,
+    ) -> _T:
+        """Run a request once the limiter allows it, retrying temporary failures."""
+
+        attempt = 0
+        while True:
+            self.breaker.before_request()
+            try:
+                await self.limiter.async_acquire()
+                result = await request()
+            except CalendarConnectionException as err:
+                self.breaker.record_failure()
+                attempt += 1
+                if attempt >= RETRY_ATTEMPTS or self.breaker.state != "closed":
+                    raise
+                delay = backoff_delay(attempt - 1)
+                _LOGGER.debug("Retrying in %.1f seconds: %s", delay, err)
+                if on_retry is not None:
+                    on_retry()
+                await asyncio.sleep(delay)
+            except CalendarException:
+                # The api answered, the request itself was wrong.
+                self.breaker.record_success()
+                raise
+            except BaseException:
+                # Cancelled or an unexpected error, says nothing about the api.
+                self.breaker.release_trial()
+                raise
+            else:
+                self.breaker.record_success()
+                return result
+
+
+def entries_stash_key(
+    api_key: str, element_id: str, fullname: str, window: EntryWindow | None = None
+) -> tuple[str, str, str, str, EntryWindow | None]:
+    """Return the key the entries of a user are stashed under."""
+    return ("entries", api_key, element_id, fullname, window)
+
+
+def ping_request_key(api_key: str) -> tuple[str, str]:
+    """Return the key that identifies a ping with an api key."""
+    return ("ping", api_key)
+
+
+@callback
+def async_get_shared(hass: HomeAssistant) -> SharedData:
+    """Return the shared data of the domain, creating it on first use."""
+
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    if (shared := domain_data.get(DATA_SHARED)) is None:
+        shared = domain_data[DATA_SHARED] = SharedData(hass)
+    return shared
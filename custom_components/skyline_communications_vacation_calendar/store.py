@@ -0,0 +1,108 @@
+"""Persistent cache of the last fetched calendar entries of a config entry."""
+
+from __future__ import annotations
+
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .CalendarApi import (
+    CATEGORIES_BY_VALUE,
+    EntryRow,
+    EntryStore,
+    from_epoch,
+    parse_epoch,
+)
+from .const import CACHE_SAVE_DELAY, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 2
+
+# An entry is cached as one row, see _row_to_cached for the column order.
+CachedRow = list[str | int]
+# The cached rows of every user of the config entry, by full name.
+CachedData = dict[str, list[CachedRow]]
+
+
+class _EntryStore(Store[CachedData]):
+    """Store that drops caches written by older versions."""
+
+    async def _async_migrate_func(
+        self, old_major_version: int, old_minor_version: int, old_data: list
+    ) -> CachedData:
+        """Version 1 held the rows of a single user without the full name."""
+        return {}
+
+
+class EntryCache:
+    """Keeps the last good entries on disk so setup does not wait on the api."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize."""
+
+        self._store = _EntryStore(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+    async def async_load(self) -> dict[str, EntryStore] | None:
+        """Load the cached entries by user, returns None when there is no usable cache."""
+
+        data = await self._store.async_load()
+        if not data:
+            return None
+
+        try:
+            return {
+                fullname: EntryStore(map(_cached_to_row, rows))
+                for fullname, rows in data.items()
+            }
+        except (ValueError, TypeError, IndexError, KeyError) as err:
+            _LOGGER.warning("Ignoring invalid calendar cache: %s", err)
+            return None
+
+    @callback
+    def async_save(self, entries: dict[str, EntryStore]) -> None:
+        """Schedule writing the entries of every user to disk."""
+
+        self._store.async_delay_save(
+            lambda: {
+                fullname: [_row_to_cached(row) for row in user_entries.rows()]
+                for fullname, user_entries in entries.items()
+            },
+            CACHE_SAVE_DELAY,
+        )
+
+    async def async_remove(self) -> None:
+        """Remove the cache from disk."""
+
+        await self._store.async_remove()
+
+
+def _row_to_cached(row: EntryRow) -> CachedRow:
+    """Serialize a row of the entry store into a compact row."""
+
+    return [
+        row[0],
+        row[1],
+        row[2],
+        from_epoch(row[3]).isoformat(),
+        from_epoch(row[4]).isoformat(),
+        row[5],
+        from_epoch(row[6]).isoformat(),
+        from_epoch(row[7]).isoformat(),
+    ]
+
+
+def _cached_to_row(row: CachedRow) -> EntryRow:
+    """Deserialize a compact row into a row of the entry store."""
+
+    return (
+        row[0],
+        row[1],
+        CATEGORIES_BY_VALUE[row[2]].value,
+        parse_epoch(row[3]),
+        parse_epoch(row[4]),
+        row[5],
+        parse_epoch(row[6]),
+        parse_epoch(row[7]),
+    )
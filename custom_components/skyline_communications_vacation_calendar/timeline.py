@@ -0,0 +1,210 @@
+"""Per day timeline of the effective category of a user."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta
+
+from .CalendarApi import (
+    CATEGORIES_BY_VALUE,
+    EPOCH_ORDINAL,
+    SECONDS_PER_DAY,
+    CalendarEntry,
+    CalendarEntryType,
+)
+from .entry_index import EntryIndex
+
+# When entries overlap the category that comes first wins, categories that are
+# not listed do not change the type of the day.
+CATEGORY_PRIORITY = (
+    CalendarEntryType.Public_Holiday,
+    CalendarEntryType.Weekend,
+    CalendarEntryType.Absent,
+    CalendarEntryType.WfH,
+)
+
+# Categories that make a day a day off, the others are workdays.
+DAY_OFF_CATEGORIES = (
+    CalendarEntryType.Absent,
+    CalendarEntryType.Public_Holiday,
+    CalendarEntryType.Weekend,
+)
+
+# Rank of every category in a day slot, higher wins and 0 means no entry.
+_RANKS = {
+    category: len(CATEGORY_PRIORITY) - position
+    for position, category in enumerate(CATEGORY_PRIORITY)
+}
+
+_RANKS_BY_VALUE = {category.value: rank for category, rank in _RANKS.items()}
+
+# Slot values next to the category values of the day.
+_NO_ENTRY = 0xFF
+_PARTIAL = 0xFE
+
+# Entry dates have second resolution, an entry ending on this second of the
+# day covers the rest of the day.
+_END_OF_DAY = SECONDS_PER_DAY - 1
+
+
+def resolve_category(entries: Iterable[CalendarEntry]) -> CalendarEntryType | None:
+    """Return the category with the highest priority of the given entries."""
+
+    best: CalendarEntryType | None = None
+    best_rank = 0
+    for entry in entries:
+        rank = _RANKS.get(entry.category, 0)
+        if rank > best_rank:
+            best, best_rank = entry.category, rank
+    return best
+
+
+@dataclass(frozen=True, slots=True)
+class DayInfo:
+    """The effective category of a user on a day and the entries on that day.
+
+    Day infos are memoized and shared between callers, so they are immutable.
+    """
+
+    day: date
+    category: CalendarEntryType | None
+    entries: tuple[CalendarEntry, ...]
+
+    @property
+    def is_workday(self) -> bool:
+        """Return if the day is not a day off."""
+        return self.category not in DAY_OFF_CATEGORIES
+
+
+def day_info(index: EntryIndex, day: date) -> DayInfo:
+    """Return the entries of a day and the category with the highest priority.
+
+    Any entry on the day counts, also when it only covers part of the day.
+    """
+
+    start = datetime.combine(day, time.min)
+    entries = tuple(index.overlapping(start, datetime.combine(day, time.max)))
+    return DayInfo(day, resolve_category(entries), entries)
+
+
+@dataclass(frozen=True, slots=True)
+class UpcomingDays:
+    """The next day off, absence, day working from home and workday of a user.
+
+    Computed on the day in the field day, the next days start the day after.
+    None when there is no such day within the horizon.
+    """
+
+    day: date
+    next_day_off: date | None = None
+    next_absence: date | None = None
+    next_wfh: date | None = None
+    next_workday: date | None = None
+
+
+def upcoming_days(index: EntryIndex, today: date, horizon: int) -> UpcomingDays:
+    """Find the next days of every kind, scanning at most horizon days ahead."""
+
+    found: dict[str, date] = {}
+    for offset in range(1, horizon + 1):
+        info = day_info(index, today + timedelta(days=offset))
+        if info.is_workday:
+            found.setdefault("next_workday", info.day)
+        else:
+            found.setdefault("next_day_off", info.day)
+        if info.category is CalendarEntryType.Absent:
+            found.setdefault("next_absence", info.day)
+        elif info.category is CalendarEntryType.WfH:
+            found.setdefault("next_wfh", info.day)
+        if len(found) == 4:
+            break
+    return UpcomingDays(today, **found)
+
+
+class Timeline:
+    """Effective category of every day in a horizon, resolved once per fetch.
+
+    Every day is one byte: the value of the category with the highest priority
+    that covers the whole day, or a marker when there is no entry. Days where
+    an entry of a higher priority only covers part of the day are marked as
+    partial, those and the moments outside of the horizon are resolved with
+    the entry index instead.
+    """
+
+    def __init__(
+        self,
+        index: EntryIndex,
+        horizon: int,
+        start: date | None = None,
+    ) -> None:
+        """Initialize the timeline of horizon days from start, today by default."""
+
+        self.index = index
+        self.start = start or date.today()
+        self._start_ordinal = self.start.toordinal()
+        self._days = self._build(horizon)
+
+    def _build(self, horizon: int) -> bytearray:
+        """Resolve the entries of the index into one slot per day."""
+
+        full_ranks = bytearray(horizon)
+        partial_ranks = bytearray(horizon)
+        # Days since the epoch of the first day, the columns count seconds.
+        start_day = self._start_ordinal - EPOCH_ORDINAL
+        store = self.index.store
+
+        for value, start, end in zip(
+            store.categories, store.starts, store.ends, strict=True
+        ):
+            if not (rank := _RANKS_BY_VALUE.get(value, 0)):
+                continue
+
+            first = start // SECONDS_PER_DAY - start_day
+            last = end // SECONDS_PER_DAY - start_day
+            if last < 0 or first >= horizon:
+                continue
+
+            first_full, last_full = first, last
+            if start % SECONDS_PER_DAY:
+                first_full += 1
+                if 0 <= first < horizon and rank > partial_ranks[first]:
+                    partial_ranks[first] = rank
+            if end % SECONDS_PER_DAY < _END_OF_DAY:
+                last_full -= 1
+                if 0 <= last < horizon and rank > partial_ranks[last]:
+                    partial_ranks[last] = rank
+
+            for day in range(max(first_full, 0), min(last_full + 1, horizon)):
+                if rank > full_ranks[day]:
+                    full_ranks[day] = rank
+
+        by_rank = [_NO_ENTRY] + [
+            category.value for category in reversed(CATEGORY_PRIORITY)
+        ]
+        return bytearray(
+            _PARTIAL if partial_rank > full_rank else by_rank[full_rank]
+            for full_rank, partial_rank in zip(full_ranks, partial_ranks)
+        )
+
+    def __len__(self) -> int:
+        """Return the number of days in the horizon."""
+        return len(self._days)
+
+    @property
+    def end(self) -> date:
+        """Return the first day after the horizon."""
+        return self.start + timedelta(days=len(self._days))
+
+    def category_at(self, moment: datetime) -> CalendarEntryType | None:
+        """Return the effective category on the given moment, None on a workday."""
+
+        day = moment.toordinal() - self._start_ordinal
+        if 0 <= day < len(self._days):
+            slot = self._days[day]
+            if slot == _NO_ENTRY:
+                return None
+            if slot != _PARTIAL:
+                return CATEGORIES_BY_VALUE[slot]
+
+        return resolve_category(self.index.at(moment))
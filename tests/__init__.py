@@ -0,0 +1,103 @@
+"""Tests for the Skyline Communications Vacation Calendar integration."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from mock_calendar_api import API_KEY, ELEMENT_ID, TIMESTAMP_FORMAT
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.skyline_communications_vacation_calendar.CalendarApi import (
+    CalendarEntry,
+    CalendarEntryType,
+)
+from custom_components.skyline_communications_vacation_calendar.const import (
+    CONF_ELEMENT_ID,
+    CONF_FULLNAME,
+    CONF_FULLNAMES,
+    DOMAIN,
+)
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant
+
+
+def make_entry(
+    entry_id: str,
+    start: datetime,
+    end: datetime,
+    category: CalendarEntryType = CalendarEntryType.Absent,
+) -> CalendarEntry:
+    """Return an entry of a category from start to end."""
+    return CalendarEntry(entry_id, category.name, category, start, end, "", start, end)
+
+
+def make_row(
+    entry_id: str,
+    start: datetime,
+    end: datetime,
+    category: CalendarEntryType = CalendarEntryType.Absent,
+) -> dict[str, Any]:
+    """Return an entry in the format of the calendar api."""
+
+    return {
+        "ID": entry_id,
+        "Name": category.name.replace("_", " "),
+        "Category": category.value,
+        "EventDate": start.strftime(TIMESTAMP_FORMAT),
+        "EndDate": end.strftime(TIMESTAMP_FORMAT),
+        "Description": "",
+        "OriginalEventDate": start.strftime(TIMESTAMP_FORMAT),
+        "OriginalEndDate": end.strftime(TIMESTAMP_FORMAT),
+    }
+
+
+def day_row(
+    entry_id: str,
+    category: CalendarEntryType = CalendarEntryType.Absent,
+    offset: int = 0,
+    days: int = 1,
+) -> dict[str, Any]:
+    """Return an entry covering whole days, starting offset days from today."""
+
+    first = date.today() + timedelta(days=offset)
+    return make_row(
+        entry_id,
+        datetime.combine(first, time.min),
+        datetime.combine(first + timedelta(days=days - 1), time(23, 59, 59)),
+        category,
+    )
+
+
+def mock_config_entry(
+    fullnames: list[str], options: dict[str, Any] | None = None
+) -> MockConfigEntry:
+    """Return a config entry for one user, or a hub when there are more."""
+
+    data: dict[str, Any] = {CONF_API_KEY: API_KEY, CONF_ELEMENT_ID: ELEMENT_ID}
+    if len(fullnames) == 1:
+        data[CONF_FULLNAME] = fullnames[0]
+        title = f"SLC Vacation Calendar - {fullnames[0]}"
+    else:
+        data[CONF_FULLNAMES] = fullnames
+        title = f"SLC Vacation Calendar - {ELEMENT_ID}"
+    return MockConfigEntry(
+        domain=DOMAIN, title=title, unique_id=title, data=data, options=options or {}
+    )
+
+
+async def setup_integration(
+    hass: HomeAssistant, fullnames: list[str], options: dict[str, Any] | None = None
+) -> MockConfigEntry:
+    """Set up a config entry for the users and wait until it is done."""
+
+    config_entry = mock_config_entry(fullnames, options)
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    return config_entry
+
+
+def coordinator_of(hass: HomeAssistant, config_entry: MockConfigEntry):
+    """Return the coordinator of a config entry that is set up."""
+    return hass.data[DOMAIN][config_entry.entry_id].coordinator
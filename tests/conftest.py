@@ -0,0 +1,109 @@
+"""Fixtures for the Skyline Communications Vacation Calendar tests."""
+
+from __future__ import annotations
+
+from collections.abc import AsyncGenerator
+from contextlib import suppress
+
+from aiohttp import ClientSession, web
+from aiohttp.test_utils import make_mocked_request
+from mock_calendar_api import MockCalendarApi, synthetic_calendar
+import pytest
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+    AiohttpClientMockResponse,
+)
+
+from custom_components.skyline_communications_vacation_calendar import CalendarApi
+from custom_components.skyline_communications_vacation_calendar.CalendarApi import (
+    CALENDAR_PATH,
+    PING_PATH,
+)
+from custom_components.skyline_communications_vacation_calendar.const import (
+    DOMAIN_METRICS_URL,
+)
+
+FULLNAME = "Jane Doe"
+
+
+@pytest.fixture(autouse=True, scope="session")
+def aiodns_thread() -> None:
+    """Start the shutdown thread of pycares before the first test.
+
+    Recent versions of pycares start one thread for all resolvers the first
+    time aiohttp creates one, the thread check of Home Assistant would blame
+    whichever test happened to run first.
+    """
+
+    with suppress(ImportError):
+        import pycares  # noqa: PLC0415
+
+        pycares.Channel()
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    """Enable the custom integration in every test."""
+    return
+
+
+@pytest.fixture
+def calendars() -> dict[str, list[dict]]:
+    """Return the calendars served by the mock api."""
+    return {FULLNAME: synthetic_calendar(50)}
+
+
+@pytest.fixture
+async def mock_api(
+    socket_enabled, aiohttp_server, monkeypatch, calendars
+) -> MockCalendarApi:
+    """Serve the calendars on a local mock api and point the integration to it."""
+
+    api = MockCalendarApi(calendars)
+    server = await aiohttp_server(api.build_app())
+    monkeypatch.setattr(
+        CalendarApi, "DOMAIN_METRICS_URL", str(server.make_url("")).rstrip("/")
+    )
+    return api
+
+
+@pytest.fixture
+def calendar_api(
+    aioclient_mock: AiohttpClientMocker, calendars: dict[str, list[dict]]
+) -> MockCalendarApi:
+    """Answer the requests of Home Assistant with the mock api, without a server."""
+
+    api = MockCalendarApi(calendars)
+
+    def forward(handler):
+        async def side_effect(method, url, data):
+            # The mocker records the request with its headers right before.
+            headers = aioclient_mock.mock_calls[-1][3]
+            response: web.Response = await handler(
+                make_mocked_request(method, url.path_qs, headers=headers)
+            )
+            return AiohttpClientMockResponse(
+                method,
+                url,
+                status=response.status,
+                response=response.body,
+                headers=response.headers,
+            )
+
+        return side_effect
+
+    aioclient_mock.get(
+        DOMAIN_METRICS_URL + PING_PATH, side_effect=forward(api.handle_ping)
+    )
+    aioclient_mock.get(
+        DOMAIN_METRICS_URL + CALENDAR_PATH, side_effect=forward(api.handle_calendar)
+    )
+    return api
+
+
+@pytest.fixture
+async def session() -> AsyncGenerator[ClientSession]:
+    """Return a plain aiohttp session for the calendar helper."""
+
+    async with ClientSession() as session:
+        yield session
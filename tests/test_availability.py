@@ -0,0 +1,93 @@
+"""Test the per day availability of the users of a team."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+
+from custom_components.skyline_communications_vacation_calendar.availability import (
+    TeamAvailability,
+)
+from custom_components.skyline_communications_vacation_calendar.CalendarApi import (
+    CalendarEntryType,
+    EntryStore,
+)
+
+from . import make_entry
+
+DAY = date(2026, 1, 5)
+
+
+def entries(
+    first: int, last: int, category: CalendarEntryType = CalendarEntryType.Absent
+) -> EntryStore:
+    """Return one entry of a category from the first to the last day after DAY."""
+
+    return EntryStore.from_entries(
+        [
+            make_entry(
+                "1",
+                datetime.combine(DAY + timedelta(days=first), time(9)),
+                datetime.combine(DAY + timedelta(days=last), time(17)),
+                category,
+            )
+        ]
+    )
+
+
+def test_count() -> None:
+    """Test counting the users of a category on a day."""
+
+    availability = TeamAvailability()
+    for user in ("Jane", "John", "Joe"):
+        availability.acquire(user)
+    availability.set_entries("Jane", entries(0, 2))
+    availability.set_entries("John", entries(1, 1))
+    availability.set_entries("Joe", entries(0, 0, CalendarEntryType.WfH))
+
+    absent = CalendarEntryType.Absent
+    assert availability.count(DAY, absent) == 1
+    assert availability.count(DAY + timedelta(days=1), absent) == 2
+    assert availability.count(DAY + timedelta(days=3), absent) == 0
+    assert availability.count(DAY, CalendarEntryType.WfH) == 1
+
+    mask = availability.mask(["John", "Joe", "Unknown"])
+    assert availability.count(DAY + timedelta(days=1), absent, mask) == 1
+    assert availability.users(
+        availability.users_on(DAY + timedelta(days=1), absent)
+    ) == ["Jane", "John"]
+
+
+def test_set_entries_replaces() -> None:
+    """Test new entries replace the days of the previous entries."""
+
+    availability = TeamAvailability()
+    availability.acquire("Jane")
+    availability.set_entries("Jane", entries(0, 2))
+    availability.set_entries("Jane", entries(2, 3, CalendarEntryType.WfH))
+
+    assert availability.count(DAY, CalendarEntryType.Absent) == 0
+    assert availability.count(DAY + timedelta(days=2), CalendarEntryType.Absent) == 0
+    assert availability.count(DAY + timedelta(days=3), CalendarEntryType.WfH) == 1
+
+
+def test_release() -> None:
+    """Test a user is tracked until it was released as often as it was acquired."""
+
+    availability = TeamAvailability()
+    availability.acquire("Jane")
+    availability.acquire("Jane")
+    availability.set_entries("Jane", entries(0, 0))
+
+    availability.release("Jane")
+    assert availability.count(DAY, CalendarEntryType.Absent) == 1
+
+    availability.release("Jane")
+    assert availability.count(DAY, CalendarEntryType.Absent) == 0
+    assert availability.mask(["Jane"]) == 0
+
+    # The bit of the released user is reused.
+    availability.acquire("John")
+    availability.set_entries("John", entries(0, 0))
+    assert availability.users(availability.users_on(DAY, CalendarEntryType.Absent)) == [
+        "John"
+    ]
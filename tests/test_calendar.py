@@ -0,0 +1,69 @@
+"""Test the calendar entity of a user."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+
+from mock_calendar_api import MockCalendarApi
+
+from custom_components.skyline_communications_vacation_calendar.CalendarApi import (
+    CalendarEntryType,
+)
+from homeassistant.const import STATE_ON
+from homeassistant.core import HomeAssistant
+
+from . import day_row, make_row, setup_integration
+
+CALENDAR = "calendar.vacation_calendar_for_jane_doe"
+
+
+async def test_calendar(hass: HomeAssistant, calendar_api: MockCalendarApi) -> None:
+    """Test the current event and the events in a range."""
+
+    today = date.today()
+    tomorrow_morning = datetime.combine(today + timedelta(days=1), time(10))
+    calendar_api.set_calendar(
+        "Jane Doe",
+        [
+            day_row("1"),
+            make_row(
+                "2",
+                tomorrow_morning,
+                tomorrow_morning + timedelta(hours=2),
+                CalendarEntryType.RT_Rotation,
+            ),
+            day_row("3", CalendarEntryType.WfH, offset=2, days=2),
+            day_row("4", offset=20),
+        ],
+    )
+    await setup_integration(hass, ["Jane Doe"])
+
+    state = hass.states.get(CALENDAR)
+    assert state.state == STATE_ON
+    assert state.attributes["message"] == "Absent"
+    assert state.attributes["all_day"]
+
+    # Entry dates are naive times of the system, like the start of the range.
+    start = datetime.combine(today, time.min).astimezone()
+    response = await hass.services.async_call(
+        "calendar",
+        "get_events",
+        {
+            "entity_id": CALENDAR,
+            "start_date_time": start,
+            "end_date_time": start + timedelta(days=7),
+        },
+        blocking=True,
+        return_response=True,
+    )
+
+    events = response[CALENDAR]["events"]
+    assert [event["summary"] for event in events] == ["Absent", "RT Rotation", "WfH"]
+    assert events[0]["start"] == today.isoformat()
+    assert events[0]["end"] == (today + timedelta(days=1)).isoformat()
+    assert datetime.fromisoformat(events[1]["start"]) == tomorrow_morning.astimezone()
+    assert (
+        datetime.fromisoformat(events[1]["end"])
+        == (tomorrow_morning + timedelta(hours=2, seconds=1)).astimezone()
+    )
+    assert events[2]["end"] == (today + timedelta(days=4)).isoformat()
@@ -0,0 +1,144 @@
+"""Test the calendar api client against the mock api."""
+
+from __future__ import annotations
+
+from aiohttp import ClientSession
+from mock_calendar_api import API_KEY, ELEMENT_ID, MockCalendarApi
+import pytest
+
+from custom_components.skyline_communications_vacation_calendar.CalendarApi import (
+    CalendarAuthException,
+    CalendarConnectionException,
+    CalendarException,
+    CalendarHelper,
+)
+from homeassistant.core import HomeAssistant
+
+from .conftest import FULLNAME
+
+
+async def test_entries(
+    hass: HomeAssistant, mock_api: MockCalendarApi, session: ClientSession
+) -> None:
+    """Test the entries are parsed from a 200 response."""
+
+    helper = CalendarHelper(API_KEY, session)
+    entries = await helper.get_entries_async(hass, FULLNAME, ELEMENT_ID)
+
+    assert len(entries) == 50
+    assert {entry.id for entry in entries} == {str(number) for number in range(50)}
+    stats = helper.fetch_stats(FULLNAME, ELEMENT_ID)
+    assert stats.status == 200
+    assert stats.cache_misses == 1
+    assert stats.entry_count == 50
+
+
+async def test_not_modified(
+    hass: HomeAssistant, mock_api: MockCalendarApi, session: ClientSession
+) -> None:
+    """Test a 304 response returns the previous entries without parsing."""
+
+    helper = CalendarHelper(API_KEY, session)
+    entries = await helper.get_entries_async(hass, FULLNAME, ELEMENT_ID)
+    assert await helper.get_entries_async(hass, FULLNAME, ELEMENT_ID) is entries
+
+    stats = helper.fetch_stats(FULLNAME, ELEMENT_ID)
+    assert stats.status == 304
+    assert stats.payload_bytes == 0
+    assert stats.cache_hits == 1
+    assert stats.cache_misses == 1
+
+
+async def test_changed(
+    hass: HomeAssistant, mock_api: MockCalendarApi, session: ClientSession
+) -> None:
+    """Test a changed calendar is parsed again."""
+
+    helper = CalendarHelper(API_KEY, session)
+    await helper.get_entries_async(hass, FULLNAME, ELEMENT_ID)
+    mock_api.set_calendar(FULLNAME, [])
+
+    assert len(await helper.get_entries_async(hass, FULLNAME, ELEMENT_ID)) == 0
+    assert helper.fetch_stats(FULLNAME, ELEMENT_ID).cache_misses == 2
+
+
+async def test_same_body(
+    hass: HomeAssistant, mock_api: MockCalendarApi, session: ClientSession
+) -> None:
+    """Test the same body is not parsed again when the api sends no etag."""
+
+    mock_api.etags = False
+    helper = CalendarHelper(API_KEY, session)
+    entries = await helper.get_entries_async(hass, FULLNAME, ELEMENT_ID)
+    assert await helper.get_entries_async(hass, FULLNAME, ELEMENT_ID) is entries
+
+    stats = helper.fetch_stats(FULLNAME, ELEMENT_ID)
+    assert stats.status == 200
+    assert stats.cache_hits == 1
+    assert stats.cache_misses == 1
+
+
+@pytest.mark.parametrize("html", [False, True])
+@pytest.mark.parametrize("status", [500, 502, 503])
+async def test_server_error(
+    hass: HomeAssistant,
+    mock_api: MockCalendarApi,
+    session: ClientSession,
+    status: int,
+    html: bool,
+) -> None:
+    """Test a server error is a connection error, json or html."""
+
+    helper = CalendarHelper(API_KEY, session)
+    mock_api.fail_next(status, html=html)
+
+    with pytest.raises(CalendarConnectionException) as err:
+        await helper.get_entries_async(hass, FULLNAME, ELEMENT_ID)
+    if html:
+        assert str(err.value) == f"Calendar api returned status {status}"
+    else:
+        assert str(err.value) == f"Calendar failed with status {status}"
+
+    # The next request succeeds and is not answered from the cache.
+    assert len(await helper.get_entries_async(hass, FULLNAME, ELEMENT_ID)) == 50
+
+
+@pytest.mark.parametrize("html", [False, True])
+async def test_client_error(
+    hass: HomeAssistant, mock_api: MockCalendarApi, session: ClientSession, html: bool
+) -> None:
+    """Test a client error is not a connection error, json or html."""
+
+    helper = CalendarHelper(API_KEY, session)
+    mock_api.fail_next(404, html=html)
+
+    with pytest.raises(CalendarException) as err:
+        await helper.get_entries_async(hass, FULLNAME, ELEMENT_ID)
+    assert not isinstance(err.value, CalendarConnectionException)
+
+
+async def test_error_after_cached(
+    hass: HomeAssistant, mock_api: MockCalendarApi, session: ClientSession
+) -> None:
+    """Test an error page is not mistaken for unchanged entries."""
+
+    helper = CalendarHelper(API_KEY, session)
+    await helper.get_entries_async(hass, FULLNAME, ELEMENT_ID)
+    mock_api.fail_next(502, html=True)
+
+    with pytest.raises(CalendarConnectionException):
+        await helper.get_entries_async(hass, FULLNAME, ELEMENT_ID)
+
+
+async def test_wrong_api_key(
+    hass: HomeAssistant, mock_api: MockCalendarApi, session: ClientSession
+) -> None:
+    """Test a rejected api key raises an auth error."""
+
+    helper = CalendarHelper("wrong", session)
+    with pytest.raises(CalendarAuthException):
+        await helper.get_entries_async(hass, FULLNAME, ELEMENT_ID)
+    with pytest.raises(CalendarAuthException):
+        await helper.authenticate_async(hass)
+
+    await CalendarHelper(API_KEY, session).authenticate_async(hass)
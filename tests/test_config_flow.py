@@ -0,0 +1,164 @@
+"""Test the config flow of a single user and of a hub."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from mock_calendar_api import API_KEY, ELEMENT_ID, MockCalendarApi
+import pytest
+
+from custom_components.skyline_communications_vacation_calendar.const import (
+    CONF_ELEMENT_ID,
+    CONF_FULLNAME,
+    CONF_FULLNAMES,
+    DOMAIN,
+)
+from homeassistant.config_entries import SOURCE_USER
+from homeassistant.const import CONF_API_KEY
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResult, FlowResultType
+
+from . import mock_config_entry
+
+
+async def _start_flow(hass: HomeAssistant, mode: str) -> FlowResult:
+    """Authenticate and pick a single user or a hub."""
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    assert result["type"] is FlowResultType.FORM
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_API_KEY: API_KEY}
+    )
+    assert result["type"] is FlowResultType.MENU
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {"next_step_id": mode}
+    )
+    assert result["type"] is FlowResultType.FORM
+    assert result["step_id"] == mode
+    return result
+
+
+async def test_single_user(hass: HomeAssistant, calendar_api: MockCalendarApi) -> None:
+    """Test a config entry for one user."""
+
+    result = await _start_flow(hass, "settings")
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_FULLNAME: "Jane Doe", CONF_ELEMENT_ID: ELEMENT_ID}
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["title"] == "SLC Vacation Calendar - Jane Doe"
+    assert result["data"] == {
+        CONF_API_KEY: API_KEY,
+        CONF_FULLNAME: "Jane Doe",
+        CONF_ELEMENT_ID: ELEMENT_ID,
+    }
+    assert hass.states.get("sensor.workday_sensor_for_jane_doe") is not None
+
+
+async def test_validated_entries_reused(
+    hass: HomeAssistant, calendar_api: MockCalendarApi
+) -> None:
+    """Test the setup uses the key and the entries the flow validated."""
+
+    result = await _start_flow(hass, "settings")
+    await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_FULLNAME: "Jane Doe", CONF_ELEMENT_ID: ELEMENT_ID}
+    )
+    await hass.async_block_till_done()
+
+    assert calendar_api.requests == ["ping", "calendar"]
+    assert (
+        hass.states.get("binary_sensor.workday_binary_sensor_for_jane_doe").state
+        == "on"
+    )
+
+
+async def test_hub(hass: HomeAssistant, calendar_api: MockCalendarApi) -> None:
+    """Test a hub keeps the full names in order, without empty lines or doubles."""
+
+    calendar_api.set_calendar("John Doe", [])
+    result = await _start_flow(hass, "hub")
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            CONF_ELEMENT_ID: ELEMENT_ID,
+            CONF_FULLNAMES: ["John Doe", " ", "Jane Doe", "John Doe"],
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert result["title"] == f"SLC Vacation Calendar - {ELEMENT_ID}"
+    assert result["data"][CONF_FULLNAMES] == ["John Doe", "Jane Doe"]
+    assert hass.states.get("sensor.workday_sensor_for_john_doe") is not None
+    assert hass.states.get("sensor.workday_sensor_for_jane_doe") is not None
+
+
+async def test_invalid_auth(hass: HomeAssistant, calendar_api: MockCalendarApi) -> None:
+    """Test a wrong api key is refused."""
+
+    result = await hass.config_entries.flow.async_init(
+        DOMAIN, context={"source": SOURCE_USER}
+    )
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], {CONF_API_KEY: "wrong"}
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "invalid_auth"}
+
+
+@pytest.mark.parametrize(
+    ("mode", "user_input"),
+    [
+        ("settings", {CONF_FULLNAME: "Jane Doe", CONF_ELEMENT_ID: ELEMENT_ID}),
+        ("hub", {CONF_FULLNAMES: ["John Doe", "Jane Doe"], CONF_ELEMENT_ID: "2/2"}),
+    ],
+)
+async def test_user_already_configured(
+    hass: HomeAssistant,
+    calendar_api: MockCalendarApi,
+    mode: str,
+    user_input: dict[str, Any],
+) -> None:
+    """Test a user can only be in one config entry."""
+
+    mock_config_entry(["Jane Doe"]).add_to_hass(hass)
+    requests = len(calendar_api.requests)
+
+    result = await _start_flow(hass, mode)
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"], user_input
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "user_already_configured"}
+    assert "calendar" not in calendar_api.requests[requests:]
+
+
+async def test_reconfigure_user_already_configured(
+    hass: HomeAssistant, calendar_api: MockCalendarApi
+) -> None:
+    """Test a hub can not be reconfigured to hold a user of another entry."""
+
+    mock_config_entry(["Jane Doe"]).add_to_hass(hass)
+    hub = mock_config_entry(["John Doe", "Max Mustermann"])
+    hub.add_to_hass(hass)
+
+    result = await hub.start_reconfigure_flow(hass)
+    result = await hass.config_entries.flow.async_configure(
+        result["flow_id"],
+        {
+            CONF_API_KEY: API_KEY,
+            CONF_FULLNAMES: ["John Doe", "Jane Doe"],
+            CONF_ELEMENT_ID: ELEMENT_ID,
+        },
+    )
+
+    assert result["type"] is FlowResultType.FORM
+    assert result["errors"] == {"base": "user_already_configured"}
+    assert hub.data[CONF_FULLNAMES] == ["John Doe", "Max Mustermann"]
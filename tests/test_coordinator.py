@@ -0,0 +1,179 @@
+"""Test how the coordinator applies the fetched entries."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+import logging
+
+from freezegun.api import FrozenDateTimeFactory
+from mock_calendar_api import MockCalendarApi
+import pytest
+
+from custom_components.skyline_communications_vacation_calendar.CalendarApi import (
+    CalendarEntryType,
+)
+from custom_components.skyline_communications_vacation_calendar.const import (
+    CONF_LOOKAHEAD_DAYS,
+    CONF_LOOKBACK_DAYS,
+)
+from homeassistant.const import STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+
+from . import coordinator_of, day_row, setup_integration
+
+BINARY_SENSOR = "binary_sensor.workday_binary_sensor_for_jane_doe"
+
+
+async def test_stale(
+    hass: HomeAssistant,
+    calendar_api: MockCalendarApi,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test the last good entries are kept while a user can not be fetched."""
+
+    calendar_api.set_calendar("Jane Doe", [day_row("1")])
+    config_entry = await setup_integration(hass, ["Jane Doe"])
+    coordinator = coordinator_of(hass, config_entry)
+
+    calendar_api.set_calendar("Jane Doe", [day_row("1", CalendarEntryType.WfH)])
+    for _ in range(2):
+        calendar_api.fail_next(400)
+        await coordinator.async_refresh()
+        await hass.async_block_till_done()
+
+        state = hass.states.get(BINARY_SENSOR)
+        assert state.state == STATE_OFF
+        assert state.attributes["stale_since"] is not None
+    # Only the first failure is a warning.
+    assert caplog.text.count("keeping the last good entries") == 1
+    # Serving the last good entries is not a successful refresh.
+    assert coordinator.stats.failures == 2
+
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    state = hass.states.get(BINARY_SENSOR)
+    assert state.state == STATE_ON
+    assert state.attributes["stale_since"] is None
+
+
+async def test_stale_user_of_hub(
+    hass: HomeAssistant, calendar_api: MockCalendarApi
+) -> None:
+    """Test a user of a hub that can not be fetched does not hold up the others."""
+
+    calendar_api.set_calendar("Jane Doe", [day_row("1")])
+    calendar_api.set_calendar("John Doe", [])
+    config_entry = await setup_integration(hass, ["Jane Doe", "John Doe"])
+    coordinator = coordinator_of(hass, config_entry)
+
+    # The users are fetched in the order of the config entry.
+    calendar_api.set_calendar("John Doe", [day_row("2")])
+    calendar_api.fail_next(400)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.last_update_success
+    state = hass.states.get(BINARY_SENSOR)
+    assert state.state == STATE_OFF
+    assert state.attributes["stale_since"] is not None
+    john = hass.states.get("binary_sensor.workday_binary_sensor_for_john_doe")
+    assert john.state == STATE_OFF
+    assert john.attributes["stale_since"] is None
+
+
+async def test_window(hass: HomeAssistant, calendar_api: MockCalendarApi) -> None:
+    """Test only the entries in the look-back and look-ahead window are kept."""
+
+    calendar_api.set_calendar(
+        "Jane Doe",
+        [
+            day_row("1", offset=-3),
+            day_row("2", offset=-2, days=2),
+            day_row("3"),
+            day_row("4", offset=7),
+            day_row("5", offset=8),
+        ],
+    )
+    config_entry = await setup_integration(
+        hass, ["Jane Doe"], {CONF_LOOKBACK_DAYS: 1, CONF_LOOKAHEAD_DAYS: 7}
+    )
+    coordinator = coordinator_of(hass, config_entry)
+
+    assert [entry.id for entry in coordinator.calendars["Jane Doe"].entries] == [
+        "2",
+        "3",
+        "4",
+    ]
+
+
+async def test_prune_stale(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, calendar_api: MockCalendarApi
+) -> None:
+    """Test the window slides over the last good entries of a user that failed."""
+
+    calendar_api.set_calendar(
+        "Jane Doe", [day_row("1", offset=-1), day_row("2"), day_row("3", offset=7)]
+    )
+    config_entry = await setup_integration(
+        hass, ["Jane Doe"], {CONF_LOOKBACK_DAYS: 1, CONF_LOOKAHEAD_DAYS: 7}
+    )
+    coordinator = coordinator_of(hass, config_entry)
+
+    freezer.tick(timedelta(days=1))
+    calendar_api.fail_next(400)
+    await coordinator.async_refresh()
+
+    calendar = coordinator.calendars["Jane Doe"]
+    assert calendar.stale_since is not None
+    assert [entry.id for entry in calendar.entries] == ["2", "3"]
+
+
+async def test_unchanged_entries(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_api: MockCalendarApi,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test only the entities of a user whose entries changed write their state."""
+
+    caplog.set_level(logging.DEBUG)
+    rows = [day_row("1", CalendarEntryType.WfH), day_row("2", offset=3)]
+    calendar_api.set_calendar("Jane Doe", rows)
+    calendar_api.set_calendar("John Doe", [])
+    config_entry = await setup_integration(hass, ["Jane Doe", "John Doe"])
+    coordinator = coordinator_of(hass, config_entry)
+    entries = coordinator.calendars["Jane Doe"].entries
+    user_entities = [
+        entity_id
+        for entity_id in hass.states.async_entity_ids()
+        if entity_id.endswith(("_jane_doe", "_john_doe"))
+    ]
+    reported = {
+        entity_id: hass.states.get(entity_id).last_reported
+        for entity_id in user_entities
+    }
+
+    # A new response with the same entries keeps the entries and the states.
+    freezer.tick(timedelta(seconds=1))
+    calendar_api.set_calendar("Jane Doe", rows[::-1])
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert coordinator.calendars["Jane Doe"].entries is entries
+    assert {
+        entity_id: hass.states.get(entity_id).last_reported
+        for entity_id in user_entities
+    } == reported
+
+    freezer.tick(timedelta(seconds=1))
+    calendar_api.set_calendar("Jane Doe", [*rows, day_row("3")])
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+
+    assert "Entries of Jane Doe changed: 1 added, 0 removed, 0 changed" in caplog.text
+    assert hass.states.get(BINARY_SENSOR).state == STATE_OFF
+    for entity_id in (BINARY_SENSOR, "sensor.workday_sensor_for_jane_doe"):
+        assert hass.states.get(entity_id).last_reported != reported[entity_id]
+    for entity_id in user_entities:
+        if entity_id.endswith("_john_doe"):
+            assert hass.states.get(entity_id).last_reported == reported[entity_id]
@@ -0,0 +1,41 @@
+"""Test the diagnostics of a config entry."""
+
+from __future__ import annotations
+
+import json
+
+from mock_calendar_api import API_KEY, MockCalendarApi
+import pytest
+
+from custom_components.skyline_communications_vacation_calendar.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from homeassistant.components.diagnostics import REDACTED
+from homeassistant.core import HomeAssistant
+
+from . import day_row, setup_integration
+
+
+@pytest.mark.parametrize("fullnames", [["Jane Doe"], ["Jane Doe", "John Doe"]])
+async def test_diagnostics(
+    hass: HomeAssistant, calendar_api: MockCalendarApi, fullnames: list[str]
+) -> None:
+    """Test the diagnostics hold the statistics but no key or full names."""
+
+    calendar_api.set_calendar("Jane Doe", [day_row("1"), day_row("2", offset=1)])
+    calendar_api.set_calendar("John Doe", [])
+    config_entry = await setup_integration(hass, fullnames)
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+
+    dumped = json.dumps(diagnostics, default=str)
+    assert API_KEY not in dumped
+    for fullname in fullnames:
+        assert fullname not in dumped
+    assert diagnostics["entry"]["title"] == REDACTED
+    assert diagnostics["coordinator"]["last_update_success"]
+    assert diagnostics["coordinator"]["poll_interval"] > 0
+    assert diagnostics["users"]["user_1"]["entries"] == 2
+    assert list(diagnostics["users"]) == [
+        f"user_{number}" for number in range(1, len(fullnames) + 1)
+    ]
@@ -0,0 +1,95 @@
+"""Test the interval index over the entries of a user."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import random
+
+from custom_components.skyline_communications_vacation_calendar.entry_index import (
+    EntryIndex,
+)
+
+from . import make_entry
+
+BASE = datetime(2026, 1, 1)
+
+
+def test_empty() -> None:
+    """Test an index without entries."""
+
+    index = EntryIndex()
+    assert len(index) == 0
+    assert index.overlapping(BASE, BASE + timedelta(days=1)) == []
+    assert index.next_transition(BASE) is None
+
+
+def test_overlapping_bounds() -> None:
+    """Test the range and the entries both include their start and end."""
+
+    entry = make_entry("1", BASE, BASE + timedelta(hours=8))
+    index = EntryIndex([entry])
+
+    assert index.overlapping(BASE - timedelta(days=1), BASE) == [entry]
+    assert index.overlapping(BASE + timedelta(hours=8), BASE + timedelta(days=1)) == [
+        entry
+    ]
+    assert (
+        index.overlapping(BASE - timedelta(days=1), BASE - timedelta(seconds=1)) == []
+    )
+    assert (
+        index.overlapping(
+            BASE + timedelta(hours=8, seconds=1), BASE + timedelta(days=1)
+        )
+        == []
+    )
+    # Only whole seconds count, the entry ended before this moment.
+    assert index.at(BASE + timedelta(hours=8, microseconds=1)) == []
+
+
+def test_overlapping_random() -> None:
+    """Test the index finds the same entries as a scan, sorted on start."""
+
+    rnd = random.Random(0)
+    for count in (1, 2, 7, 100, 500):
+        entries = []
+        for number in range(count):
+            start = BASE + timedelta(hours=rnd.randint(0, 5000))
+            end = start + timedelta(hours=rnd.randint(0, 500))
+            entries.append(make_entry(str(number), start, end))
+        index = EntryIndex(entries)
+
+        for _ in range(100):
+            start = BASE + timedelta(hours=rnd.randint(-10, 5600))
+            end = start + timedelta(hours=rnd.randint(0, 300))
+            expected = sorted(
+                (
+                    entry
+                    for entry in entries
+                    if entry.event_date <= end and entry.end_date >= start
+                ),
+                key=lambda entry: entry.event_date,
+            )
+            found = index.overlapping(start, end)
+            assert [entry.event_date for entry in found] == [
+                entry.event_date for entry in expected
+            ]
+            assert set(found) == set(expected)
+
+
+def test_next_transition() -> None:
+    """Test the next start, or the second after the next end of an entry."""
+
+    index = EntryIndex(
+        [
+            make_entry("1", BASE, BASE + timedelta(hours=8, seconds=-1)),
+            make_entry("2", BASE + timedelta(hours=4), BASE + timedelta(days=1)),
+        ]
+    )
+
+    assert index.next_transition(BASE - timedelta(days=1)) == BASE
+    assert index.next_transition(BASE) == BASE + timedelta(hours=4)
+    assert index.next_transition(BASE + timedelta(hours=4)) == BASE + timedelta(hours=8)
+    assert index.next_transition(BASE + timedelta(hours=8)) == BASE + timedelta(
+        days=1, seconds=1
+    )
+    assert index.next_transition(BASE + timedelta(days=1, seconds=1)) is None
@@ -0,0 +1,70 @@
+"""Test the columnar entry store and the shared entries."""
+
+from __future__ import annotations
+
+from datetime import datetime
+import gc
+
+from custom_components.skyline_communications_vacation_calendar.CalendarApi import (
+    SHARED_ENTRIES,
+    CalendarEntryType,
+    EntryInterner,
+    EntryStore,
+)
+
+from . import make_entry
+
+CHRISTMAS = (datetime(2026, 12, 25), datetime(2026, 12, 25, 23, 59, 59))
+
+
+def test_shared_entries() -> None:
+    """Test equal entries of a shared category are one instance."""
+
+    holiday = make_entry("1", *CHRISTMAS, CalendarEntryType.Public_Holiday)
+    jane = EntryStore.from_entries(
+        [holiday, make_entry("2", *CHRISTMAS, CalendarEntryType.Absent)]
+    )
+    john = EntryStore.from_entries(
+        [holiday, make_entry("2", *CHRISTMAS, CalendarEntryType.Absent)]
+    )
+
+    assert jane[0] == john[0] == holiday
+    assert jane[0] is john[0]
+    assert jane[0] is jane[0]
+    # Entries of the user itself are not shared, even when they are equal.
+    assert jane[1] == john[1]
+    assert jane[1] is not john[1]
+
+
+def test_shared_entries_released() -> None:
+    """Test a shared entry is dropped once nothing uses it anymore."""
+
+    interner = EntryInterner()
+    store = EntryStore.from_entries(
+        [make_entry("1", *CHRISTMAS, CalendarEntryType.Weekend)]
+    )
+    row = store.row(0)
+    entry = interner.entry(row)
+    assert interner.entry(row) is entry
+    assert len(interner) == 1
+
+    del entry
+    gc.collect()
+    assert len(interner) == 0
+
+
+def test_shared_entries_differ() -> None:
+    """Test shared entries that differ in any field are separate entries."""
+
+    store = EntryStore.from_entries(
+        [
+            make_entry("1", *CHRISTMAS, CalendarEntryType.Public_Holiday),
+            make_entry("2", *CHRISTMAS, CalendarEntryType.Public_Holiday),
+            make_entry(
+                "1", CHRISTMAS[0], CHRISTMAS[0], CalendarEntryType.Public_Holiday
+            ),
+        ]
+    )
+    entries = list(store)
+    assert len({id(entry) for entry in entries}) == 3
+    assert len(SHARED_ENTRIES) >= 3
@@ -0,0 +1,152 @@
+"""Test the events and device triggers of entries that start and end."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from mock_calendar_api import MockCalendarApi
+from pytest_homeassistant_custom_component.common import (
+    async_capture_events,
+    async_fire_time_changed,
+    async_get_device_automations,
+    async_mock_service,
+)
+
+from custom_components.skyline_communications_vacation_calendar.const import (
+    CONF_ADAPTIVE_POLLING,
+    DOMAIN,
+    EVENT_ENTRY,
+)
+from homeassistant.components.device_automation import DeviceAutomationType
+from homeassistant.const import CONF_SCAN_INTERVAL
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers import device_registry as dr
+from homeassistant.setup import async_setup_component
+
+from . import coordinator_of, make_row, setup_integration
+
+# A Wednesday evening.
+EVENING = datetime(2026, 10, 14, 23)
+MORNING = EVENING + timedelta(hours=11)
+# Polls once a day, so only the timers of the events run.
+OPTIONS = {CONF_SCAN_INTERVAL: 86400, CONF_ADAPTIVE_POLLING: False}
+
+
+async def _tick_to(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, moment: datetime
+) -> None:
+    """Move the clock to a moment and run what is due."""
+
+    freezer.move_to(moment)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+def _device_id(hass: HomeAssistant, fullname: str) -> str:
+    """Return the id of the device of a user."""
+
+    device = dr.async_get(hass).async_get_device(
+        identifiers={(DOMAIN, f"slc-vaction-calendar-{fullname}")}
+    )
+    assert device is not None
+    return device.id
+
+
+async def test_entry_events(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, calendar_api: MockCalendarApi
+) -> None:
+    """Test an event is fired on the exact start and end of an entry."""
+
+    freezer.move_to(EVENING)
+    calendar_api.set_calendar(
+        "Jane Doe",
+        [
+            make_row("1", MORNING, MORNING + timedelta(hours=2)),
+            make_row("2", MORNING, MORNING + timedelta(hours=1)),
+        ],
+    )
+    config_entry = await setup_integration(hass, ["Jane Doe"], OPTIONS)
+    events = async_capture_events(hass, EVENT_ENTRY)
+
+    # A removed entry takes its timers along.
+    calendar_api.set_calendar(
+        "Jane Doe", [make_row("1", MORNING, MORNING + timedelta(hours=2))]
+    )
+    await coordinator_of(hass, config_entry).async_refresh()
+
+    await _tick_to(hass, freezer, MORNING - timedelta(seconds=1))
+    assert not events
+
+    await _tick_to(hass, freezer, MORNING)
+    await _tick_to(hass, freezer, MORNING + timedelta(hours=3))
+
+    assert [event.data for event in events] == [
+        {
+            "device_id": _device_id(hass, "Jane Doe"),
+            "full_name": "Jane Doe",
+            "type": event_type,
+            "category": "absent",
+            "entry_id": "1",
+            "name": "Absent",
+            "start": MORNING.isoformat(),
+            "end": (MORNING + timedelta(hours=2)).isoformat(),
+        }
+        for event_type in ("started", "ended")
+    ]
+
+
+async def test_device_trigger(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, calendar_api: MockCalendarApi
+) -> None:
+    """Test an automation with a device trigger runs when an entry starts."""
+
+    freezer.move_to(EVENING)
+    calendar_api.set_calendar(
+        "Jane Doe", [make_row("1", MORNING, MORNING + timedelta(hours=2))]
+    )
+    await setup_integration(hass, ["Jane Doe"], OPTIONS)
+    device_id = _device_id(hass, "Jane Doe")
+
+    triggers = await async_get_device_automations(
+        hass, DeviceAutomationType.TRIGGER, device_id
+    )
+    assert {
+        "platform": "device",
+        "domain": DOMAIN,
+        "device_id": device_id,
+        "type": "started",
+        "subtype": "absent",
+        "metadata": {},
+    } in triggers
+
+    calls = async_mock_service(hass, "test", "automation")
+    assert await async_setup_component(
+        hass,
+        "automation",
+        {
+            "automation": [
+                {
+                    "trigger": {
+                        "platform": "device",
+                        "domain": DOMAIN,
+                        "device_id": device_id,
+                        "type": event_type,
+                        "subtype": subtype,
+                    },
+                    "action": {
+                        "service": "test.automation",
+                        "data": {"trigger": f"{event_type} {subtype}"},
+                    },
+                }
+                for event_type, subtype in (
+                    ("started", "absent"),
+                    ("started", "wfh"),
+                    ("ended", "absent"),
+                )
+            ]
+        },
+    )
+
+    await _tick_to(hass, freezer, MORNING)
+    assert [call.data["trigger"] for call in calls] == ["started absent"]
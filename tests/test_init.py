@@ -0,0 +1,104 @@
+"""Test the setup of the Skyline Communications Vacation Calendar integration."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+from mock_calendar_api import MockCalendarApi
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.skyline_communications_vacation_calendar.const import (
+    STARTUP_RETRY,
+)
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import STATE_OFF, STATE_ON, STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from . import day_row, setup_integration
+
+INTEGRATION = "custom_components.skyline_communications_vacation_calendar"
+BINARY_SENSOR = "binary_sensor.workday_binary_sensor_for_jane_doe"
+
+
+async def test_hub_user_not_fetched(
+    hass: HomeAssistant, calendar_api: MockCalendarApi, freezer: FrozenDateTimeFactory
+) -> None:
+    """Test a hub user that could not be fetched is unavailable and retried soon."""
+
+    calendar_api.set_calendar("Jane Doe", [day_row("1")])
+    await setup_integration(hass, ["Jane Doe", "John Doe"])
+
+    assert (
+        hass.states.get("binary_sensor.workday_binary_sensor_for_jane_doe").state
+        == STATE_OFF
+    )
+    for entity_id in (
+        "binary_sensor.workday_binary_sensor_for_john_doe",
+        "sensor.workday_sensor_for_john_doe",
+        "calendar.vacation_calendar_for_john_doe",
+    ):
+        assert hass.states.get(entity_id).state == STATE_UNAVAILABLE
+
+    # The next retry fails again, the one after that finds the calendar.
+    for _ in range(2):
+        freezer.tick(timedelta(seconds=STARTUP_RETRY))
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+    assert (
+        hass.states.get("binary_sensor.workday_binary_sensor_for_john_doe").state
+        == STATE_UNAVAILABLE
+    )
+
+    calendar_api.set_calendar("John Doe", [])
+    freezer.tick(timedelta(seconds=STARTUP_RETRY * 2))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert (
+        hass.states.get("binary_sensor.workday_binary_sensor_for_john_doe").state
+        == STATE_ON
+    )
+    assert hass.states.get("sensor.workday_sensor_for_john_doe").state == "Workday"
+
+
+async def test_slow_first_refresh(
+    hass: HomeAssistant, calendar_api: MockCalendarApi
+) -> None:
+    """Test the entities are added before a slow first refresh completes."""
+
+    calendar_api.set_calendar("Jane Doe", [day_row("1")])
+    calendar_api.latency = 0.1
+    with patch(f"{INTEGRATION}.STARTUP_BUDGET", 0.01):
+        config_entry = await setup_integration(hass, ["Jane Doe"])
+
+    assert config_entry.state is ConfigEntryState.LOADED
+    assert hass.states.get(BINARY_SENSOR).state == STATE_UNAVAILABLE
+
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert hass.states.get(BINARY_SENSOR).state == STATE_OFF
+
+
+async def test_slow_first_refresh_failed(
+    hass: HomeAssistant, calendar_api: MockCalendarApi
+) -> None:
+    """Test a slow first refresh that fails is retried soon."""
+
+    calendar_api.set_calendar("Jane Doe", [day_row("1")])
+    calendar_api.latency = 0.1
+    calendar_api.fail_next(400)
+    with patch(f"{INTEGRATION}.STARTUP_BUDGET", 0.01):
+        config_entry = await setup_integration(hass, ["Jane Doe"])
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    assert config_entry.state is ConfigEntryState.LOADED
+    assert hass.states.get(BINARY_SENSOR).state == STATE_UNAVAILABLE
+
+    # The clock is not frozen, the mock api sleeps on the event loop.
+    calendar_api.latency = 0
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=STARTUP_RETRY + 1)
+    )
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert hass.states.get(BINARY_SENSOR).state == STATE_OFF
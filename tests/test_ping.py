@@ -0,0 +1,59 @@
+"""Test the api key is only checked when it is needed."""
+
+from __future__ import annotations
+
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from mock_calendar_api import MockCalendarApi
+
+from custom_components.skyline_communications_vacation_calendar.const import (
+    CONF_AUTH_INTERVAL,
+    DEFAULT_AUTH_INTERVAL,
+)
+from homeassistant.core import HomeAssistant
+
+from . import coordinator_of, setup_integration
+
+
+async def test_ping_skipped(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, calendar_api: MockCalendarApi
+) -> None:
+    """Test a key that was accepted is checked again after the auth interval."""
+
+    config_entry = await setup_integration(hass, ["Jane Doe"])
+    coordinator = coordinator_of(hass, config_entry)
+    assert calendar_api.requests == ["ping", "calendar"]
+
+    await coordinator.async_refresh()
+    assert calendar_api.requests[2:] == ["calendar"]
+
+    freezer.tick(timedelta(seconds=DEFAULT_AUTH_INTERVAL))
+    await coordinator.async_refresh()
+    assert calendar_api.requests[3:] == ["ping", "calendar"]
+
+
+async def test_ping_every_refresh(
+    hass: HomeAssistant, calendar_api: MockCalendarApi
+) -> None:
+    """Test an auth interval of 0 checks the key on every refresh."""
+
+    config_entry = await setup_integration(hass, ["Jane Doe"], {CONF_AUTH_INTERVAL: 0})
+    await coordinator_of(hass, config_entry).async_refresh()
+
+    assert calendar_api.requests == ["ping", "calendar"] * 2
+
+
+async def test_ping_after_rejected(
+    hass: HomeAssistant, calendar_api: MockCalendarApi
+) -> None:
+    """Test the key is checked again after the api rejected a request."""
+
+    config_entry = await setup_integration(hass, ["Jane Doe"])
+    coordinator = coordinator_of(hass, config_entry)
+
+    calendar_api.fail_next(401)
+    await coordinator.async_refresh()
+    await coordinator.async_refresh()
+
+    assert calendar_api.requests[2:] == ["calendar", "ping", "calendar"]
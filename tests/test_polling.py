@@ -0,0 +1,157 @@
+"""Test the adaptive refresh interval."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+import logging
+
+from freezegun.api import FrozenDateTimeFactory
+from mock_calendar_api import MockCalendarApi
+import pytest
+
+from custom_components.skyline_communications_vacation_calendar.const import (
+    CONF_ADAPTIVE_POLLING,
+    CONF_PUSH,
+    DEFAULT_SCAN_INTERVAL,
+    MAX_SCAN_INTERVAL,
+    MIN_SCAN_INTERVAL,
+    PUSH_SCAN_INTERVAL,
+    REFRESH_JITTER,
+)
+from custom_components.skyline_communications_vacation_calendar.polling import (
+    PollingPolicy,
+    PollReason,
+)
+from homeassistant.const import CONF_SCAN_INTERVAL, CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+from homeassistant.data_entry_flow import FlowResultType
+
+from . import coordinator_of, day_row, setup_integration
+
+# A Wednesday.
+NOON = datetime(2026, 10, 14, 12)
+
+
+@pytest.mark.parametrize(
+    ("now", "last_change", "next_transition", "reason"),
+    [
+        (NOON, NOON - timedelta(hours=1), None, PollReason.CHANGE),
+        (NOON, NOON - timedelta(hours=3), None, PollReason.OFFICE_HOURS),
+        (NOON, None, NOON + timedelta(hours=2), PollReason.TRANSITION),
+        (NOON, None, NOON + timedelta(hours=4), PollReason.OFFICE_HOURS),
+        (NOON.replace(hour=19), None, None, PollReason.OFF_HOURS),
+        (NOON.replace(hour=23), None, None, PollReason.NIGHT),
+        (NOON.replace(hour=5), None, None, PollReason.NIGHT),
+        (NOON + timedelta(days=3), None, None, PollReason.WEEKEND),
+    ],
+)
+def test_reason(
+    now: datetime,
+    last_change: datetime | None,
+    next_transition: datetime | None,
+    reason: PollReason,
+) -> None:
+    """Test the rule that decides the interval."""
+
+    policy = PollingPolicy(DEFAULT_SCAN_INTERVAL)
+    assert policy.reason(now, last_change, next_transition) is reason
+    assert (
+        PollingPolicy(DEFAULT_SCAN_INTERVAL, adaptive=False).reason(
+            now, last_change, next_transition
+        )
+        is PollReason.FIXED
+    )
+    assert (
+        PollingPolicy(PUSH_SCAN_INTERVAL, push=True).reason(
+            now, last_change, next_transition
+        )
+        is PollReason.PUSH
+    )
+
+
+def test_seconds() -> None:
+    """Test the interval of a reason stays between the minimum and maximum."""
+
+    policy = PollingPolicy(DEFAULT_SCAN_INTERVAL)
+    assert policy.seconds(PollReason.CHANGE) == DEFAULT_SCAN_INTERVAL / 4
+    assert policy.seconds(PollReason.OFFICE_HOURS) == DEFAULT_SCAN_INTERVAL
+    assert policy.seconds(PollReason.FIXED) == DEFAULT_SCAN_INTERVAL
+
+    assert PollingPolicy(600).seconds(PollReason.CHANGE) == MIN_SCAN_INTERVAL
+    assert PollingPolicy(7200).seconds(PollReason.NIGHT) == MAX_SCAN_INTERVAL
+    # A configured interval above the maximum is never shortened by backing off.
+    assert PollingPolicy(30000).seconds(PollReason.WEEKEND) == 30000
+
+
+async def test_adapt_interval(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    calendar_api: MockCalendarApi,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test the interval is shortened after a change and every change is logged."""
+
+    freezer.move_to(NOON)
+    caplog.set_level(logging.DEBUG)
+    calendar_api.set_calendar("Jane Doe", [day_row("1")])
+    config_entry = await setup_integration(hass, ["Jane Doe"])
+    coordinator = coordinator_of(hass, config_entry)
+    assert coordinator.poll_reason is PollReason.OFFICE_HOURS
+
+    calendar_api.set_calendar("Jane Doe", [day_row("1"), day_row("2", offset=7)])
+    await coordinator.async_refresh()
+
+    assert coordinator.poll_reason is PollReason.CHANGE
+    seconds = coordinator.update_interval.total_seconds()
+    assert (
+        DEFAULT_SCAN_INTERVAL / 4
+        <= seconds
+        < DEFAULT_SCAN_INTERVAL / 4 + REFRESH_JITTER
+    )
+    assert f"Refreshing every {int(seconds)} seconds (change)" in caplog.text
+
+
+async def test_options_flow(hass: HomeAssistant, calendar_api: MockCalendarApi) -> None:
+    """Test the options are stored with a webhook id and applied on reload."""
+
+    config_entry = await setup_integration(hass, ["Jane Doe"])
+
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+    assert result["type"] is FlowResultType.FORM
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            **{
+                key.schema: key.default()
+                for key in result["data_schema"].schema
+                if key.schema not in (CONF_SCAN_INTERVAL, CONF_ADAPTIVE_POLLING)
+            },
+            CONF_SCAN_INTERVAL: 1800,
+            CONF_ADAPTIVE_POLLING: False,
+        },
+    )
+    await hass.async_block_till_done()
+
+    assert result["type"] is FlowResultType.CREATE_ENTRY
+    assert config_entry.options[CONF_SCAN_INTERVAL] == 1800
+    assert not config_entry.options[CONF_PUSH]
+    webhook_id = config_entry.options[CONF_WEBHOOK_ID]
+
+    coordinator = coordinator_of(hass, config_entry)
+    assert coordinator.poll_reason is PollReason.FIXED
+    assert 1800 <= coordinator.update_interval.total_seconds() < 1800 + REFRESH_JITTER
+
+    # The webhook id is kept, the calendar does not need to be reconfigured.
+    result = await hass.config_entries.options.async_init(config_entry.entry_id)
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            key: value
+            for key, value in config_entry.options.items()
+            if key != CONF_WEBHOOK_ID
+        }
+        | {CONF_PUSH: True},
+    )
+    await hass.async_block_till_done()
+    assert config_entry.options[CONF_WEBHOOK_ID] == webhook_id
+    assert coordinator_of(hass, config_entry).poll_reason is PollReason.PUSH
@@ -0,0 +1,187 @@
+"""Test the push updates through the webhook of a config entry."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from http import HTTPStatus
+
+from aiohttp.test_utils import TestClient
+from freezegun.api import FrozenDateTimeFactory
+from mock_calendar_api import MockCalendarApi
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMocker
+
+from custom_components.skyline_communications_vacation_calendar.CalendarApi import (
+    CALENDAR_PATH,
+    CalendarEntryType,
+)
+from custom_components.skyline_communications_vacation_calendar.const import (
+    CONF_PUSH,
+    PUSH_DEBOUNCE,
+)
+from homeassistant.const import CONF_WEBHOOK_ID
+from homeassistant.core import HomeAssistant
+
+from . import coordinator_of, day_row, setup_integration
+
+WEBHOOK_ID = "push-webhook"
+WEBHOOK_URL = f"/api/webhook/{WEBHOOK_ID}"
+PUSH_OPTIONS = {CONF_PUSH: True, CONF_WEBHOOK_ID: WEBHOOK_ID}
+DAY_SENSOR = "sensor.workday_sensor_for_jane_doe"
+
+
+@pytest.fixture
+async def client(hass_client_no_auth, push_entry: MockConfigEntry) -> TestClient:
+    """Return a client to post to the webhook of the config entry."""
+    return await hass_client_no_auth()
+
+
+@pytest.fixture
+async def push_entry(
+    hass: HomeAssistant, calendar_api: MockCalendarApi
+) -> MockConfigEntry:
+    """Set up a hub with push updates, Jane works from home today."""
+
+    calendar_api.set_calendar("Jane Doe", [day_row("1", CalendarEntryType.WfH)])
+    calendar_api.set_calendar("John Doe", [])
+    return await setup_integration(hass, ["Jane Doe", "John Doe"], PUSH_OPTIONS)
+
+
+@pytest.mark.parametrize(
+    ("body", "message"),
+    [
+        ("{", "Invalid json"),
+        ("[]", "Expected a json object"),
+        ('{"fullname": ["Jane Doe"]}', "Expected fullname"),
+        ('{"fullnames": "Jane Doe"}', "Expected fullname"),
+        ('{"fullnames": [["Jane Doe"]]}', "Expected fullname"),
+        ('{"fullname": "Nobody"}', "Unknown users: ['Nobody']"),
+        ('{"fullnames": ["Jane Doe", "Nobody"]}', "Unknown users: ['Nobody']"),
+        (
+            '{"fullnames": ["Jane Doe", "John Doe"], "entries": []}',
+            "one user at a time",
+        ),
+        ('{"fullname": "Jane Doe", "entries": {}}', "one user at a time"),
+        ('{"fullname": "Jane Doe", "entries": [{"ID": "1"}]}', "Invalid entries"),
+    ],
+)
+async def test_bad_push(
+    hass: HomeAssistant,
+    client: TestClient,
+    calendar_api: MockCalendarApi,
+    push_entry: MockConfigEntry,
+    body: str,
+    message: str,
+) -> None:
+    """Test pushes that can not be handled are refused with the reason."""
+
+    requests = len(calendar_api.requests)
+    response = await client.post(WEBHOOK_URL, data=body)
+
+    assert response.status == HTTPStatus.BAD_REQUEST
+    assert message in await response.text()
+    await hass.async_block_till_done()
+    assert len(calendar_api.requests) == requests
+    assert hass.states.get(DAY_SENSOR).state == "WfH"
+
+
+async def test_push_entries(
+    hass: HomeAssistant,
+    client: TestClient,
+    calendar_api: MockCalendarApi,
+    push_entry: MockConfigEntry,
+) -> None:
+    """Test pushed entries are taken over without a request."""
+
+    requests = len(calendar_api.requests)
+    response = await client.post(
+        WEBHOOK_URL, json={"fullname": "Jane Doe", "entries": [day_row("2")]}
+    )
+    await hass.async_block_till_done()
+
+    assert response.status == HTTPStatus.OK
+    assert len(calendar_api.requests) == requests
+    assert hass.states.get(DAY_SENSOR).state == "Absent"
+    assert (
+        hass.states.get("binary_sensor.workday_binary_sensor_for_jane_doe").state
+        == "off"
+    )
+
+
+async def test_push_changed(
+    hass: HomeAssistant,
+    freezer: FrozenDateTimeFactory,
+    client: TestClient,
+    calendar_api: MockCalendarApi,
+    push_entry: MockConfigEntry,
+) -> None:
+    """Test users pushed as changed are fetched once after a burst."""
+
+    calendar_api.set_calendar("Jane Doe", [day_row("2")])
+    requests = len(calendar_api.requests)
+    for _ in range(3):
+        response = await client.post(WEBHOOK_URL, json={"fullname": "Jane Doe"})
+        assert response.status == HTTPStatus.OK
+    await hass.async_block_till_done()
+    assert hass.states.get(DAY_SENSOR).state == "WfH"
+
+    freezer.tick(timedelta(seconds=PUSH_DEBOUNCE))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert calendar_api.requests[requests:] == ["calendar"]
+    assert hass.states.get(DAY_SENSOR).state == "Absent"
+
+
+async def test_push_during_poll(
+    hass: HomeAssistant,
+    client: TestClient,
+    aioclient_mock: AiohttpClientMocker,
+    calendar_api: MockCalendarApi,
+    push_entry: MockConfigEntry,
+) -> None:
+    """Test a poll that finishes after a push shows the entries of the api."""
+
+    coordinator = coordinator_of(hass, push_entry)
+    requests = len(calendar_api.requests)
+    calendar_api.latency = 0.05
+    refresh = hass.async_create_task(coordinator.async_refresh())
+    while "calendar" not in calendar_api.requests[requests:]:
+        await asyncio.sleep(0)
+
+    # Waiting for hass would wait for the refresh as well.
+    await client.post(
+        WEBHOOK_URL, json={"fullname": "Jane Doe", "entries": [day_row("2")]}
+    )
+    assert not refresh.done()
+    assert hass.states.get(DAY_SENSOR).state == "Absent"
+
+    # The api still says Jane works from home, it is the source of truth.
+    await refresh
+    await hass.async_block_till_done()
+    assert hass.states.get(DAY_SENSOR).state == "WfH"
+    assert (
+        hass.states.get("binary_sensor.workday_binary_sensor_for_jane_doe").state
+        == "on"
+    )
+
+    # The poll after a push is answered in full, not as not modified.
+    calendar_api.latency = 0
+    await client.post(
+        WEBHOOK_URL, json={"fullname": "Jane Doe", "entries": [day_row("2")]}
+    )
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    jane_requests = [
+        headers
+        for _, url, _, headers in aioclient_mock.mock_calls
+        if url.path == CALENDAR_PATH and url.query["fullname"] == "Jane Doe"
+    ]
+    assert "If-None-Match" not in jane_requests[-1]
+    assert "If-None-Match" in jane_requests[-2]
+    assert hass.states.get(DAY_SENSOR).state == "WfH"
@@ -0,0 +1,68 @@
+"""Test the sensors with the upcoming days of a user."""
+
+from __future__ import annotations
+
+from datetime import datetime
+
+from freezegun.api import FrozenDateTimeFactory
+from mock_calendar_api import MockCalendarApi
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.skyline_communications_vacation_calendar.CalendarApi import (
+    CalendarEntryType,
+)
+from homeassistant.const import STATE_UNKNOWN
+from homeassistant.core import HomeAssistant
+
+from . import day_row, setup_integration
+
+# A Wednesday.
+NOON = datetime(2026, 10, 14, 12)
+
+
+def _states(hass: HomeAssistant) -> dict[str, str]:
+    """Return the states of the upcoming day sensors of Jane."""
+    return {
+        key: hass.states.get(f"sensor.{key}_for_jane_doe").state
+        for key in (
+            "next_day_off",
+            "days_until_absence",
+            "next_wfh_day",
+            "next_workday",
+        )
+    }
+
+
+async def test_upcoming_days(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, calendar_api: MockCalendarApi
+) -> None:
+    """Test the next days are found, and move on when a day passes."""
+
+    freezer.move_to(NOON)
+    calendar_api.set_calendar(
+        "Jane Doe",
+        [
+            day_row("1", offset=1, days=2),
+            day_row("2", CalendarEntryType.Weekend, offset=3, days=2),
+            day_row("3", CalendarEntryType.WfH, offset=5),
+        ],
+    )
+    await setup_integration(hass, ["Jane Doe"])
+
+    assert _states(hass) == {
+        "next_day_off": "2026-10-15",
+        "days_until_absence": "1",
+        "next_wfh_day": "2026-10-19",
+        "next_workday": "2026-10-19",
+    }
+
+    freezer.move_to(datetime(2026, 10, 16, 0, 0, 1))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+    assert _states(hass) == {
+        "next_day_off": "2026-10-17",
+        "days_until_absence": STATE_UNKNOWN,
+        "next_wfh_day": "2026-10-19",
+        "next_workday": "2026-10-19",
+    }
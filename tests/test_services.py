@@ -0,0 +1,111 @@
+"""Test the actions of the Skyline Communications Vacation Calendar integration."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+
+from mock_calendar_api import MockCalendarApi
+import pytest
+
+from custom_components.skyline_communications_vacation_calendar.CalendarApi import (
+    CalendarEntryType,
+)
+from custom_components.skyline_communications_vacation_calendar.const import DOMAIN
+from custom_components.skyline_communications_vacation_calendar.services import (
+    SERVICE_GET_AVAILABILITY,
+    SERVICE_GET_DAY_INFO,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+
+from . import day_row, setup_integration
+
+
+async def test_get_day_info(hass: HomeAssistant, calendar_api: MockCalendarApi) -> None:
+    """Test the type of day and the entries of a user over a range of days."""
+
+    calendar_api.set_calendar(
+        "Jane Doe",
+        [
+            day_row("1", CalendarEntryType.Absent, offset=1),
+            day_row("2", CalendarEntryType.WfH, offset=2),
+        ],
+    )
+    await setup_integration(hass, ["Jane Doe"])
+
+    today = date.today()
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_DAY_INFO,
+        {"full_name": "Jane Doe", "date": today, "end_date": today + timedelta(days=2)},
+        blocking=True,
+        return_response=True,
+    )
+
+    days = response["days"]
+    assert [day["day_type"] for day in days] == ["Workday", "Absent", "WfH"]
+    assert [day["is_workday"] for day in days] == [True, False, True]
+    assert [entry["id"] for entry in days[1]["entries"]] == ["1"]
+
+
+@pytest.mark.parametrize(
+    ("data", "message"),
+    [
+        ({"full_name": "Nobody"}, "Unknown user"),
+        ({"full_name": "Jane Doe", "date": date.today() + timedelta(days=800)}, "kept"),
+        ({"full_name": "Jane Doe", "date": date.today() - timedelta(days=400)}, "kept"),
+        (
+            {
+                "full_name": "Jane Doe",
+                "date": date.today(),
+                "end_date": date.today() - timedelta(days=1),
+            },
+            "before",
+        ),
+    ],
+)
+async def test_get_day_info_invalid(
+    hass: HomeAssistant,
+    calendar_api: MockCalendarApi,
+    data: dict,
+    message: str,
+) -> None:
+    """Test unknown users and days outside of the kept entries are refused."""
+
+    await setup_integration(hass, ["Jane Doe"])
+
+    with pytest.raises(ServiceValidationError, match=message):
+        await hass.services.async_call(
+            DOMAIN, SERVICE_GET_DAY_INFO, data, blocking=True, return_response=True
+        )
+
+
+async def test_user_not_fetched(
+    hass: HomeAssistant, calendar_api: MockCalendarApi
+) -> None:
+    """Test a user that was never fetched is refused and not counted as available."""
+
+    calendar_api.set_calendar("Jane Doe", [day_row("1")])
+    await setup_integration(hass, ["Jane Doe", "John Doe"])
+
+    with pytest.raises(HomeAssistantError, match="could not be fetched"):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_GET_DAY_INFO,
+            {"full_name": "John Doe"},
+            blocking=True,
+            return_response=True,
+        )
+
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_GET_AVAILABILITY,
+        {"categories": ["Absent", "WfH"]},
+        blocking=True,
+        return_response=True,
+    )
+    assert response["categories"] == {
+        "Absent": {"count": 1, "users": ["Jane Doe"]},
+        "WfH": {"count": 0, "users": []},
+    }
+    assert response["not_loaded"] == ["John Doe"]
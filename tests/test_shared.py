@@ -0,0 +1,132 @@
+"""Test the state shared by the config entries."""
+
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.skyline_communications_vacation_calendar.CalendarApi import (
+    CalendarCircuitOpenException,
+)
+from custom_components.skyline_communications_vacation_calendar.const import (
+    PREFETCH_TTL,
+)
+from custom_components.skyline_communications_vacation_calendar.shared import (
+    CircuitBreaker,
+    async_get_shared,
+)
+from homeassistant.core import HomeAssistant
+
+
+def test_circuit_opens_after_threshold(freezer: FrozenDateTimeFactory) -> None:
+    """Test the circuit opens after threshold failures in a row."""
+
+    breaker = CircuitBreaker(3, 60, 600)
+    for _ in range(2):
+        breaker.before_request()
+        breaker.record_failure()
+    assert breaker.state == "closed"
+
+    breaker.record_success()
+    for _ in range(2):
+        breaker.record_failure()
+    assert breaker.state == "closed"
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    with pytest.raises(CalendarCircuitOpenException):
+        breaker.before_request()
+
+
+def test_circuit_trial(freezer: FrozenDateTimeFactory) -> None:
+    """Test a single trial request is let through after the reset timeout."""
+
+    breaker = CircuitBreaker(1, 60, 600)
+    breaker.record_failure()
+
+    freezer.tick(timedelta(seconds=59))
+    with pytest.raises(CalendarCircuitOpenException):
+        breaker.before_request()
+
+    freezer.tick(timedelta(seconds=1))
+    assert breaker.state == "half_open"
+    breaker.before_request()
+    with pytest.raises(CalendarCircuitOpenException):
+        breaker.before_request()
+
+    breaker.release_trial()
+    breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.failures == 0
+    breaker.before_request()
+
+
+def test_circuit_backoff(freezer: FrozenDateTimeFactory) -> None:
+    """Test the circuit opens twice as long after a failed trial, up to the max."""
+
+    breaker = CircuitBreaker(1, 60, 200)
+    breaker.record_failure()
+
+    for timeout in (120, 200, 200):
+        freezer.tick(timedelta(seconds=timeout // 2 + 30))
+        breaker.before_request()
+        breaker.record_failure()
+        assert breaker.state == "open"
+
+        freezer.tick(timedelta(seconds=timeout - 1))
+        with pytest.raises(CalendarCircuitOpenException):
+            breaker.before_request()
+        freezer.tick(timedelta(seconds=1))
+        assert breaker.state == "half_open"
+
+
+async def test_stash(hass: HomeAssistant, freezer: FrozenDateTimeFactory) -> None:
+    """Test a stashed result is returned once, or dropped when it expires."""
+
+    shared = async_get_shared(hass)
+    shared.async_stash("used", [1])
+    shared.async_stash("abandoned", [2])
+    assert shared.async_pop_stashed("used") == [1]
+    assert shared.async_pop_stashed("used") is None
+
+    freezer.tick(timedelta(seconds=PREFETCH_TTL - 1))
+    async_fire_time_changed(hass)
+    shared.async_stash("abandoned", [3])
+    freezer.tick(timedelta(seconds=PREFETCH_TTL - 1))
+    async_fire_time_changed(hass)
+    assert shared.async_pop_stashed("abandoned") == [3]
+
+    shared.async_stash("abandoned", [4])
+    freezer.tick(timedelta(seconds=PREFETCH_TTL))
+    async_fire_time_changed(hass)
+    assert not shared._prefetched
+    assert shared.async_pop_stashed("abandoned") is None
+
+
+async def test_shared_request(hass: HomeAssistant) -> None:
+    """Test identical requests in flight are sent once."""
+
+    shared = async_get_shared(hass)
+    calls = 0
+    release = asyncio.Event()
+
+    async def _ping() -> bool:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return True
+
+    first = hass.async_create_task(shared.async_shared_request("ping", _ping))
+    second = hass.async_create_task(shared.async_shared_request("ping", _ping))
+    await asyncio.sleep(0)
+    release.set()
+    assert await first and await second
+    assert calls == 1
+
+    assert await shared.async_shared_request("ping", _ping)
+    assert calls == 2
@@ -0,0 +1,105 @@
+"""Test the cache of the entries of the previous run."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+from mock_calendar_api import MockCalendarApi
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.skyline_communications_vacation_calendar.CalendarApi import (
+    CalendarEntryType,
+)
+from custom_components.skyline_communications_vacation_calendar.const import (
+    CACHE_SAVE_DELAY,
+    DOMAIN,
+)
+from custom_components.skyline_communications_vacation_calendar.store import (
+    STORAGE_VERSION,
+)
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant
+
+from . import day_row, mock_config_entry, setup_integration
+
+DAY_SENSOR = "sensor.workday_sensor_for_jane_doe"
+
+
+def cached_row(category: CalendarEntryType) -> list[Any]:
+    """Return a cached entry of today."""
+
+    start = datetime.combine(date.today(), time.min).isoformat()
+    end = datetime.combine(date.today(), time(23, 59, 59)).isoformat()
+    return ["1", category.name, category.value, start, end, "", start, end]
+
+
+def storage_key(entry_id: str) -> str:
+    """Return the storage key of the cache of a config entry."""
+    return f"{DOMAIN}.{entry_id}"
+
+
+async def test_cached_startup(
+    hass: HomeAssistant, hass_storage: dict[str, Any], calendar_api: MockCalendarApi
+) -> None:
+    """Test the cached entries are shown when the api fails on startup."""
+
+    config_entry = mock_config_entry(["Jane Doe"])
+    hass_storage[storage_key(config_entry.entry_id)] = {
+        "version": STORAGE_VERSION,
+        "key": storage_key(config_entry.entry_id),
+        "data": {"Jane Doe": [cached_row(CalendarEntryType.Absent)]},
+    }
+    calendar_api.fail_next(400)
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.state is ConfigEntryState.LOADED
+    assert hass.states.get(DAY_SENSOR).state == "Absent"
+    assert hass.states.get(DAY_SENSOR).attributes["stale_since"] is not None
+
+
+async def test_outdated_cache(
+    hass: HomeAssistant, hass_storage: dict[str, Any], calendar_api: MockCalendarApi
+) -> None:
+    """Test a cache of an older version is not used."""
+
+    config_entry = mock_config_entry(["Jane Doe"])
+    hass_storage[storage_key(config_entry.entry_id)] = {
+        "version": 1,
+        "key": storage_key(config_entry.entry_id),
+        "data": [cached_row(CalendarEntryType.Absent)],
+    }
+    calendar_api.fail_next(400)
+    config_entry.add_to_hass(hass)
+    await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert config_entry.state is ConfigEntryState.SETUP_RETRY
+    assert hass.states.get(DAY_SENSOR) is None
+
+
+async def test_cache_saved(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    freezer: FrozenDateTimeFactory,
+    calendar_api: MockCalendarApi,
+) -> None:
+    """Test the fetched entries are written to the cache, and removed with the entry."""
+
+    calendar_api.set_calendar("Jane Doe", [day_row("1", CalendarEntryType.WfH)])
+    config_entry = await setup_integration(hass, ["Jane Doe"])
+    key = storage_key(config_entry.entry_id)
+
+    freezer.tick(timedelta(seconds=CACHE_SAVE_DELAY))
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+    assert hass_storage[key]["data"] == {
+        "Jane Doe": [cached_row(CalendarEntryType.WfH)]
+    }
+
+    await hass.config_entries.async_remove(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert key not in hass_storage
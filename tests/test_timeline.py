@@ -0,0 +1,114 @@
+"""Test the per day timeline of the effective category."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, time, timedelta
+import random
+
+from custom_components.skyline_communications_vacation_calendar.CalendarApi import (
+    CalendarEntryType,
+)
+from custom_components.skyline_communications_vacation_calendar.entry_index import (
+    EntryIndex,
+)
+from custom_components.skyline_communications_vacation_calendar.timeline import (
+    Timeline,
+    resolve_category,
+)
+
+from . import make_entry
+
+START = date(2026, 1, 5)
+
+
+def day(offset: int, hour: int = 0) -> datetime:
+    """Return a moment on a day of the timeline."""
+    return datetime.combine(START + timedelta(days=offset), time(hour))
+
+
+def whole_days(first: int, last: int) -> tuple[datetime, datetime]:
+    """Return the start and end date of an entry covering whole days."""
+    return day(first), day(last + 1) - timedelta(seconds=1)
+
+
+def test_priority() -> None:
+    """Test the category with the highest priority wins on a day."""
+
+    timeline = Timeline(
+        EntryIndex(
+            [
+                make_entry("1", *whole_days(0, 4), CalendarEntryType.WfH),
+                make_entry("2", *whole_days(1, 1), CalendarEntryType.Absent),
+                make_entry("3", *whole_days(1, 2), CalendarEntryType.Public_Holiday),
+                make_entry("4", *whole_days(3, 3), CalendarEntryType.Release),
+            ]
+        ),
+        10,
+        START,
+    )
+
+    assert timeline.category_at(day(0, 12)) is CalendarEntryType.WfH
+    assert timeline.category_at(day(1, 12)) is CalendarEntryType.Public_Holiday
+    assert timeline.category_at(day(2, 12)) is CalendarEntryType.Public_Holiday
+    assert timeline.category_at(day(3, 12)) is CalendarEntryType.WfH
+    assert timeline.category_at(day(5, 12)) is None
+
+
+def test_partial_day() -> None:
+    """Test a day that is partly covered follows the time of the moment."""
+
+    timeline = Timeline(
+        EntryIndex(
+            [
+                make_entry("1", *whole_days(0, 0), CalendarEntryType.WfH),
+                make_entry("2", day(0, 8), day(0, 12) - timedelta(seconds=1)),
+            ]
+        ),
+        10,
+        START,
+    )
+
+    assert timeline.category_at(day(0, 7)) is CalendarEntryType.WfH
+    assert timeline.category_at(day(0, 9)) is CalendarEntryType.Absent
+    assert timeline.category_at(day(0, 13)) is CalendarEntryType.WfH
+
+
+def test_outside_horizon() -> None:
+    """Test moments outside of the horizon are resolved with the index."""
+
+    timeline = Timeline(EntryIndex([make_entry("1", *whole_days(-3, 20))]), 10, START)
+
+    assert timeline.end == START + timedelta(days=10)
+    assert timeline.category_at(day(-2)) is CalendarEntryType.Absent
+    assert timeline.category_at(day(5)) is CalendarEntryType.Absent
+    assert timeline.category_at(day(15)) is CalendarEntryType.Absent
+    assert timeline.category_at(day(21)) is None
+
+
+def test_random() -> None:
+    """Test the timeline agrees with resolving the active entries."""
+
+    rnd = random.Random(0)
+    for _ in range(20):
+        entries = []
+        for number in range(30):
+            start = day(rnd.randint(-5, 60), rnd.choice((0, 0, 9, 13)))
+            if rnd.random() < 0.5:
+                end = start + timedelta(
+                    days=rnd.randint(0, 5), hours=rnd.choice((4, 8)), seconds=-1
+                )
+            else:
+                end = datetime.combine(
+                    start.date() + timedelta(days=rnd.randint(0, 5)), time(23, 59, 59)
+                )
+            category = rnd.choice(list(CalendarEntryType))
+            entries.append(make_entry(str(number), start, end, category))
+        timeline = Timeline(EntryIndex(entries), 40, START)
+
+        for hour in range(-10 * 24, 70 * 24, 5):
+            moment = day(0) + timedelta(hours=hour, minutes=rnd.randint(0, 59))
+            assert timeline.category_at(moment) == resolve_category(
+                entry
+                for entry in entries
+                if entry.event_date <= moment <= entry.end_date
+            )
@@ -0,0 +1,67 @@
+"""Test the entities update when entries start and end, without a refresh."""
+
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+from mock_calendar_api import MockCalendarApi
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.skyline_communications_vacation_calendar.const import (
+    CONF_ADAPTIVE_POLLING,
+)
+from homeassistant.const import CONF_SCAN_INTERVAL, STATE_OFF, STATE_ON
+from homeassistant.core import HomeAssistant
+
+from . import make_row, setup_integration
+
+# A Wednesday evening.
+EVENING = datetime(2026, 10, 14, 23)
+DAY_SENSOR = "sensor.workday_sensor_for_jane_doe"
+BINARY_SENSOR = "binary_sensor.workday_binary_sensor_for_jane_doe"
+CALENDAR = "calendar.vacation_calendar_for_jane_doe"
+
+
+async def _tick_to(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, moment: datetime
+) -> None:
+    """Move the clock to a moment and run what is due."""
+
+    freezer.move_to(moment)
+    async_fire_time_changed(hass)
+    await hass.async_block_till_done()
+
+
+async def test_transitions(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, calendar_api: MockCalendarApi
+) -> None:
+    """Test the state changes when an entry starts and ends."""
+
+    freezer.move_to(EVENING)
+    morning = EVENING + timedelta(hours=11)
+    calendar_api.set_calendar(
+        "Jane Doe", [make_row("1", morning, morning + timedelta(hours=2))]
+    )
+    # Polls once a day, so the states below change without a refresh.
+    await setup_integration(
+        hass, ["Jane Doe"], {CONF_SCAN_INTERVAL: 86400, CONF_ADAPTIVE_POLLING: False}
+    )
+    requests = len(calendar_api.requests)
+    assert hass.states.get(DAY_SENSOR).state == "Workday"
+    assert hass.states.get(BINARY_SENSOR).state == STATE_ON
+
+    await _tick_to(hass, freezer, morning - timedelta(seconds=1))
+    assert hass.states.get(DAY_SENSOR).state == "Workday"
+    assert hass.states.get(CALENDAR).state == STATE_OFF
+
+    await _tick_to(hass, freezer, morning)
+    assert hass.states.get(DAY_SENSOR).state == "Absent"
+    assert hass.states.get(BINARY_SENSOR).state == STATE_OFF
+    assert hass.states.get(CALENDAR).state == STATE_ON
+
+    await _tick_to(hass, freezer, morning + timedelta(hours=2, seconds=1))
+    assert hass.states.get(DAY_SENSOR).state == "Workday"
+    assert hass.states.get(BINARY_SENSOR).state == STATE_ON
+    assert hass.states.get(CALENDAR).state == STATE_OFF
+    assert calendar_api.requests[requests:] == []
@@ -0,0 +1,151 @@
+"""Benchmark the parsing of a calendar response into entries.
+
+Compares the original parser (strptime and a regular dataclass) with
+CalendarHelper.parse_entries on a synthetic payload.
+
+Run from the root of the repository:
+    python tools/bench_parse.py --entries 5000 --repeat 20
+"""
+
+import argparse
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+import json
+from pathlib import Path
+import random
+import sys
+import timeit
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.skyline_communications_vacation_calendar.CalendarApi import (  # noqa: E402
+    CalendarEntryType,
+    CalendarHelper,
+    parse_epoch,
+)
+
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+@dataclass
+class LegacyCalendarEntry:
+    """The entry as it was before the fast parsing path."""
+
+    id: str
+    name: str
+    category: CalendarEntryType
+    event_date: datetime
+    end_date: datetime
+    description: str
+    original_event_date: datetime
+    originale_end_date: datetime
+
+
+def legacy_parse_entries(jsonResponse: list[dict]) -> list[LegacyCalendarEntry]:
+    """Parse the entries the way it was done before."""
+
+    entries: list[LegacyCalendarEntry] = []
+    for temp in jsonResponse:
+        entry = LegacyCalendarEntry(
+            id=temp["ID"],
+            name=temp["Name"],
+            category=CalendarEntryType(temp["Category"]),
+            event_date=datetime.strptime(temp["EventDate"], TIMESTAMP_FORMAT),
+            end_date=datetime.strptime(temp["EndDate"], TIMESTAMP_FORMAT),
+            description=temp["Description"],
+            original_event_date=datetime.strptime(
+                temp["OriginalEventDate"], TIMESTAMP_FORMAT
+            ),
+            originale_end_date=datetime.strptime(
+                temp["OriginalEndDate"], TIMESTAMP_FORMAT
+            ),
+        )
+        entries.append(entry)
+
+    return entries
+
+
+def synthetic_payload(count: int, seed: int = 0) -> list[dict]:
+    """Generate a calendar response with whole day entries spread over years."""
+
+    rnd = random.Random(seed)
+    start = datetime(2015, 1, 1)
+    payload = []
+    for number in range(count):
+        event_date = start + timedelta(days=rnd.randint(0, 365 * 10))
+        end_date = event_date + timedelta(
+            days=rnd.randint(0, 14), hours=23, minutes=59, seconds=59
+        )
+        category = rnd.choice(list(CalendarEntryType))
+        payload.append(
+            {
+                "ID": str(number),
+                "Name": category.name.replace("_", " "),
+                "Category": category.value,
+                "EventDate": event_date.strftime(TIMESTAMP_FORMAT),
+                "EndDate": end_date.strftime(TIMESTAMP_FORMAT),
+                "Description": "",
+                "OriginalEventDate": event_date.strftime(TIMESTAMP_FORMAT),
+                "OriginalEndDate": end_date.strftime(TIMESTAMP_FORMAT),
+            }
+        )
+    return payload
+
+
+def measure(parse, body: bytes, repeat: int) -> dict[str, float]:
+    """Return the memory held by the parsed entries and the best parse times.
+
+    The timestamp cache is cleared before every cold run, the warm runs parse
+    the same body again like a refresh of an unchanged calendar.
+    """
+
+    jsonResponse = json.loads(body)
+    parse_epoch.cache_clear()
+    tracemalloc.start()
+    entries = parse(jsonResponse)
+    memory, _peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del entries, jsonResponse
+
+    def run() -> None:
+        parse(json.loads(body))
+
+    cold = min(
+        timeit.repeat(run, setup=parse_epoch.cache_clear, number=1, repeat=repeat)
+    )
+    run()
+    warm = min(timeit.repeat(run, number=1, repeat=repeat))
+
+    return {"seconds": cold, "warm_seconds": warm, "bytes": memory}
+
+
+def main() -> None:
+    """Run the benchmark and print the results as json."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    body = json.dumps(synthetic_payload(args.entries)).encode()
+
+    before = measure(legacy_parse_entries, body, args.repeat)
+    after = measure(CalendarHelper.parse_entries, body, args.repeat)
+
+    print(
+        json.dumps(
+            {
+                "entries": args.entries,
+                "before": before,
+                "after": after,
+                "speedup": before["seconds"] / after["seconds"],
+                "warm_speedup": before["warm_seconds"] / after["warm_seconds"],
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,349 @@
+"""Benchmark the integration against a local stand-in for the calendar api.
+
+Measures the latency and memory of fetching and parsing the entries, of a
+coordinator refresh and of the state calculation the entities do on every
+tick. The results are printed as json, pass a previous result with
+--baseline to fail when a median got slower than the tolerance allows.
+
+Run from the root of the repository, Home Assistant needs to be installed:
+    python tools/benchmark.py --users 10 --entries 2000 --output result.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+import gc
+import json
+from pathlib import Path
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from typing import Any
+
+from aiohttp import ClientSession, web
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_calendar_api import API_KEY, ELEMENT_ID, MockCalendarApi, synthetic_users  # noqa: E402
+
+from custom_components.skyline_communications_vacation_calendar import CalendarApi  # noqa: E402
+from custom_components.skyline_communications_vacation_calendar.binary_sensor import (  # noqa: E402
+    WorkDayBinarySensor,
+)
+from custom_components.skyline_communications_vacation_calendar.const import (  # noqa: E402
+    CONF_ELEMENT_ID,
+    CONF_FULLNAMES,
+    DATA_SHARED,
+    DOMAIN,
+)
+from custom_components.skyline_communications_vacation_calendar.coordinator import (  # noqa: E402
+    CalendarCoordinator,
+)
+from custom_components.skyline_communications_vacation_calendar.sensor import DaySensor  # noqa: E402
+from custom_components.skyline_communications_vacation_calendar.shared import (  # noqa: E402
+    TokenBucket,
+    async_get_shared,
+)
+from homeassistant.config_entries import ConfigEntries, ConfigEntry  # noqa: E402
+from homeassistant.const import CONF_API_KEY  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Return the statistics of a list of durations in seconds, in milliseconds."""
+
+    samples = sorted(sample * 1000 for sample in samples)
+    return {
+        "min_ms": samples[0],
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[round(0.95 * (len(samples) - 1))],
+        "mean_ms": statistics.fmean(samples),
+        "samples": len(samples),
+    }
+
+
+async def time_async(
+    run: Callable[[], Awaitable[Any]],
+    repeat: int,
+    setup: Callable[[], Awaitable[Any]] | None = None,
+) -> list[float]:
+    """Time a coroutine repeat times, the setup is not part of the measurement."""
+
+    samples = []
+    for _ in range(repeat):
+        if setup is not None:
+            await setup()
+        start = time.perf_counter()
+        await run()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+async def measure_memory(run: Callable[[], Awaitable[Any]]) -> dict[str, int]:
+    """Return the memory that the result of a coroutine holds, and the peak."""
+
+    gc.collect()
+    tracemalloc.start()
+    result = await run()
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return {"retained_bytes": retained, "peak_bytes": peak}
+
+
+def make_config_entry(fullnames: list[str]) -> ConfigEntry:
+    """Return a hub config entry for the users of the mock api."""
+
+    return ConfigEntry(
+        domain=DOMAIN,
+        title="Benchmark",
+        data={
+            CONF_API_KEY: API_KEY,
+            CONF_ELEMENT_ID: ELEMENT_ID,
+            CONF_FULLNAMES: fullnames,
+        },
+        options={},
+        source="user",
+        version=1,
+        minor_version=1,
+        unique_id="benchmark",
+        discovery_keys={},
+    )
+
+
+async def benchmark_api(
+    url: str, calendars: dict[str, list[dict]], repeat: int
+) -> dict[str, Any]:
+    """Measure fetching and parsing the entries of one user."""
+
+    fullname = next(iter(calendars))
+    body = json.dumps(calendars[fullname]).encode()
+    results: dict[str, Any] = {}
+
+    def parse() -> CalendarApi.EntryStore:
+        return CalendarApi.CalendarHelper.parse_entries(json.loads(body))
+
+    results["parse"] = summarize(
+        timeit.repeat(
+            parse,
+            setup=CalendarApi.parse_epoch.cache_clear,
+            number=1,
+            repeat=repeat,
+        )
+    )
+
+    async def parse_async() -> CalendarApi.EntryStore:
+        CalendarApi.parse_epoch.cache_clear()
+        return parse()
+
+    results["parse"].update(await measure_memory(parse_async))
+
+    async with ClientSession() as session:
+        helper = CalendarApi.CalendarHelper(API_KEY, session)
+
+        async def reset() -> None:
+            helper._responses.clear()
+            CalendarApi.parse_epoch.cache_clear()
+
+        async def fetch() -> CalendarApi.EntryStore:
+            return await helper.get_entries_async(None, fullname, ELEMENT_ID)
+
+        results["fetch"] = summarize(await time_async(fetch, repeat, setup=reset))
+        await reset()
+        results["fetch"].update(await measure_memory(fetch))
+        results["fetch_not_modified"] = summarize(await time_async(fetch, repeat))
+        results["url"] = url
+
+    return results
+
+
+async def benchmark_coordinator(
+    hass: HomeAssistant, fullnames: list[str], repeat: int, rate_limit: bool
+) -> tuple[dict[str, Any], CalendarCoordinator]:
+    """Measure refreshing a coordinator that holds every user of the mock api."""
+
+    results: dict[str, Any] = {}
+    config_entry = make_config_entry(fullnames)
+
+    def new_coordinator() -> CalendarCoordinator:
+        # Drop the shared api clients, so nothing is cached between runs.
+        hass.data.get(DOMAIN, {}).pop(DATA_SHARED, None)
+        CalendarApi.parse_epoch.cache_clear()
+        if not rate_limit:
+            async_get_shared(hass).limiter = TokenBucket(1e9, 1_000_000)
+        return CalendarCoordinator(hass, config_entry)
+
+    coordinator = new_coordinator()
+
+    async def refresh() -> None:
+        await coordinator.async_refresh()
+        if not coordinator.last_update_success:
+            raise RuntimeError(f"Refresh failed: {coordinator.last_exception}")
+
+    async def reset() -> None:
+        nonlocal coordinator
+        await coordinator.async_shutdown()
+        coordinator = new_coordinator()
+
+    results["refresh"] = summarize(await time_async(refresh, repeat, setup=reset))
+
+    async def refresh_retained() -> CalendarCoordinator:
+        await refresh()
+        return coordinator
+
+    await reset()
+    results["refresh"].update(await measure_memory(refresh_retained))
+
+    await reset()
+    await refresh()
+    results["refresh_unchanged"] = summarize(
+        await time_async(coordinator.async_refresh, repeat)
+    )
+    return results, coordinator
+
+
+def benchmark_entities(
+    coordinator: CalendarCoordinator, repeat: int, number: int
+) -> dict[str, Any]:
+    """Measure the state calculation every entity does on a tick."""
+
+    results: dict[str, Any] = {}
+    fullname = coordinator.fullnames[0]
+    timeline = coordinator.calendars[fullname].timeline
+    binary_sensor = WorkDayBinarySensor(coordinator, fullname)
+    sensor = DaySensor(coordinator, fullname)
+
+    for name, calculate in (
+        ("calculate_workday", lambda: binary_sensor.calculate_workday(timeline)),
+        ("calculate_day_type", lambda: sensor.calculate_day_type(timeline)),
+    ):
+        samples = timeit.repeat(calculate, number=number, repeat=repeat)
+        results[name] = summarize([sample / number for sample in samples])
+
+    # A tick for every entity of the coordinator, both platforms.
+    def tick() -> None:
+        for calendar in coordinator.calendars.values():
+            binary_sensor.calculate_workday(calendar.timeline)
+            sensor.calculate_day_type(calendar.timeline)
+
+    results["tick_all_users"] = summarize(timeit.repeat(tick, number=1, repeat=repeat))
+    return results
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    """Start the mock api and run every benchmark against it."""
+
+    calendars = synthetic_users(args.users, args.entries, args.overlap, args.partial)
+    mock = MockCalendarApi(calendars)
+    runner = web.AppRunner(mock.build_app())
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = runner.addresses[0][1]
+    CalendarApi.DOMAIN_METRICS_URL = f"http://127.0.0.1:{port}"
+
+    results: dict[str, Any] = {
+        "config": {
+            "users": args.users,
+            "entries": args.entries,
+            "overlap": args.overlap,
+            "partial": args.partial,
+            "repeat": args.repeat,
+            "rate_limit": args.rate_limit,
+        },
+        "python": platform.python_version(),
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+    }
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.config_entries = ConfigEntries(hass, {})
+        try:
+            results["api"] = await benchmark_api(
+                CalendarApi.DOMAIN_METRICS_URL, calendars, args.repeat
+            )
+            results["coordinator"], coordinator = await benchmark_coordinator(
+                hass, list(calendars), args.repeat, args.rate_limit
+            )
+            results["entities"] = benchmark_entities(
+                coordinator, args.repeat, args.number
+            )
+            await coordinator.async_shutdown()
+        finally:
+            await hass.async_stop(force=True)
+            await runner.cleanup()
+
+    results["requests"] = {
+        kind: mock.requests.count(kind) for kind in ("ping", "calendar")
+    }
+    return results
+
+
+def compare(
+    results: dict[str, Any], baseline: dict[str, Any], tolerance: float
+) -> list[str]:
+    """Return the measurements whose median regressed more than the tolerance."""
+
+    regressions = []
+    for group, measurements in results.items():
+        if not isinstance(measurements, dict) or group == "config":
+            continue
+        for name, stats in measurements.items():
+            before = baseline.get(group, {}).get(name)
+            if not isinstance(stats, dict) or not isinstance(before, dict):
+                continue
+            if stats["median_ms"] > before["median_ms"] * (1 + tolerance):
+                regressions.append(
+                    f"{group}.{name}: {before['median_ms']:.4f} ms -> "
+                    f"{stats['median_ms']:.4f} ms"
+                )
+    return regressions
+
+
+def main() -> None:
+    """Run the benchmarks and print the results as json."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=5)
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--overlap", type=float, default=0.2)
+    parser.add_argument("--partial", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--number", type=int, default=1000, help="entity calculations per sample"
+    )
+    parser.add_argument(
+        "--rate-limit",
+        action="store_true",
+        help="keep the api rate limiter, by default it is lifted for the refreshes",
+    )
+    parser.add_argument("--output", type=Path, help="also write the results here")
+    parser.add_argument("--baseline", type=Path, help="results of a previous run")
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    if args.baseline is not None:
+        baseline = json.loads(args.baseline.read_text())
+        results["regressions"] = compare(results, baseline, args.tolerance)
+
+    output = json.dumps(results, indent=2)
+    print(output)
+    if args.output is not None:
+        args.output.write_text(output + "\n")
+
+    if results.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""Local stand-in for the calendar api of the DataMiner element.
+
+Serves /api/custom/calendar and /api/custom/calendar/ping with synthetic
+calendars, so the integration can be benchmarked without the live service.
+The calendar responses carry an ETag and are compressed when the client
+accepts it, like the real service behind its proxy.
+
+Run from the root of the repository:
+    python tools/mock_calendar_api.py --port 8123 --users 10 --entries 2000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from datetime import date, datetime, time, timedelta
+import hashlib
+import json
+import random
+
+from aiohttp import hdrs, web
+
+API_KEY = "benchmark"
+ELEMENT_ID = "1/1"
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+# Categories as they are numbered by the api, see CalendarEntryType.
+CATEGORY_NAMES = {
+    0: "Absent",
+    1: "WfH",
+    2: "RT Rotation",
+    3: "Support Rotation",
+    4: "Other",
+    5: "Public Holiday",
+    6: "Weekend",
+    7: "Release",
+    8: "Seal",
+}
+
+
+def synthetic_calendar(
+    entries: int,
+    overlap: float = 0.2,
+    partial: float = 0.1,
+    start: date | None = None,
+    seed: int = 0,
+) -> list[dict]:
+    """Generate the entries of one user.
+
+    Entries follow each other starting a year before start. The overlap is the
+    fraction of entries that starts inside the previous one, partial is the
+    fraction that only covers part of a day.
+    """
+
+    rnd = random.Random(seed)
+    day = (start or date.today()) - timedelta(days=365)
+    previous_end = datetime.combine(day, time.min)
+    calendar = []
+    for number in range(entries):
+        if number and rnd.random() < overlap:
+            event_date = previous_end - timedelta(days=rnd.randint(0, 2))
+            event_date = datetime.combine(event_date.date(), time.min)
+        else:
+            day += timedelta(days=rnd.randint(1, 4))
+            event_date = datetime.combine(day, time.min)
+
+        if rnd.random() < partial:
+            event_date += timedelta(hours=rnd.choice((8, 9, 13)))
+            end_date = event_date + timedelta(hours=4, seconds=-1)
+        else:
+            end_date = datetime.combine(
+                event_date.date() + timedelta(days=rnd.randint(0, 5)),
+                time(23, 59, 59),
+            )
+        previous_end = max(previous_end, end_date)
+
+        category = rnd.choice(list(CATEGORY_NAMES))
+        calendar.append(
+            {
+                "ID": str(number),
+                "Name": CATEGORY_NAMES[category],
+                "Category": category,
+                "EventDate": event_date.strftime(TIMESTAMP_FORMAT),
+                "EndDate": end_date.strftime(TIMESTAMP_FORMAT),
+                "Description": "",
+                "OriginalEventDate": event_date.strftime(TIMESTAMP_FORMAT),
+                "OriginalEndDate": end_date.strftime(TIMESTAMP_FORMAT),
+            }
+        )
+    return calendar
+
+
+def synthetic_users(
+    users: int, entries: int, overlap: float = 0.2, partial: float = 0.1
+) -> dict[str, list[dict]]:
+    """Generate the calendars of a number of users, by full name."""
+
+    return {
+        f"User {number}": synthetic_calendar(
+            entries, overlap=overlap, partial=partial, seed=number
+        )
+        for number in range(users)
+    }
+
+
+class MockCalendarApi:
+    """The calendars that are served and the requests that were received."""
+
+    def __init__(
+        self,
+        calendars: dict[str, list[dict]],
+        api_key: str = API_KEY,
+        etags: bool = True,
+        latency: float = 0,
+    ) -> None:
+        """Initialize, without etags the api acts like a server without validators.
+
+        Calendar requests are answered after latency seconds, like a slow api.
+        """
+
+        self.api_key = api_key
+        self.etags = etags
+        self.latency = latency
+        self.requests: list[str] = []
+        self._bodies: dict[str, tuple[bytes, str]] = {}
+        self._errors: list[tuple[int, bool]] = []
+        for fullname, calendar in calendars.items():
+            self.set_calendar(fullname, calendar)
+
+    def set_calendar(self, fullname: str, calendar: list[dict]) -> None:
+        """Replace the calendar of a user, the ETag changes with it."""
+
+        body = json.dumps(calendar).encode()
+        self._bodies[fullname] = (body, f'"{hashlib.sha1(body).hexdigest()}"')
+
+    def fail_next(self, status: int, count: int = 1, html: bool = False) -> None:
+        """Answer the next count calendar requests with an error status.
+
+        The error is a json error like the api sends, or with html an error
+        page like the proxy in front of the real service sends.
+        """
+
+        self._errors.extend([(status, html)] * count)
+
+    def _authorized(self, request: web.Request) -> bool:
+        """Return if the request carries the api key."""
+        return request.headers.get(hdrs.AUTHORIZATION) == f"Bearer {self.api_key}"
+
+    async def handle_ping(self, request: web.Request) -> web.Response:
+        """Answer pong to a valid api key."""
+
+        self.requests.append("ping")
+        if not self._authorized(request):
+            return web.Response(status=401, text="Unauthorized")
+        return web.Response(text="pong")
+
+    async def handle_calendar(self, request: web.Request) -> web.Response:
+        """Return the calendar of a user, or 304 when it did not change."""
+
+        self.requests.append("calendar")
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if not self._authorized(request):
+            return web.Response(status=401, text="Unauthorized")
+
+        if self._errors:
+            status, html = self._errors.pop(0)
+            if html:
+                return web.Response(
+                    status=status,
+                    text=f"<html><body><h1>{status}</h1></body></html>",
+                    content_type="text/html",
+                )
+            return web.json_response(
+                {"errors": [{"detail": f"Calendar failed with status {status}"}]},
+                status=status,
+            )
+
+        fullname = request.query.get("fullname", "")
+        if request.query.get("elementId") != ELEMENT_ID or fullname not in self._bodies:
+            return web.json_response(
+                {"errors": [{"detail": f"No calendar found for {fullname}"}]},
+                status=404,
+            )
+
+        body, etag = self._bodies[fullname]
+        if not self.etags:
+            headers = {}
+        elif request.headers.get(hdrs.IF_NONE_MATCH) == etag:
+            return web.Response(status=304, headers={hdrs.ETAG: etag})
+        else:
+            headers = {hdrs.ETAG: etag}
+
+        response = web.Response(
+            body=body, content_type="application/json", headers=headers
+        )
+        response.enable_compression()
+        return response
+
+    def build_app(self) -> web.Application:
+        """Return the aiohttp application that serves the api."""
+
+        app = web.Application()
+        app.router.add_get("/api/custom/calendar/ping", self.handle_ping)
+        app.router.add_get("/api/custom/calendar", self.handle_calendar)
+        return app
+
+
+def main() -> None:
+    """Serve synthetic calendars until interrupted."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8123)
+    parser.add_argument("--users", type=int, default=1)
+    parser.add_argument("--entries", type=int, default=1000)
+    parser.add_argument("--overlap", type=float, default=0.2)
+    parser.add_argument("--partial", type=float, default=0.1)
+    parser.add_argument("--api-key", default=API_KEY)
+    parser.add_argument("--latency", type=float, default=0)
+    args = parser.parse_args()
+
+    api = MockCalendarApi(
+        synthetic_users(args.users, args.entries, args.overlap, args.partial),
+        api_key=args.api_key,
+        latency=args.latency,
+    )
+    print(
+        f"Serving {args.users} users with element id {ELEMENT_ID} "
+        f"and api key {args.api_key}"
+    )
+    web.run_app(api.build_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
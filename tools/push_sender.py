@@ -0,0 +1,89 @@
+"""Local stand-in for the calendar side of push updates.
+
+Posts to the webhook of a config entry the way the calendar, or a relay in
+front of it, would: either marks users as changed so they are fetched right
+away, or pushes synthetic entries that are taken over without a request.
+The webhook url is shown in the options of the config entry once push updates
+are enabled.
+
+Run from the root of the repository:
+    python tools/push_sender.py http://localhost:8123/api/webhook/<id> --fullname "Jane Doe"
+    python tools/push_sender.py <url> --fullname "Jane Doe" --entries 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import sys
+import time
+
+from aiohttp import ClientSession
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from mock_calendar_api import synthetic_calendar  # noqa: E402
+
+
+def build_payload(args: argparse.Namespace) -> dict:
+    """Return the json object to post for the command line arguments."""
+
+    payload: dict = {}
+    if len(args.fullname) == 1:
+        payload["fullname"] = args.fullname[0]
+    elif args.fullname:
+        payload["fullnames"] = args.fullname
+
+    if args.entries_file is not None:
+        payload["entries"] = json.loads(args.entries_file.read_text())
+    elif args.entries is not None:
+        payload["entries"] = synthetic_calendar(args.entries, seed=args.seed)
+    return payload
+
+
+async def send(url: str, payload: dict, repeat: int) -> None:
+    """Post the payload, repeat times to see how bursts are combined."""
+
+    async with ClientSession() as session:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            async with session.post(url, json=payload) as response:
+                text = await response.text()
+            print(
+                f"{response.status} in {(time.perf_counter() - start) * 1000:.1f} ms"
+                + (f": {text}" if text else "")
+            )
+
+
+def main() -> None:
+    """Push a change to a webhook."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("url", help="Webhook url of the config entry")
+    parser.add_argument(
+        "--fullname",
+        action="append",
+        default=[],
+        help="User that changed, repeat for more users, all users when left out",
+    )
+    parser.add_argument(
+        "--entries", type=int, help="Push this many synthetic entries of one user"
+    )
+    parser.add_argument(
+        "--entries-file", type=Path, help="Push the entries in this json file"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    payload = build_payload(args)
+    if "entries" in payload and "fullname" not in payload:
+        parser.error("Entries are pushed for exactly one --fullname")
+
+    asyncio.run(send(args.url, payload, args.repeat))
+
+
+if __name__ == "__main__":
+    main()